@@ -1,30 +1,53 @@
 from langchain.chains.retrieval_qa.base import RetrievalQA
 from langchain_core.tracers import LangChainTracer
 from dotenv import load_dotenv
+import asyncio
+import contextlib
 import os
 import random
+import threading
+from pathlib import Path
 from langchain_openai import ChatOpenAI
 from langchain_core.output_parsers.json import JsonOutputParser
 from langchain_core.prompts import PromptTemplate
 from Ai.LangChain.response_form import *
 from Ai.LangChain.lang_graph import LangGraph
+from Ai.LangChain.llm_cache import LlmCache
 from util.commonException import CommonError,ErrorCode
 
 class ArticleGenerator:
-
-    def __init__(self, database, mongo, meta_data, patch):
+    DEAD_CHAMPION_TEXT = "ㆍ 이 챔피언은 너무 고인이라 (마스터+) 통계가 존재하지 않습니다..."
+    FAILED_TEXT = "기사 생성에 실패했습니다."
+    LLM_SLOT_POLL_SECONDS = 0.05
+
+    def __init__(self, database, mongo, meta_data, patch, llm=None):
+        """
+        llm : 테스트 등에서 다른 chat model 을 쓰려면 주입, 없으면 ChatOpenAI
+        """
         load_dotenv()
         self.database = database
         self.mongo = mongo
         self.patch = patch
         self.meta_data = meta_data
         self.prompt = meta_data.prompt
-        self.lang_graph = LangGraph(mongo, database, meta_data, self.patch)
+        # 같은 프롬프트 재실행 시 저장된 응답 사용
+        self.llm_cache = LlmCache(
+            Path(__file__).parent.parent.parent / "Cache" / "llm_cache.sqlite3",
+            ttl_seconds=meta_data.basic_info.get("llm_cache_ttl_hours", 72) * 3600,
+            max_entries=meta_data.basic_info.get("llm_cache_max_entries", 5000),
+            enabled=meta_data.basic_info.get("llm_cache", True)
+        )
+        # LLM 동시 요청 수 (스레드, 이벤트 루프 상관없이 프로세스 전체에서 공유), 비동기 호출 재시도
+        self.llm_concurrency = meta_data.basic_info.get("llm_concurrency", 8)
+        self.llm_slots = threading.BoundedSemaphore(self.llm_concurrency)
+        self.llm_max_retries = meta_data.basic_info.get("llm_max_retries", 3)
+        self.llm_backoff_seconds = meta_data.basic_info.get("llm_backoff_seconds", 1.0)
+        self.lang_graph = LangGraph(mongo, database, meta_data, self.patch, self.llm_cache, self.llm_slots)
         self.pick_rate_type = meta_data.prompt.get("pick_rate").get("type")
         tracer = LangChainTracer(
             project_name=os.getenv('LANGCHAIN_PROJECT', 'default-project')
         )
-        self.llm = ChatOpenAI(
+        self.llm = llm or ChatOpenAI(
             temperature=0.7,
             model_name=os.getenv('MODEL_NAME', 'gpt-4o-mini'),
             callbacks=[tracer]
@@ -103,7 +126,7 @@ class ArticleGenerator:
             'interview_title': self.interview_title_template | self.llm | self.parsers['interview_title']
         }
 
-    def generate_first_page_article(self, game_df, player_name, max_chars):
+    def build_first_page_input(self, game_df, player_name, max_chars):
         player_data = game_df[game_df['playername'] == player_name].iloc[0]
         champion_kr_name = self.database.get_name_kr(player_data['name_us'])
         champion_stats = self.database.get_champion_rate_table(player_data['name_us'], self.patch.version, player_data['position'])
@@ -116,46 +139,52 @@ class ArticleGenerator:
             "kda": f"{player_data['kills']}/{player_data['deaths']}/{player_data['assists']}",
             "max_chars": max_chars
         }
-        result = self.chains['first_page'].invoke(article_data)
+        return article_data
+
+    def generate_first_page_article(self, game_df, player_name, max_chars, use_cache=True):
+        result = self.invoke_chain('first_page', self.build_first_page_input(game_df, player_name, max_chars), use_cache)
         return result['title']
 
-    def generate_second_page_article(self, game_df, player_name, max_chars):
-        if self.pick_rate_type == "long":
-            player_data = game_df[game_df['playername'] == player_name].iloc[0]
-            blue_team = game_df[game_df['side'] == 'Blue']
-            red_team = game_df[game_df['side'] == 'Red']
-            opp_player_data = game_df[
-                (game_df['position'] == player_data['position']) &
-                (game_df['side'] != player_data['side'])
-                ].iloc[0]
-            mvp_player_info = self.database.get_mvp_player(game_df)
+    def build_second_page_input(self, game_df, player_name, max_chars):
+        player_data = game_df[game_df['playername'] == player_name].iloc[0]
+        blue_team = game_df[game_df['side'] == 'Blue']
+        red_team = game_df[game_df['side'] == 'Red']
+        opp_player_data = game_df[
+            (game_df['position'] == player_data['position']) &
+            (game_df['side'] != player_data['side'])
+            ].iloc[0]
+        mvp_player_info = self.database.get_mvp_player(game_df)
+
+        champion_stats = self.database.get_champion_pick_rate_info(
+            player_data['name_us'],
+            game_df['patch'].iloc[0],
+            player_data['position']
+        )
 
-            champion_stats = self.database.get_champion_pick_rate_info(
-                player_data['name_us'],
-                game_df['patch'].iloc[0],
-                player_data['position']
-            )
+        template_variables = {
+            'game_date': game_df['game_date'].iloc[0].strftime('%Y년%m월%d일'),
+            'league': game_df['league'].iloc[0],
+            'set': game_df['game'].iloc[0],
+            'blue_team_name': blue_team['teamname'].iloc[0],
+            'red_team_name': red_team['teamname'].iloc[0],
+            'player_name': player_data['playername'],
+            'champion_name': self.database.get_name_kr(player_data['name_us']),
+            'opp_player': opp_player_data['playername'],
+            'opp_champion': self.database.get_name_kr(opp_player_data['name_us']),
+            'patch_version': game_df['patch'].iloc[0],
+            'pick_rate': champion_stats['pick_rate'],
+            'player_team': player_data['teamname'],
+            'mvp_champion': mvp_player_info['name_kr'],
+            'mvp_player': mvp_player_info['playername'],
+            'mvp_score': mvp_player_info['mvp_score'],
+            'max_chars': max_chars
+        }
 
-            template_variables = {
-                'game_date': game_df['game_date'].iloc[0].strftime('%Y년%m월%d일'),
-                'league': game_df['league'].iloc[0],
-                'set': game_df['game'].iloc[0],
-                'blue_team_name': blue_team['teamname'].iloc[0],
-                'red_team_name': red_team['teamname'].iloc[0],
-                'player_name': player_data['playername'],
-                'champion_name': self.database.get_name_kr(player_data['name_us']),
-                'opp_player': opp_player_data['playername'],
-                'opp_champion': self.database.get_name_kr(opp_player_data['name_us']),
-                'patch_version': game_df['patch'].iloc[0],
-                'pick_rate': champion_stats['pick_rate'],
-                'player_team': player_data['teamname'],
-                'mvp_champion': mvp_player_info['name_kr'],
-                'mvp_player': mvp_player_info['playername'],
-                'mvp_score': mvp_player_info['mvp_score'],
-                'max_chars': max_chars
-            }
+        return template_variables
 
-            result = self.chains['second_page'].invoke(template_variables)
+    def generate_second_page_article(self, game_df, player_name, max_chars, use_cache=True):
+        if self.pick_rate_type == "long":
+            result = self.invoke_chain('second_page', self.build_second_page_input(game_df, player_name, max_chars), use_cache)
             return result['text']
         elif self.pick_rate_type == "short":
             template = self.prompt.get("pick_rate").get("short").get("page2")
@@ -191,41 +220,46 @@ class ArticleGenerator:
             )
             return template
 
-    def generate_third_page_article(self, game_df, player_name, max_chars):
+    def build_third_page_input(self, game_df, player_name, max_chars, radar_stats=None):
+        player_data = game_df[game_df['playername'] == player_name].iloc[0]
+        opp_mask = (game_df['position'] == player_data['position']) & (game_df['playername'] != player_name)
+        opp_player_name = game_df[opp_mask]['playername'].iloc[0]
+        game_id = player_data['gameid']
+        if radar_stats is None:
+            radar_stats = self.database.get_radar_stats(game_id, player_name)
+        comparison_data = self.database.get_player_comparison_series(
+            player_data['gameid'],
+            player_name,
+            opp_player_name
+        )
+        article_data = {
+            **comparison_data,
+            'stats': radar_stats['stats'],
+            'player_stats_values': radar_stats['stats_values']['player'],
+            'opponent_stats_values': radar_stats['stats_values']['opponent'],
+            'label_mapping': radar_stats['label_mapping'],
+            'max_chars': max_chars
+        }
+        return article_data
+
+    def generate_third_page_article(self, game_df, player_name, max_chars, radar_stats=None, use_cache=True):
         if self.pick_rate_type == "long":
             try:
-                player_data = game_df[game_df['playername'] == player_name].iloc[0]
-                opp_mask = (game_df['position'] == player_data['position']) & (game_df['playername'] != player_name)
-                opp_player_name = game_df[opp_mask]['playername'].iloc[0]
-                game_id = player_data['gameid']
-                radar_stats = self.database.get_radar_stats(game_id, player_name)
-                comparison_data = self.database.get_player_comparison_series(
-                    player_data['gameid'],
-                    player_name,
-                    opp_player_name
-                )
-                article_data = {
-                    **comparison_data,
-                    'stats': radar_stats['stats'],
-                    'player_stats_values': radar_stats['stats_values']['player'],
-                    'opponent_stats_values': radar_stats['stats_values']['opponent'],
-                    'label_mapping': radar_stats['label_mapping'],
-                    'max_chars': max_chars
-                }
-                result = self.chains['third_page'].invoke(article_data)
+                result = self.invoke_chain('third_page', self.build_third_page_input(game_df, player_name, max_chars, radar_stats), use_cache)
                 return result['text']
             except Exception as e:
                 print(f"오류 발생 위치: {__file__}, 라인: {e.__traceback__.tb_lineno}")
                 print(f"오류 타입: {type(e).__name__}")
                 print(f"오류 내용: {str(e)}")
-                return "기사 생성에 실패했습니다."
+                return self.FAILED_TEXT
         elif self.pick_rate_type == "short":
             template = self.prompt.get("pick_rate").get("short").get("page3")
             player_data = game_df[game_df['playername'] == player_name].iloc[0]
             opp_mask = (game_df['position'] == player_data['position']) & (game_df['playername'] != player_name)
             opp_player_name = game_df[opp_mask]['playername'].iloc[0]
             game_id = player_data['gameid']
-            radar_stats = self.database.get_radar_stats(game_id, player_name)
+            if radar_stats is None:
+                radar_stats = self.database.get_radar_stats(game_id, player_name)
             comparison_data = self.database.get_player_comparison_series(
                 player_data['gameid'],
                 player_name,
@@ -265,29 +299,32 @@ class ArticleGenerator:
             return template
 
 
-    def generate_fourth_page_article(self, game_df, player_name, max_chars):
+    def build_fourth_page_input(self, game_df, player_name, max_chars):
+        player_data = game_df[game_df['playername'] == player_name].iloc[0]
+        opp_player_data = game_df[
+            (game_df['position'] == player_data['position']) &
+            (game_df['side'] != player_data['side'])
+            ].iloc[0]
+        patch = self.patch.version
+        champion_stats = self.database.get_champion_pick_rate_info(player_data['name_us'],patch,player_data['position'])
+        line_kr = {"top":"탑", "jungle":"정글", "mid":"미드", "bottom":"원딜", "support":"서포터", }
+        article_data = {"champion_kr_name": champion_stats['name_kr'],
+                        "position": line_kr[player_data['position']],
+                        "tier": champion_stats['tier'],
+                        "pick_rate": champion_stats['pick_rate'],
+                        "ban_rate": champion_stats['ban_rate'],
+                        "win_rate": champion_stats['win_rate'],
+                        "ranking": champion_stats['ranking'],
+                        "patch": patch,
+                        "opponent_champion": self.database.get_name_kr(opp_player_data['name_us']),
+                        "max_chars": max_chars
+                        }
+        return article_data
+
+    def generate_fourth_page_article(self, game_df, player_name, max_chars, use_cache=True):
         try:
             if self.pick_rate_type == "long":
-                player_data = game_df[game_df['playername'] == player_name].iloc[0]
-                opp_player_data = game_df[
-                    (game_df['position'] == player_data['position']) &
-                    (game_df['side'] != player_data['side'])
-                    ].iloc[0]
-                patch = self.patch.version
-                champion_stats = self.database.get_champion_pick_rate_info(player_data['name_us'],patch,player_data['position'])
-                line_kr = {"top":"탑", "jungle":"정글", "mid":"미드", "bottom":"원딜", "support":"서포터", }
-                article_data = {"champion_kr_name": champion_stats['name_kr'],
-                                "position": line_kr[player_data['position']],
-                                "tier": champion_stats['tier'],
-                                "pick_rate": champion_stats['pick_rate'],
-                                "ban_rate": champion_stats['ban_rate'],
-                                "win_rate": champion_stats['win_rate'],
-                                "ranking": champion_stats['ranking'],
-                                "patch": patch,
-                                "opponent_champion": self.database.get_name_kr(opp_player_data['name_us']),
-                                "max_chars": max_chars
-                                }
-                result = self.chains['fourth_page'].invoke(article_data)
+                result = self.invoke_chain('fourth_page', self.build_fourth_page_input(game_df, player_name, max_chars), use_cache)
                 return result['text']
             elif self.pick_rate_type == "short":
                 player_data = game_df[game_df['playername'] == player_name].iloc[0]
@@ -310,42 +347,46 @@ class ArticleGenerator:
                 return template
         except CommonError as e:
             if e.error_code == ErrorCode.DEAD_CHAMPION:
-                return "ㆍ 이 챔피언은 너무 고인이라 (마스터+) 통계가 존재하지 않습니다..."
+                return self.DEAD_CHAMPION_TEXT
 
-    def generate_fifth_page_article_rag(self, match_id, player_name, max_chars):
-        return self.lang_graph.run_page5_article_rag(match_id, player_name, max_chars)
+    def generate_fifth_page_article_rag(self, match_id, player_name, max_chars, use_cache=True):
+        return self.lang_graph.run_page5_article_rag(match_id, player_name, max_chars, use_cache)
 
-    def generate_fifth_page_article(self, match_id, player_name, max_chars):
+    def build_fifth_page_input(self, match_id, player_name, max_chars):
         game_df = self.database.get_game_data(match_id)
         player_data = game_df[game_df['playername'] == player_name].iloc[0]
         counter_info = self.database.get_counter_champion(player_data['name_us'], player_data['position'], self.patch.version)
         player_champion_kr = self.database.get_name_kr(player_data['name_us'])
         top_counters = counter_info.head(3)
+        article_data = {
+            'player_name': player_name,
+            'player_champion_kr': player_champion_kr,
+            'position': player_data['position'],
+            'max_chars': max_chars,
+            'counters': [
+                {
+                    'name_kr': row['name_kr'],
+                    'win_rate': row['win_rate'],
+                    'games_played': row['games_played'],
+                    'kda_diff': row['kda_diff'],
+                    'counter_score': row['counter_score'],
+                }
+                for _, row in top_counters.iterrows()
+            ]
+        }
+        return article_data
+
+    def generate_fifth_page_article(self, match_id, player_name, max_chars, use_cache=True):
+        article_data = self.build_fifth_page_input(match_id, player_name, max_chars)
         try:
-            article_data = {
-                'player_name': player_name,
-                'player_champion_kr': player_champion_kr,
-                'position': player_data['position'],
-                'max_chars': max_chars,
-                'counters': [
-                    {
-                        'name_kr': row['name_kr'],
-                        'win_rate': row['win_rate'],
-                        'games_played': row['games_played'],
-                        'kda_diff': row['kda_diff'],
-                        'counter_score': row['counter_score'],
-                    }
-                    for _, row in top_counters.iterrows()
-                ]
-            }
-            result = self.chains['fifth_page'].invoke(article_data)
+            result = self.invoke_chain('fifth_page', article_data, use_cache)
             return result
         except Exception as e:
             print(f"오류 발생 위치: {__file__}, 라인: {e.__traceback__.tb_lineno}")
             print(f"오류 내용: {str(e)}")
-            return "기사 생성에 실패했습니다."
+            return self.FAILED_TEXT
 
-    def generate_interview_summary(self, game_id, youtube_title, title_info, video_path):
+    def generate_interview_summary(self, game_id, youtube_title, title_info, video_path, use_cache=True):
         try:
             game_df = self.database.get_game_data(game_id)
             player_name = title_info['player_name']
@@ -366,17 +407,143 @@ class ArticleGenerator:
                 "opp_team_score": opp_team_score,
                 "full_text": interview_info['full_text']
             }
-            result = self.chains['interview'].invoke(interview_data)
+            result = self.invoke_chain('interview', interview_data, use_cache)
             return result
         except Exception as e:
             print(f"오류 발생 위치: {__file__}, 라인: {e.__traceback__.tb_lineno}")
             print(f"오류 내용: {str(e)}")
             return "인터뷰 서머리 실패."
 
-    def generate_interview_title(self, title):
-        result = self.chains['interview_title'].invoke({"title":title})
+    def generate_interview_title(self, title, use_cache=True):
+        result = self.invoke_chain('interview_title', {"title":title}, use_cache)
         return result
 
+    @contextlib.asynccontextmanager
+    async def llm_slot(self):
+        """
+        invoke_chain 과 같은 llm_slots 를 비동기에서 사용
+        기사마다 asyncio.run 으로 루프가 따로 생기므로 루프별 asyncio.Semaphore 대신 스레드 semaphore 를 씀
+        blocking acquire 는 루프를 멈추므로 빈 자리가 날 때까지 짧게 기다리며 재시도
+        """
+        while not self.llm_slots.acquire(blocking=False):
+            await asyncio.sleep(self.LLM_SLOT_POLL_SECONDS)
+        try:
+            yield
+        finally:
+            self.llm_slots.release()
+
+    def get_cache_key(self, chain_name, variables):
+        # 프롬프트 문구가 바뀌면 다른 key 가 되도록 템플릿 원문도 포함
+        template = self.chains[chain_name].first.template
+        model_name = getattr(self.llm, 'model_name', type(self.llm).__name__)
+        return LlmCache.make_key(model_name, f"{chain_name}:{template}", variables, getattr(self.llm, 'temperature', None))
+
+    def invoke_chain(self, chain_name, variables, use_cache=True):
+        cache_key = self.get_cache_key(chain_name, variables) if use_cache else None
+        if cache_key is not None:
+            cached = self.llm_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        # 페이지 노드가 LLM 응답을 기다리는 동안 DB 커넥션을 잡고 있지 않도록 먼저 반납
+        self.database.release_idle_connection()
+        with self.llm_slots:
+            result = self.chains[chain_name].invoke(variables)
+        if cache_key is not None:
+            self.llm_cache.set(cache_key, result)
+        return result
+
+    async def ainvoke_chain(self, chain_name, variables, use_cache=True):
+        """
+        동시 요청 수를 invoke_chain 과 합쳐서 llm_concurrency 로 제한하고 실패하면 지수 백오프로 llm_max_retries 번 재시도
+        """
+        cache_key = self.get_cache_key(chain_name, variables) if use_cache else None
+        if cache_key is not None:
+            cached = self.llm_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        chain = self.chains[chain_name]
+        for attempt in range(self.llm_max_retries + 1):
+            try:
+                async with self.llm_slot():
+                    result = await chain.ainvoke(variables)
+                if cache_key is not None:
+                    self.llm_cache.set(cache_key, result)
+                return result
+            except Exception as e:
+                if attempt == self.llm_max_retries:
+                    raise
+                delay = self.llm_backoff_seconds * (2 ** attempt) + random.uniform(0, self.llm_backoff_seconds)
+                print(f"LLM 호출 실패 {chain_name} ({attempt + 1}/{self.llm_max_retries}), {delay:.1f}초 후 재시도 : {e}")
+                await asyncio.sleep(delay)
+
+    async def run_blocking(self, func, *args):
+        # DB 조회는 스레드에서 하고 끝나면 그 스레드가 쓴 커넥션 반납
+        def run():
+            try:
+                return func(*args)
+            finally:
+                self.database.release_connection()
+        return await asyncio.to_thread(run)
+
+    async def agenerate_first_page_article(self, game_df, player_name, max_chars, use_cache=True):
+        article_data = await self.run_blocking(self.build_first_page_input, game_df, player_name, max_chars)
+        result = await self.ainvoke_chain('first_page', article_data, use_cache)
+        return result['title']
+
+    async def agenerate_second_page_article(self, game_df, player_name, max_chars, use_cache=True):
+        if self.pick_rate_type != "long":
+            return await self.run_blocking(self.generate_second_page_article, game_df, player_name, max_chars, use_cache)
+        article_data = await self.run_blocking(self.build_second_page_input, game_df, player_name, max_chars)
+        result = await self.ainvoke_chain('second_page', article_data, use_cache)
+        return result['text']
+
+    async def agenerate_third_page_article(self, game_df, player_name, max_chars, radar_stats=None, use_cache=True):
+        if self.pick_rate_type != "long":
+            return await self.run_blocking(self.generate_third_page_article, game_df, player_name, max_chars, radar_stats, use_cache)
+        try:
+            article_data = await self.run_blocking(self.build_third_page_input, game_df, player_name, max_chars, radar_stats)
+            result = await self.ainvoke_chain('third_page', article_data, use_cache)
+            return result['text']
+        except Exception as e:
+            print(f"3페이지 기사 생성 실패 {player_name} : {type(e).__name__} {e}")
+            return self.FAILED_TEXT
+
+    async def agenerate_fourth_page_article(self, game_df, player_name, max_chars, use_cache=True):
+        if self.pick_rate_type != "long":
+            return await self.run_blocking(self.generate_fourth_page_article, game_df, player_name, max_chars, use_cache)
+        try:
+            article_data = await self.run_blocking(self.build_fourth_page_input, game_df, player_name, max_chars)
+        except CommonError as e:
+            if e.error_code == ErrorCode.DEAD_CHAMPION:
+                return self.DEAD_CHAMPION_TEXT
+            return None
+        result = await self.ainvoke_chain('fourth_page', article_data, use_cache)
+        return result['text']
+
+    async def agenerate_fifth_page_article(self, match_id, player_name, max_chars, use_cache=True):
+        article_data = await self.run_blocking(self.build_fifth_page_input, match_id, player_name, max_chars)
+        try:
+            return await self.ainvoke_chain('fifth_page', article_data, use_cache)
+        except Exception as e:
+            print(f"5페이지 기사 생성 실패 {match_id}, {player_name} : {e}")
+            return self.FAILED_TEXT
+
+    async def agenerate_interview_title(self, title, use_cache=True):
+        return await self.ainvoke_chain('interview_title', {"title": title}, use_cache)
+
+    async def agenerate_page_articles(self, jobs):
+        """
+        여러 기사의 페이지 프롬프트를 한번에 보냄
+        jobs : (page, kwargs) 리스트, page 는 first_page ~ fifth_page, kwargs 는 agenerate_{page}_article 인자
+        반환 : jobs 순서대로 결과, 실패한 job 은 예외 객체
+        """
+        tasks = [getattr(self, f"agenerate_{page}_article")(**kwargs) for page, kwargs in jobs]
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+    def generate_page_articles(self, jobs):
+        # 동기 코드에서 쓰는 진입점
+        return asyncio.run(self.agenerate_page_articles(jobs))
+
     #match_result detection_type -> general, penta_kill, unmatch_line, two_bottom_choice
     def generate_match_result_title(self, detection_type, game_df, player_name):
         base_prompt = self.prompt.get("match_result").get(detection_type)
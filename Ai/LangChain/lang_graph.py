@@ -1,3 +1,4 @@
+import contextlib
 import os
 
 from dotenv import load_dotenv
@@ -12,6 +13,7 @@ from typing import TypedDict, List, Literal
 from langchain_openai import ChatOpenAI
 from langchain_mongodb import MongoDBAtlasVectorSearch
 from Ai.LangChain.response_form import *
+from Ai.LangChain.llm_cache import LlmCache
 
 class RAGState(TypedDict):
     original_prompt: str
@@ -20,10 +22,14 @@ class RAGState(TypedDict):
     final_response: dict
     champion: str
     patch_version: str
+    use_cache: bool
 
 class LangGraph:
 
-    def __init__(self, mongo, database, meta_data, patch):
+    def __init__(self, mongo, database, meta_data, patch, llm_cache=None, llm_slots=None):
+        """
+        llm_slots : ArticleGenerator 와 같이 쓰는 LLM 동시 요청 수 semaphore (없으면 제한 없음)
+        """
         load_dotenv()
         tracer = LangChainTracer(
             project_name=os.getenv('LANGCHAIN_PROJECT', 'default-project')
@@ -32,6 +38,8 @@ class LangGraph:
         self.database = database
         self.patch = patch
         self.prompt = meta_data.prompt
+        self.llm_cache = llm_cache
+        self.llm_slots = llm_slots if llm_slots is not None else contextlib.nullcontext()
         self.embedding = OpenAIEmbeddings(model="text-embedding-3-small")
         self.vector_store = MongoDBAtlasVectorSearch(
             collection=self.mongo.db['patch_info'],
@@ -50,7 +58,13 @@ class LangGraph:
             ---------
         """
         chain = PromptTemplate.from_template(system_prompt + "\n{original_prompt}") | llm
-        query = chain.invoke({"original_prompt": state["original_prompt"]}).content.strip()
+        variables = {"original_prompt": state["original_prompt"]}
+        cache_key = self.get_cache_key(state, llm, f"rewrite_query:{system_prompt}", variables)
+        query = self.get_cached(cache_key)
+        if query is None:
+            with self.llm_slots:
+                query = chain.invoke(variables).content.strip()
+            self.set_cached(cache_key, query)
         state["query"] = query
         print(query)
         print(state["champion"])
@@ -79,14 +93,32 @@ class LangGraph:
         """)
         documents_text = "\n".join([doc.page_content for doc in state["documents"]])
         chain = final_prompt | llm | JsonOutputParser()
-        result = chain.invoke({"original_prompt":state['original_prompt'], "documents": documents_text, "format_instructions":format_instructions})
+        variables = {"original_prompt":state['original_prompt'], "documents": documents_text, "format_instructions":format_instructions}
+        cache_key = self.get_cache_key(state, llm, f"generate_response:{final_prompt.template}", variables)
+        result = self.get_cached(cache_key)
+        if result is None:
+            with self.llm_slots:
+                result = chain.invoke(variables)
+            self.set_cached(cache_key, result)
         state["final_response"] = result
         return state
 
+    def get_cache_key(self, state, llm, template_name, variables):
+        if self.llm_cache is None or not state.get("use_cache", True):
+            return None
+        return LlmCache.make_key(llm.model_name, template_name, variables, llm.temperature)
+
+    def get_cached(self, cache_key):
+        return self.llm_cache.get(cache_key) if cache_key is not None else None
+
+    def set_cached(self, cache_key, response):
+        if cache_key is not None:
+            self.llm_cache.set(cache_key, response)
+
     def output_node(self, state: RAGState) -> dict:
         return state["final_response"]
 
-    def run_page5_article_rag(self, match_id, player_name, max_chars):
+    def run_page5_article_rag(self, match_id, player_name, max_chars, use_cache=True):
         graph = StateGraph(RAGState)
         graph.add_node("rewrite_query", RunnableLambda(self.rewrite_query))
         graph.add_node("retriever", RunnableLambda(self.retrieve_documents))
@@ -124,5 +156,7 @@ class LangGraph:
             max_chars=max_chars,
             counters=counters_payload,
         )
-        response = app.invoke({"original_prompt": original_prompt,"champion": player_champion_kr, "patch_version":patch_version})
+        # 조회는 끝났으니 LLM 호출 전에 DB 커넥션 반납
+        self.database.release_idle_connection()
+        response = app.invoke({"original_prompt": original_prompt,"champion": player_champion_kr, "patch_version":patch_version, "use_cache": use_cache})
         return response['final_response']
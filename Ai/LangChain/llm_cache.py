@@ -0,0 +1,100 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+
+class LlmCache:
+    """
+    LLM 응답 캐시 (SQLite)
+    key = sha256(모델명, 템플릿 이름, 렌더링 변수, temperature) 라서 같은 경기로 다시 돌리면 저장된 응답을 그대로 씀
+    ttl_seconds 가 지난 응답은 무시하고, max_entries 를 넘으면 오래 안 쓴 것부터 삭제
+    """
+
+    def __init__(self, path, ttl_seconds=72 * 3600, max_entries=5000, enabled=True):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.connection = None
+        if self.enabled:
+            os.makedirs(self.path.parent, exist_ok=True)
+            self.connection = sqlite3.connect(str(self.path), check_same_thread=False)
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                "cache_key TEXT PRIMARY KEY, response TEXT NOT NULL, "
+                "created_at REAL NOT NULL, last_access REAL NOT NULL)"
+            )
+            self.connection.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_last_access ON llm_cache (last_access)")
+            self.connection.commit()
+
+    @staticmethod
+    def make_key(model_name, template_name, variables, temperature=None):
+        # DataFrame 값(numpy, Timestamp) 도 들어오므로 default=str, 순서는 sort_keys 로 고정
+        payload = json.dumps(
+            {"model": model_name, "template": template_name, "variables": variables, "temperature": temperature},
+            sort_keys=True, ensure_ascii=False, default=str
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, cache_key):
+        """
+        캐시된 응답, 없거나 만료됐으면 None
+        """
+        if not self.enabled:
+            return None
+        now = time.time()
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT response, created_at FROM llm_cache WHERE cache_key = ?", (cache_key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl_seconds:
+                self.misses += 1
+                return None
+            self.connection.execute("UPDATE llm_cache SET last_access = ? WHERE cache_key = ?", (now, cache_key))
+            self.connection.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, cache_key, response):
+        if not self.enabled:
+            return
+        now = time.time()
+        with self.lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO llm_cache (cache_key, response, created_at, last_access) VALUES (?, ?, ?, ?)",
+                (cache_key, json.dumps(response, ensure_ascii=False, default=str), now, now)
+            )
+            self.evict(now)
+            self.connection.commit()
+
+    def evict(self, now):
+        self.connection.execute("DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl_seconds,))
+        count = self.connection.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        if count > self.max_entries:
+            self.connection.execute(
+                "DELETE FROM llm_cache WHERE cache_key IN "
+                "(SELECT cache_key FROM llm_cache ORDER BY last_access LIMIT ?)",
+                (count - self.max_entries,)
+            )
+
+    def clear(self):
+        if not self.enabled:
+            return
+        with self.lock:
+            self.connection.execute("DELETE FROM llm_cache")
+            self.connection.commit()
+
+    def get_stats(self):
+        return {"hits": self.hits, "misses": self.misses}
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
@@ -1,12 +1,13 @@
 import numpy as np
-from sklearn.ensemble import IsolationForest
-from sklearn.preprocessing import MinMaxScaler
-from datetime import datetime
+from joblib import Parallel, delayed
+from datetime import datetime, date
 from pathlib import Path
 import pandas as pd
 import seaborn as sns
 import matplotlib
 import matplotlib.pyplot as plt
+from AnomalyDetection.detection_engine import DetectionEngine
+from AnomalyDetection.model_store import ModelStore, fit_isolation_forest
 
 """
     oracle_elixir IF,
@@ -16,6 +17,7 @@ import matplotlib.pyplot as plt
     bottom_two_choice
 """
 class ChampionDetection:
+    match_features = ['gamelength','result','kills','deaths','assists','team_kpm','ckpm','damagetochampions','dpm','damagetakenperminute','visionscore','totalgold','earned_gpm','gspd']
 
     def __init__(self, database, meta_data, patch):
         self.database = database
@@ -24,97 +26,53 @@ class ChampionDetection:
         self.output_dir.mkdir(exist_ok=True, parents=True)
         self.patch = patch
         self.line_list = ["top","mid","jungle","bottom","support"]
+        self.engine = DetectionEngine(database, patch)
+        self.detection_results = {}
+        # 학습 데이터가 그대로면 저장된 IsolationForest 재사용
+        self.model_store = ModelStore(Path(__file__).parent.parent / 'Cache' / 'Models', enabled=self.basic_info.get("model_store", True))
+        self.model_n_jobs = self.basic_info.get("model_n_jobs", 5)
+        # 운영용 경기 이상치 : 최근 window 개로 학습, chunk 단위로 새 경기 점수 저장
+        self.match_anomaly_window = self.basic_info.get("match_anomaly_window", 20000)
+        self.match_anomaly_chunk_size = self.basic_info.get("match_anomaly_chunk_size", 2000)
+
+    def detect(self, game_date=None):
+        """
+        하루치 경기를 한번 읽어서 모든 탐지기 실행, 같은 날 다시 부르면 저장된 결과 사용
+        """
+        key = (game_date, date.today())
+        if key not in self.detection_results:
+            self.detection_results = {key: self.engine.run(game_date)}
+        return self.detection_results[key]
 
+    def get_detections(self, detection_type, game_date=None):
+        return [result for result in self.detect(game_date) if result['detection_type'] == detection_type]
 
     def run_performance_score(self):
         self.update_performance_score()
         match_info = self.database.detect_by_performance_score(self.patch.version)
 
     def run_two_bottom_choice(self, game_date=None):
-        bottom_champions = self.database.get_only_bottom_champion(self.patch.version)
-        match_info = self.database.get_all_data_without_team(self.patch.version, game_date)
-        multi_adc_games = []
-        for (gameid, side), team_picks in match_info.groupby(['gameid', 'side']):
-            adc_picks = [pick for pick in team_picks.itertuples() if pick.name_us in bottom_champions]
-            unmatch_picks = [pick for pick in team_picks.itertuples()
-                             if pick.name_us in bottom_champions and pick.position != 'bottom']
-
-            if len(adc_picks) >= 2:
-                game_info = {
-                    'gameid': gameid,
-                    'team_name': unmatch_picks[0].teamname,
-                    'playername': unmatch_picks[0].playername
-                }
-                multi_adc_games.append(game_info)
-        return multi_adc_games
+        return self.get_detections("two_bottom_choice", game_date)
 
     def run_penta_kill(self, game_date=None):
-        penta_kill_list = self.database.get_penta_kill_game_id(self.patch.version, game_date)
-        return penta_kill_list
+        return self.get_detections("penta_kill", game_date)
 
     def run_pick_rate(self, game_date=None):
         """
         픽률이 하위 10프로인 챔피언을 픽한 경우 -> 이긴경우
         """
-        position_champions = self.database.get_all_position_pick_rate(self.patch.version)
-        match_info = self.database.get_all_data_without_team(self.patch.version, game_date)
-        unusual_picks = []
-        for index, row in match_info.iterrows():
-            position = row['position'].lower()
-            name_us = row['name_us']
-            result = row['result']
-            champion = position_champions[position]['name_us_list'].get(name_us, None)
-            # 라인에 맞지 않는 챔피언, 패배한 경우
-            if champion is None or result == 0:
-                continue
-            name_kr = champion.get("name_kr")
-            pick_rate = champion.get("pick_rate")
-
-            pick_info = {
-                'gameid': row['gameid'],
-                'league': row['league'],
-                'set': row['game'],
-                'result': row['result'],
-                'playername': row['playername'],
-                'team': row['teamname'],
-                'position': position,
-                'name_us': name_us,
-                'name_kr': name_kr,
-                'pick_rate': pick_rate,
-                'issue_type': []
-            }
-            if name_us in position_champions[position]['low_pickrate_champions']:
-                pick_info['issue_type'].append(f'낮은 픽률 {pick_rate}')
-
-            # 문제가 있는 경우에만 결과 리스트에 추가
-            if pick_info['issue_type']:
-                unusual_picks.append(pick_info)
-        # if unusual_picks:
-        #     print("\n비정상적인 챔피언 선택 분석:")
-        #     print("=" * 50)
-        #     for pick in unusual_picks:
-        #         print(f"게임 ID: {pick['gameid']}")
-        #         print(f"리그: {pick['league']}")
-        #         print(f"세트: {pick['set']}")
-        #         print(f"결과: {pick['result']}")
-        #         print(f"플레이어: {pick['player']} ({pick['team']})")
-        #         print(f"포지션: {pick['position']}")
-        #         print(f"선택한 챔피언: {pick['name_us']}")
-        #         print(f"특이사항: {', '.join(pick['issue_type'])}")
-        #         print("-" * 50)
-        # else:
-        #     print("모든 챔피언 선택이 일반적입니다.")
-        return unusual_picks
+        return self.get_detections("pick_rate", game_date)
 
     # 모든 매치 데이터에서 IF
     def run_match_info(self):
         match_df = self.database.get_oracle_elixirs_all_team_info()
-        features = ['gamelength','result','kills','deaths','assists','team_kpm','ckpm','damagetochampions','dpm','damagetakenperminute','visionscore','totalgold','earned_gpm','gspd']
+        features = self.match_features
         x = match_df[features].copy()
-        scaler = MinMaxScaler()
-        x_scaled = scaler.fit_transform(x)
-        isolation_forest = IsolationForest(contamination=0.1, random_state=42, n_estimators=200)
-        outliers = isolation_forest.fit_predict(x_scaled)
+        params = {"contamination": 0.1, "random_state": 42, "n_estimators": 200}
+        model_name = f"match_info_{self.basic_info.get('year')}"
+        scaler, isolation_forest = self.get_models({model_name: x}, features, params)[model_name]
+        x_scaled = scaler.transform(x)
+        outliers = isolation_forest.predict(x_scaled)
         anomaly_score = -isolation_forest.score_samples(x_scaled)
 
         result = match_df.copy()
@@ -123,6 +81,37 @@ class ChampionDetection:
         result.loc[outliers == -1, 'is_outlier'] = True
         print(result[result['is_outlier'] == False])
 
+    def score_match_info(self):
+        """
+        경기 이상치 운영 모드
+        시즌 전체 대신 최근 match_anomaly_window 개 team row 로 학습하고
+        아직 점수가 없는 경기만 chunk 단위로 점수를 매겨 match_anomaly_score 에 저장 (메모리는 window + chunk 크기로 고정)
+        """
+        features = self.match_features
+        params = {"contamination": 0.1, "random_state": 42, "n_estimators": 200}
+        window = self.database.get_recent_team_rows(features, self.match_anomaly_window).dropna()
+        if window.empty:
+            print("경기 이상치 학습 데이터 없음")
+            return 0
+        model_name = f"match_info_window_{self.basic_info.get('year')}"
+        scaler, isolation_forest = self.get_models({model_name: window}, features, params)[model_name]
+        model_version = ModelStore.fingerprint(window, features, params)[:16]
+        fill_values = window[features].median()
+
+        scored_count = 0
+        outlier_count = 0
+        for chunk in self.database.iter_unscored_team_rows(features, self.match_anomaly_chunk_size):
+            x_scaled = scaler.transform(chunk[features].fillna(fill_values))
+            chunk = chunk.assign(
+                anomaly_score=-isolation_forest.score_samples(x_scaled),
+                is_outlier=isolation_forest.predict(x_scaled) == -1,
+                model_version=model_version
+            )
+            scored_count += self.database.insert_match_anomaly_scores(chunk)
+            outlier_count += int(chunk['is_outlier'].sum())
+        print(f"경기 이상치 점수 저장 : {scored_count}개 (이상치 {outlier_count}개)")
+        return scored_count
+
     def update_performance_score(self):
         """
         승률, 픽률, 밴률, 챔피언 티어 기반 performance score하위 10개 챔피언 탐지
@@ -133,9 +122,12 @@ class ChampionDetection:
             1. 다른 라인 챔피언을 선택한 경우,
             2. 다른 라인 챔피언 + performance score 가 구린 경우
         """
+        statement_count = 0
+        features = ['pick_rate', 'win_rate', 'ban_rate']
+        params = {"contamination": 0.1, "random_state": 42, "n_estimators": 100}
+        line_data = {}
         for line in self.line_list:
             df = self.database.get_champion_score_by_line(line, self.patch.version)
-            features = ['pick_rate', 'win_rate', 'ban_rate']
             X = df[features].copy()
             performance_score = (
                     X['pick_rate'] +
@@ -144,16 +136,16 @@ class ChampionDetection:
             )
             median_score = performance_score.median()
             weak_idx = performance_score < median_score
-            X_weak = X[weak_idx]
-
-            scaler = MinMaxScaler()
-            X_scaled = scaler.fit_transform(X_weak)
-            iso_forest = IsolationForest(
-                contamination=0.1,
-                random_state=42,
-                n_estimators=100,
-            )
-            outliers = iso_forest.fit_predict(X_scaled)
+            line_data[line] = (df, performance_score, weak_idx, X[weak_idx])
+        models = self.get_models(
+            {f"performance_{line}_{self.patch.version}": X_weak for line, (_, _, _, X_weak) in line_data.items()},
+            features, params
+        )
+
+        for line, (df, performance_score, weak_idx, X_weak) in line_data.items():
+            scaler, iso_forest = models[f"performance_{line}_{self.patch.version}"]
+            X_scaled = scaler.transform(X_weak)
+            outliers = iso_forest.predict(X_scaled)
             anomaly_score = -iso_forest.score_samples(X_scaled)
 
             result = df.copy()
@@ -164,8 +156,36 @@ class ChampionDetection:
             result.loc[weak_idx,'anomaly_score'] = anomaly_score
 
             self.draw_performance_scatter(line, result)
-            self.database.insert_performance_score(line, result)
+            statement_count += self.database.insert_performance_score(line, result)
+        print(f"performance score upsert statement 수 : {statement_count}")
+
 
+    def get_models(self, datasets, features, params):
+        """
+        datasets : {모델 이름: 학습 데이터}
+        fingerprint 가 같은 저장 모델은 불러오고, 나머지는 joblib 으로 동시에 학습 후 저장
+        반환 : {모델 이름: (scaler, model)}
+        """
+        models = {}
+        refit = {}
+        for name, x in datasets.items():
+            fingerprint = ModelStore.fingerprint(x, features, params)
+            loaded = self.model_store.load(name, fingerprint)
+            if loaded is None:
+                refit[name] = (x, fingerprint)
+            else:
+                models[name] = loaded
+        if refit:
+            print(f"IsolationForest 재학습 : {list(refit)}")
+            fitted = Parallel(n_jobs=min(self.model_n_jobs, len(refit)))(
+                delayed(fit_isolation_forest)(x, params) for x, _ in refit.values()
+            )
+            for (name, (_, fingerprint)), (scaler, model) in zip(refit.items(), fitted):
+                self.model_store.save(name, fingerprint, scaler, model)
+                models[name] = (scaler, model)
+        else:
+            print("IsolationForest 학습 데이터 변경 없음, 저장된 모델 사용")
+        return models
 
     def draw_performance_scatter(self, line, result):
         plt.figure(figsize=(10, 6))
@@ -209,18 +229,4 @@ class ChampionDetection:
         plt.close()
 
     def run_unmatch_line(self, game_date=None):
-        champion_dict_by_line = self.database.get_all_champion_list(self.patch.version)
-        match_info = self.database.get_all_data_without_team(self.patch.version, game_date)
-        off_position_picks = []
-        for index, row in match_info.iterrows():
-            line = row['position'].lower()
-            name_us = row['name_us']
-            if name_us not in champion_dict_by_line[line]:
-                off_position_picks.append({
-                    'gameid': row['gameid'],
-                    'playername': row['playername'],
-                    'team': row['teamname'],
-                    'line': line,
-                    'name_us': name_us
-                })
-        return off_position_picks
+        return self.get_detections("unmatch_line", game_date)
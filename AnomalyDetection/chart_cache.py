@@ -0,0 +1,48 @@
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+
+
+class ChartCache:
+    """
+    그래프 렌더링 결과 파일 캐시
+    Cache/Charts/{patch}/{chart_type}_{inputs hash}.png 에 저장하고, 같은 입력으로 다시 그리면 파일 경로만 반환
+    입력에는 그래프에 들어가는 값을 모두 넣어야 함 (값이 바뀌면 다른 파일)
+    """
+
+    def __init__(self, base_dir, enabled=True):
+        self.base_dir = Path(base_dir)
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+
+    def chart_path(self, chart_type, inputs, patch):
+        payload = json.dumps(inputs, sort_keys=True, ensure_ascii=False, default=str)
+        digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()[:24]
+        return self.base_dir / str(patch) / f"{chart_type}_{digest}.png"
+
+    def lookup(self, chart_type, inputs, patch):
+        """
+        반환 : (저장 경로, 이미 있는지)
+        """
+        path = self.chart_path(chart_type, inputs, patch)
+        if self.enabled and path.exists():
+            self.hits += 1
+            return path, True
+        self.misses += 1
+        path.parent.mkdir(exist_ok=True, parents=True)
+        return path, False
+
+    @staticmethod
+    def temp_path(path):
+        # 여러 스레드/프로세스가 같은 그래프를 그려도 완성된 파일만 보이도록 임시 파일에 저장 후 교체
+        return path.with_name(f"{path.stem}.{os.getpid()}.{threading.get_ident()}.tmp.png")
+
+    @staticmethod
+    def commit(temp_path, path):
+        os.replace(temp_path, path)
+
+    def get_stats(self):
+        return {"hits": self.hits, "misses": self.misses}
@@ -0,0 +1,520 @@
+import contextlib
+import io
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+from matplotlib import font_manager as fm
+import numpy as np
+from AnomalyDetection.chart_cache import ChartCache
+
+"""
+    그래프 렌더링 서비스
+    그래프는 render spec (chart, data, path) 으로 표현하고 작업 프로세스에서 그림
+    spec 에는 DB 객체 없이 그래프에 들어가는 값만 넣음 (pickle 로 작업 프로세스에 전달)
+    path 가 있으면 파일로 저장하고 경로, 없으면 PNG bytes 반환
+"""
+
+# pyplot 은 전역 상태라 같은 프로세스의 여러 스레드에서 동시에 그리면 figure 가 섞임 -> 그리는 동안 잠금
+render_lock = threading.RLock()
+
+# 작업 프로세스마다 init_worker 에서 등록한 폰트 이름
+FONT_NAME = None
+
+BASE_STYLE = 'seaborn-v0_8-dark'
+DARK_RC = {
+    'text.color': 'white',
+    'axes.labelcolor': 'white',
+    'xtick.color': 'white',
+    'ytick.color': 'white'
+}
+POSITION_KR_MAP = {'jungle': '정글', 'top': '탑', 'bottom': '바텀', 'mid': '미드', 'support': '서포터'}
+
+SERIES_METRICS = {
+    "goldat": {
+        "title": "시간대별 골드 획득",
+        "ylabel": "골드 (K)",
+        "format": lambda x: f"{x / 1000:.1f}K",
+        "div_factor": 1000,
+        "columns": ["goldat", "opp_goldat"]
+    },
+    "xpat": {
+        "title": "시간대별 경험치 획득",
+        "ylabel": "경험치",
+        "format": lambda x: f"{x:.0f}",
+        "div_factor": 1,
+        "columns": ["xpat", "opp_xpat"]
+    },
+    # csat, killsat, assistsat, deathsat 도 같은 형식으로 추가하면 그림
+}
+KDA_COLORS = {
+    'kills': '#4CAF50',  # 초록색
+    'deaths': '#DC2626',  # 빨간색
+    'assists': '#1E40AF'  # 파란색
+}
+ECONOMY_METRICS = {
+    'gold': {'div_factor': 1000, 'format': lambda x: f'{x / 1000:.1f}K', 'color': '#FFD700', 'title': '골드'},
+    'xp': {'div_factor': 1, 'format': lambda x: f'{x:.0f}', 'color': '#9C27B0', 'title': '경험치'},
+    'cs': {'div_factor': 1, 'format': lambda x: f'{x:.0f}', 'color': '#2196F3', 'title': 'CS'}
+}
+
+
+def init_worker(font_path):
+    """
+    작업 프로세스 initializer, 프로세스마다 한번 폰트 등록
+    """
+    global FONT_NAME
+    matplotlib.use('Agg')
+    fm.fontManager.addfont(str(font_path))
+    FONT_NAME = fm.FontProperties(fname=str(font_path)).get_name()
+
+
+@contextlib.contextmanager
+def chart_style(style=None, rc=None):
+    # 그래프마다 스타일을 잠깐 적용하고 되돌려서 다음 그래프에 영향이 없게 함
+    with contextlib.ExitStack() as stack:
+        if style:
+            stack.enter_context(plt.style.context(style))
+        stack.enter_context(plt.rc_context({'font.family': FONT_NAME, 'axes.unicode_minus': False, **(rc or {})}))
+        yield
+
+
+def style_dark_legend(ax, fontsize, ncol=1):
+    legend = ax.legend(loc='upper left', frameon=True,
+                       bbox_to_anchor=(0.02, 0.98),
+                       fontsize=fontsize, ncol=ncol)
+    frame = legend.get_frame()
+    frame.set_facecolor('#1a1a1a')
+    frame.set_edgecolor('white')
+    for text in legend.get_texts():
+        text.set_color('white')
+
+
+def render_pick_rate(data):
+    bars_data = data['bars']
+    name_us = data['name_us']
+    names_kr = [bar[1] for bar in bars_data]
+    pick_rates = [bar[2] for bar in bars_data]
+    unusual_name_kr = next(bar[1] for bar in bars_data if bar[0] == name_us)
+
+    fig, ax = plt.subplots(figsize=(10.8, 10.8))
+    ax.set_facecolor('none')
+    fig.patch.set_facecolor('none')
+
+    colors = ['#3498db' if bar[0] != name_us else '#e74c3c' for bar in bars_data]
+    bars = ax.bar(
+        range(len(bars_data)),
+        pick_rates,
+        color=colors,
+        edgecolor='black',
+        linewidth=1,
+        alpha=0.7,
+        width=0.7
+    )
+    ax.grid(True, axis='y', linestyle='--', alpha=0.7, zorder=0)
+    ax.set_axisbelow(True)
+    ax.set_xticks(range(len(bars_data)))
+    ax.set_xticklabels(names_kr, rotation=45, ha='right', fontsize=20, fontweight='bold', color='white')
+    ax.tick_params(axis='y', colors='white')
+    ax.set_ylim(0, max(pick_rates) * 1.2)
+
+    position_kr = POSITION_KR_MAP[data['position']]
+    ax.set_title(f'{position_kr} {unusual_name_kr} 픽률   패치 버전:{data["patch"]}',
+                 pad=20,
+                 size=30,
+                 fontweight='bold',
+                 color='white')
+
+    threshold = data['threshold']
+    ax.axhline(
+        y=threshold,
+        color='#e74c3c',
+        linestyle='--',
+        alpha=0.5,
+        linewidth=2,
+        label=f'Low Pick Rate Threshold ({threshold:.2f}%)'
+    )
+    for bar in bars:
+        height = bar.get_height()
+        ax.text(
+            bar.get_x() + bar.get_width() / 2.,
+            height,
+            f'{height:.1f}%',
+            ha='center',
+            va='bottom',
+            fontsize=20,
+            fontweight='bold',
+            color='white'
+        )
+    fig.tight_layout()
+    return fig
+
+
+def render_pick_rate_vertical(data):
+    bars_data = data['bars']
+    name_us = data['name_us']
+    names_kr = [bar[1] for bar in bars_data]
+    pick_rates = [bar[2] for bar in bars_data]
+    unusual_name_kr = next(bar[1] for bar in bars_data if bar[0] == name_us)
+
+    fig, ax = plt.subplots(figsize=(5.9, 10.8))
+    ax.set_facecolor('none')
+    fig.patch.set_facecolor('none')
+
+    colors = ['#3498db' if bar[0] != name_us else '#e74c3c' for bar in bars_data]
+    bars = ax.barh(
+        range(len(bars_data)),
+        pick_rates,
+        color=colors,
+        edgecolor='black',
+        linewidth=1,
+        alpha=0.7,
+        height=0.7
+    )
+    ax.grid(True, axis='x', linestyle='--', alpha=0.7, zorder=0)
+    ax.set_axisbelow(True)
+    ax.set_yticks(range(len(bars_data)))
+    ax.set_yticklabels(names_kr, fontsize=11, fontweight='bold', color='white')
+    ax.tick_params(axis='x', colors='white')
+    ax.set_xlim(0, max(pick_rates) * 1.2)
+
+    position_kr = POSITION_KR_MAP[data['position']]
+    ax.set_title(f'{position_kr} {unusual_name_kr} 챔피언별 픽률   패치 버전:{data["patch"]}',
+                 pad=20,
+                 size=16,
+                 fontweight='bold',
+                 color='white')
+
+    threshold = data['threshold']
+    ax.axvline(
+        x=threshold,
+        color='#e74c3c',
+        linestyle='--',
+        alpha=0.5,
+        linewidth=2,
+        label=f'Low Pick Rate Threshold ({threshold:.2f}%)'
+    )
+    for bar in bars:
+        width = bar.get_width()
+        ax.text(
+            width + (max(pick_rates) * 0.02),
+            bar.get_y() + bar.get_height() / 2.,
+            f'{width:.1f}%',
+            ha='left',
+            va='center',
+            fontsize=10,
+            fontweight='bold',
+            color='white'
+        )
+    fig.tight_layout()
+    return fig
+
+
+def render_series(data):
+    config = SERIES_METRICS[data['metric']]
+    champion_name, opp_champion_name = data['champions']
+    valid_times = data['times']
+    player_values = data['player']
+    opponent_values = data['opponent']
+
+    fig, ax = plt.subplots(figsize=(12, 7), dpi=100)
+    ax.set_facecolor('#1a1a1a')
+    fig.patch.set_facecolor('#1a1a1a')
+
+    ax.plot(valid_times, player_values, '-', color='#1E40AF',
+            linewidth=3, marker='o', markersize=8,
+            label=f'({champion_name})')
+    ax.plot(valid_times, opponent_values, '-', color='#DC2626',
+            linewidth=3, marker='o', markersize=8,
+            label=f'({opp_champion_name})')
+
+    # 차이 영역 표시
+    ax.fill_between(valid_times, player_values, opponent_values,
+                    where=(np.array(player_values) >= np.array(opponent_values)),
+                    color='#1E40AF', alpha=0.1)
+    ax.fill_between(valid_times, player_values, opponent_values,
+                    where=(np.array(player_values) <= np.array(opponent_values)),
+                    color='#DC2626', alpha=0.1)
+
+    ax.grid(True, linestyle='--', alpha=0.3, color='gray')
+    ax.set_title(config['title'], pad=20, fontsize=24, fontweight='bold', color='white')
+    ax.set_xlabel('게임 시간 (분)', labelpad=10, fontsize=22, color='white')
+    ax.set_ylabel(config['ylabel'], labelpad=10, fontsize=22, color='white')
+    ax.set_xticks(valid_times)
+    ax.set_xticklabels([f'{t}분' for t in valid_times], fontsize=20, color='white')
+    ax.tick_params(axis='y', labelsize=20)
+
+    # y축 범위 설정
+    all_values = player_values + opponent_values
+    min_val = min(all_values)
+    max_val = max(all_values)
+    padding = (max_val - min_val) * 0.1
+    ax.set_ylim(min_val - padding, max_val + padding)
+
+    style_dark_legend(ax, fontsize=20)
+    for spine in ['top', 'right']:
+        ax.spines[spine].set_visible(False)
+
+    # 데이터 포인트에 값 표시
+    for i, (pv, ov) in enumerate(zip(player_values, opponent_values)):
+        ax.annotate(config['format'](pv * config['div_factor']),
+                    (valid_times[i], pv),
+                    textcoords="offset points", xytext=(0, 15),
+                    ha='center', color='white', fontsize=18)
+        ax.annotate(config['format'](ov * config['div_factor']),
+                    (valid_times[i], ov),
+                    textcoords="offset points", xytext=(0, -20),
+                    ha='center', color='white', fontsize=18)
+    fig.tight_layout()
+    return fig
+
+
+def render_kda(data):
+    champion_name, opp_champion_name = data['champions']
+    fig, ax = plt.subplots(figsize=(14, 8), dpi=100)
+    ax.set_facecolor('#1a1a1a')
+    fig.patch.set_facecolor('#1a1a1a')
+
+    valid_times = []
+    for metric, values in data['metrics'].items():
+        valid_times = values['times']
+        player_values = values['player']
+        opponent_values = values['opponent']
+        # 실선 플레이어, 점선 상대방
+        ax.plot(valid_times, player_values, '-', color=KDA_COLORS[metric],
+                linewidth=3, marker='o', markersize=8,
+                label=f'{champion_name} {metric.title()}')
+        ax.plot(valid_times, opponent_values, '--', color=KDA_COLORS[metric],
+                linewidth=2, marker='s', markersize=6,
+                label=f'{opp_champion_name} {metric.title()}')
+        for i, (pv, ov) in enumerate(zip(player_values, opponent_values)):
+            ax.annotate(f'{pv:.0f}', (valid_times[i], pv),
+                        textcoords="offset points", xytext=(0, 10),
+                        ha='center', color='white', fontsize=12)
+            ax.annotate(f'{ov:.0f}', (valid_times[i], ov),
+                        textcoords="offset points", xytext=(0, -15),
+                        ha='center', color='white', fontsize=12)
+
+    ax.grid(True, linestyle='--', alpha=0.3, color='gray')
+    ax.set_title('시간대별 KDA', pad=20, fontsize=24, fontweight='bold', color='white')
+    ax.set_xlabel('게임 시간 (분)', labelpad=10, fontsize=22, color='white')
+    ax.set_ylabel('횟수', labelpad=10, fontsize=22, color='white')
+    ax.set_xticks(valid_times)
+    ax.set_xticklabels([f'{t}분' for t in valid_times], fontsize=20, color='white')
+    ax.tick_params(axis='y', labelsize=20)
+
+    style_dark_legend(ax, fontsize=16, ncol=2)
+    for spine in ['top', 'right']:
+        ax.spines[spine].set_visible(False)
+    fig.tight_layout()
+    return fig
+
+
+def render_economy(data):
+    champion_name, opp_champion_name = data['champions']
+    fig, axes = plt.subplots(3, 1, figsize=(14, 12), dpi=100)
+    fig.patch.set_facecolor('#1a1a1a')
+
+    for ax, (metric, config) in zip(axes, ECONOMY_METRICS.items()):
+        ax.set_facecolor('#1a1a1a')
+        values = data['metrics'][metric]
+        valid_times = values['times']
+        player_values = values['player']
+        opponent_values = values['opponent']
+        color = config['color']
+
+        ax.plot(valid_times, player_values, '-', color=color,
+                linewidth=3, marker='o', markersize=8,
+                label=champion_name)
+        ax.plot(valid_times, opponent_values, '--', color=color,
+                linewidth=2, marker='s', markersize=6,
+                label=opp_champion_name)
+
+        # 차이 영역 표시
+        ax.fill_between(valid_times, player_values, opponent_values,
+                        where=(np.array(player_values) >= np.array(opponent_values)),
+                        color=color, alpha=0.1)
+        ax.fill_between(valid_times, player_values, opponent_values,
+                        where=(np.array(player_values) <= np.array(opponent_values)),
+                        color=color, alpha=0.1)
+
+        for i, (pv, ov) in enumerate(zip(player_values, opponent_values)):
+            ax.annotate(config['format'](pv * config['div_factor']),
+                        (valid_times[i], pv),
+                        textcoords="offset points", xytext=(0, 10),
+                        ha='center', color='white', fontsize=12)
+            ax.annotate(config['format'](ov * config['div_factor']),
+                        (valid_times[i], ov),
+                        textcoords="offset points", xytext=(0, -15),
+                        ha='center', color='white', fontsize=12)
+
+        ax.grid(True, linestyle='--', alpha=0.3, color='gray')
+        ax.set_title(f'시간대별 {config["title"]}', pad=15, fontsize=18, color='white')
+        ax.set_xlabel('게임 시간 (분)', labelpad=10, fontsize=16, color='white')
+        ax.tick_params(axis='both', labelsize=14)
+        ax.set_xticks(valid_times)
+        ax.set_xticklabels([f'{t}분' for t in valid_times])
+
+        style_dark_legend(ax, fontsize=14)
+        for spine in ['top', 'right']:
+            ax.spines[spine].set_visible(False)
+    fig.tight_layout()
+    return fig
+
+
+def format_radar_value(stat, value):
+    if stat == 'kda':
+        return f"{value:.2f}"
+    return int(value) if isinstance(value, (int, np.integer)) else f"{value:.2f}"
+
+
+def render_radar(data):
+    radar_data = data['radar']
+    orig_vals = radar_data['stats_values']
+    norm_vals = radar_data['normalized_values']
+    kp, dp, ap = orig_vals['player'][0], orig_vals['player'][1], orig_vals['player'][2]
+    ko, do_, ao = orig_vals['opponent'][0], orig_vals['opponent'][1], orig_vals['opponent'][2]
+    kda_p = (kp + ap) / max(1, dp)
+    kda_o = (ko + ao) / max(1, do_)
+
+    max_kda = max(kda_p, kda_o, 1e-6)
+    norm_kda_p = kda_p / max_kda * 0.7
+    norm_kda_o = kda_o / max_kda * 0.7
+
+    stats = ['kda'] + radar_data['stats'][3:]
+    labels = ['KDA'] + [radar_data['label_mapping'][s] for s in radar_data['stats'][3:]]
+
+    vals_p = [norm_kda_p] + list(norm_vals['player'][3:])
+    vals_o = [norm_kda_o] + list(norm_vals['opponent'][3:])
+    orig_p = [kda_p] + list(orig_vals['player'][3:])
+    orig_o = [kda_o] + list(orig_vals['opponent'][3:])
+
+    vals_p += vals_p[:1]
+    vals_o += vals_o[:1]
+    stats_ang = np.linspace(0, 2 * np.pi, len(stats), endpoint=False).tolist()
+    stats_ang += stats_ang[:1]
+
+    px, py = 3000, 2300
+    fig = plt.figure(figsize=(px / 300, py / 300), facecolor='none')
+    ax = fig.add_subplot(111, polar=True)
+    ax.set_theta_offset(np.pi / 2)
+    ax.set_theta_direction(-1)
+    ax.grid(False)
+    ax.spines['polar'].set_visible(False)
+    ax.set_yticklabels([])
+
+    for r in [0.2, 0.4, 0.6, 0.8, 1.0]:
+        ax.plot(stats_ang, [r] * len(stats_ang), '--', color='white', alpha=1)
+
+    ax.fill(stats_ang, vals_p, alpha=0.25, color='#3498db')
+    ax.plot(stats_ang, vals_p, 'o-', linewidth=2,
+            label=radar_data['player_names']['player'], color='#3498db')
+    ax.fill(stats_ang, vals_o, alpha=0.25, color='#e74c3c')
+    ax.plot(stats_ang, vals_o, 'o-', linewidth=2,
+            label=radar_data['player_names']['opponent'], color='#e74c3c')
+
+    ax.set_xticks(stats_ang[:-1])
+    ax.set_xticklabels(labels, color='white', fontsize=20)
+
+    for i, ang in enumerate(stats_ang[:-1]):
+        ax.text(ang, vals_p[i] + 0.1, format_radar_value(stats[i], orig_p[i]),
+                color='#3498db', ha='center', va='bottom', fontsize=20, fontweight='bold')
+        r = vals_o[i] + 0.1
+        x = r * np.cos(ang) + 0.05 * np.sin(ang)
+        y = r * np.sin(ang) - 0.05 * np.cos(ang)
+        ax.text(np.arctan2(y, x), np.hypot(x, y), format_radar_value(stats[i], orig_o[i]),
+                color='#e74c3c', ha='center', va='bottom', fontsize=20, fontweight='bold')
+    ax.legend(loc='upper right', bbox_to_anchor=(0.1, 0.1), fontsize=20, labelcolor='white')
+    fig.tight_layout()
+    return fig
+
+
+# chart -> (그리는 함수, 스타일, rcParams, savefig 옵션)
+TIGHT_SAVE = {'bbox_inches': 'tight', 'dpi': 300, 'transparent': True}
+RENDERERS = {
+    "pick_rate": (render_pick_rate, BASE_STYLE, None, TIGHT_SAVE),
+    "pick_rate_vertical": (render_pick_rate_vertical, BASE_STYLE, None, TIGHT_SAVE),
+    "series": (render_series, BASE_STYLE, DARK_RC, TIGHT_SAVE),
+    "kda": (render_kda, BASE_STYLE, DARK_RC, TIGHT_SAVE),
+    "economy": (render_economy, BASE_STYLE, DARK_RC, TIGHT_SAVE),
+    "radar": (render_radar, None, None, {'dpi': 300, 'transparent': True, 'pad_inches': 0}),
+}
+
+
+def render_spec(spec):
+    """
+    spec : {"chart": RENDERERS 키, "data": 그래프 값, "path": 저장 경로 또는 None}
+    반환 : 저장 경로(str) 또는 PNG bytes
+    """
+    renderer, style, rc, save_kwargs = RENDERERS[spec["chart"]]
+    with chart_style(style, rc):
+        fig = renderer(spec["data"])
+        try:
+            if spec.get("path") is None:
+                buffer = io.BytesIO()
+                fig.savefig(buffer, format='png', **save_kwargs)
+                return buffer.getvalue()
+            path = Path(spec["path"])
+            path.parent.mkdir(exist_ok=True, parents=True)
+            # 완성된 파일만 보이도록 임시 파일에 저장 후 교체
+            temp_path = ChartCache.temp_path(path)
+            fig.savefig(temp_path, **save_kwargs)
+            ChartCache.commit(temp_path, path)
+            return str(path)
+        finally:
+            plt.close(fig)
+
+
+class ChartRenderer:
+    """
+    render spec 을 프로세스 풀에서 그림
+    max_workers 가 0 이면 현재 프로세스에서 render_lock 을 잡고 그림
+    풀은 처음 그릴 때 만들고, 스레드가 있는 프로세스에서 fork 하지 않도록 spawn 으로 시작
+    """
+
+    def __init__(self, font_path, max_workers=0):
+        self.font_path = str(font_path)
+        self.max_workers = max_workers
+        self.executor = None
+        self.executor_lock = threading.Lock()
+        # 현재 프로세스에서 그릴 때도 같은 폰트 사용
+        init_worker(self.font_path)
+
+    def get_executor(self):
+        with self.executor_lock:
+            if self.executor is None:
+                self.executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=init_worker,
+                    initargs=(self.font_path,)
+                )
+            return self.executor
+
+    def submit(self, spec):
+        if self.max_workers <= 0:
+            future = Future()
+            try:
+                with render_lock:
+                    future.set_result(render_spec(spec))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+        return self.get_executor().submit(render_spec, spec)
+
+    def render(self, spec):
+        return self.submit(spec).result()
+
+    def render_many(self, specs):
+        # 한꺼번에 제출해서 작업 프로세스 수만큼 동시에 그림, 결과는 spec 순서
+        futures = [self.submit(spec) for spec in specs]
+        return [future.result() for future in futures]
+
+    def close(self):
+        with self.executor_lock:
+            if self.executor is not None:
+                self.executor.shutdown()
+                self.executor = None
@@ -0,0 +1,135 @@
+from collections import OrderedDict
+from typing import TypedDict, List
+
+"""
+    하루치 경기를 한번만 읽고 등록된 탐지기를 모두 실행
+    탐지기는 경기 frame 을 받아서 탐지된 row 만 남긴 DataFrame 을 반환 (row 단위 루프 없이 mask, merge 로 처리)
+"""
+
+
+class DetectionResult(TypedDict, total=False):
+    detection_type: str
+    gameid: str
+    playername: str
+    team: str
+    team_name: str
+    league: str
+    set: int
+    result: int
+    line: str
+    position: str
+    name_us: str
+    name_kr: str
+    pick_rate: float
+    issue_type: List[str]
+
+
+class DetectionEngine:
+
+    def __init__(self, database, patch):
+        self.database = database
+        self.patch = patch
+        self.detectors = OrderedDict()
+        self.lookups = {}
+        self.register("pick_rate", self.detect_pick_rate, self.to_pick_rate_result)
+        self.register("unmatch_line", self.detect_unmatch_line, self.to_unmatch_line_result)
+        self.register("two_bottom_choice", self.detect_two_bottom_choice, self.to_two_bottom_choice_result)
+        self.register("penta_kill", self.detect_penta_kill, self.to_penta_kill_result)
+
+    def register(self, detection_type, detector, to_result):
+        """
+        detector(games) : 탐지된 row DataFrame
+        to_result(hits) : DetectionResult 리스트 (detection_type 은 엔진이 채움)
+        """
+        self.detectors[detection_type] = (detector, to_result)
+
+    def run(self, game_date=None, detection_types=None):
+        games = self.database.get_day_player_rows(game_date)
+        games = games.assign(position=games['position'].str.lower())
+        # 패치별 조회 테이블은 실행마다 새로 읽음
+        self.lookups = {}
+        results = []
+        for detection_type, (detector, to_result) in self.detectors.items():
+            if games.empty or (detection_types is not None and detection_type not in detection_types):
+                continue
+            hits = detector(games)
+            for result in to_result(hits):
+                result['detection_type'] = detection_type
+                results.append(result)
+        return results
+
+    def get_lookup(self, name, loader):
+        if name not in self.lookups:
+            self.lookups[name] = loader()
+        return self.lookups[name]
+
+    # 패치의 5개 라인 champion_score 테이블 (position, name_us, name_kr, pick_rate, is_low_pick_rate)
+    def load_champion_position(self):
+        return self.database.get_champion_position_table(self.patch.version).drop_duplicates(['position', 'name_us'], keep='last')
+
+    def detect_pick_rate(self, games):
+        """
+        픽률이 하위 10프로인 챔피언을 픽해서 이긴 경우
+        """
+        champion_position = self.get_lookup("champion_position", self.load_champion_position)
+        wins = games[games['result'] == 1]
+        pick_rate_table = champion_position.rename(columns={'name_kr': 'champion_name_kr', 'pick_rate': 'champion_pick_rate'})
+        picks = wins.merge(
+            pick_rate_table[['position', 'name_us', 'champion_name_kr', 'champion_pick_rate', 'is_low_pick_rate']],
+            on=['position', 'name_us'], how='left'
+        )
+        return picks[picks['is_low_pick_rate'].fillna(False).astype(bool)]
+
+    def detect_unmatch_line(self, games):
+        """
+        이긴 팀에서 해당 라인에 등록되지 않은 챔피언을 픽한 경우
+        """
+        champion_position = self.get_lookup("champion_position", self.load_champion_position)
+        wins = games[games['result'] == 1]
+        picks = wins.merge(champion_position[['position', 'name_us']], on=['position', 'name_us'], how='left', indicator=True)
+        return picks[picks['_merge'] == 'left_only']
+
+    def detect_two_bottom_choice(self, games):
+        """
+        이긴 팀이 바텀 전용 챔피언을 2개 이상 픽한 경우, 바텀이 아닌 라인에서 픽한 선수
+        """
+        bottom_champions = self.get_lookup("bottom_only", lambda: self.database.get_only_bottom_champion(self.patch.version))
+        wins = games[games['result'] == 1]
+        is_adc = wins['name_us'].isin(bottom_champions)
+        adc_count = is_adc.groupby([wins['gameid'], wins['side']]).transform('sum')
+        unmatch = wins[is_adc & (adc_count >= 2) & (wins['position'] != 'bottom')]
+        return unmatch.sort_values(['gameid', 'side'], kind='stable').groupby(['gameid', 'side']).head(1)
+
+    def detect_penta_kill(self, games):
+        patch = round(float(self.patch.version), 2)
+        is_patch = games['patch'].astype(float).round(2) == patch
+        return games[(games['pentakills'] >= 1) & is_patch & games['playername'].notna()]
+
+    def to_pick_rate_result(self, hits):
+        return [
+            {
+                'gameid': row.gameid,
+                'league': row.league,
+                'set': row.game,
+                'result': row.result,
+                'playername': row.playername,
+                'team': row.teamname,
+                'position': row.position,
+                'name_us': row.name_us,
+                'name_kr': row.champion_name_kr,
+                'pick_rate': row.champion_pick_rate,
+                'issue_type': [f'낮은 픽률 {row.champion_pick_rate}']
+            }
+            for row in hits.itertuples(index=False)
+        ]
+
+    def to_unmatch_line_result(self, hits):
+        return hits[['gameid', 'playername', 'teamname', 'position', 'name_us']].rename(
+            columns={'teamname': 'team', 'position': 'line'}
+        ).to_dict('records')
+
+    def to_two_bottom_choice_result(self, hits):
+        return hits[['gameid', 'teamname', 'playername']].rename(columns={'teamname': 'team_name'}).to_dict('records')
+
+    def to_penta_kill_result(self, hits):
+        return hits[['playername', 'gameid']].to_dict('records')
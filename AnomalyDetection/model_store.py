@@ -0,0 +1,69 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+import joblib
+import pandas as pd
+from sklearn.ensemble import IsolationForest
+from sklearn.preprocessing import MinMaxScaler
+
+
+class ModelStore:
+    """
+    학습한 MinMaxScaler + IsolationForest 를 joblib 파일로 저장
+    Cache/Models/{name}.joblib 에 학습 데이터 fingerprint 와 같이 저장하고
+    다음 실행 때 fingerprint 가 같으면 다시 학습하지 않고 불러옴
+    """
+
+    def __init__(self, base_dir, enabled=True):
+        self.base_dir = Path(base_dir)
+        self.enabled = enabled
+
+    @staticmethod
+    def fingerprint(df, features, params):
+        # 학습 데이터 값, 컬럼, 모델 파라미터가 같으면 같은 fingerprint
+        row_hash = pd.util.hash_pandas_object(df[features].reset_index(drop=True), index=False).values
+        digest = hashlib.sha256(row_hash.tobytes())
+        digest.update(json.dumps({"features": features, "params": params}, sort_keys=True).encode("utf-8"))
+        return digest.hexdigest()
+
+    def model_path(self, name):
+        return self.base_dir / f"{name}.joblib"
+
+    def load(self, name, fingerprint):
+        """
+        fingerprint 가 같은 모델이 있으면 (scaler, model), 없으면 None
+        """
+        if not self.enabled:
+            return None
+        path = self.model_path(name)
+        if not path.exists():
+            return None
+        try:
+            saved = joblib.load(path)
+        except Exception as e:
+            print(f"모델 파일 로드 실패 {path} : {e}")
+            return None
+        if saved.get("fingerprint") != fingerprint:
+            return None
+        return saved["scaler"], saved["model"]
+
+    def save(self, name, fingerprint, scaler, model):
+        if not self.enabled:
+            return
+        os.makedirs(self.base_dir, exist_ok=True)
+        path = self.model_path(name)
+        tmp_path = path.with_suffix(".tmp")
+        joblib.dump({"fingerprint": fingerprint, "scaler": scaler, "model": model}, tmp_path)
+        os.replace(tmp_path, path)
+
+
+def fit_isolation_forest(x, params):
+    """
+    joblib 작업 프로세스에서 실행하는 학습 함수
+    """
+    scaler = MinMaxScaler()
+    x_scaled = scaler.fit_transform(x)
+    model = IsolationForest(**params)
+    model.fit(x_scaled)
+    return scaler, model
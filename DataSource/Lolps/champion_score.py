@@ -49,11 +49,13 @@ class ChampionScore:
     def update_score(self):
         try:
             patch_info = self.database.get_latest_patch_and_url_number()
+            statement_count = 0
             for line_str, line_num in self.line_num.items():
                 url = self.score_url.format(patch_info['url_number'], 3, line_num)
                 get_score = re.get(url, headers=self.headers)
                 score_info = get_score.json()
-                self.database.insert_champion_score(line_str, patch_info['patch_version'], "master", "korea", score_info.get('data'))
+                statement_count += self.database.insert_champion_score(line_str, patch_info['patch_version'], "master", "korea", score_info.get('data'))
+            print(f"PS 챔피언 스코어 upsert statement 수 : {statement_count}")
         except re.exceptions.JSONDecodeError:
             print(f"PS 챔피언 스코어 가져오기 JSON 인코딩 에러 URL : {url} \n text : {get_score}")
 
@@ -1,43 +1,143 @@
+import os
 import gdown
 import pandas as pd
+import requests as re
 
 class OracleElixirDownloader:
 
-    def __init__(self, database):
+    def __init__(self, database, source=None):
         self.database = database
+        self.file_id_2025 = "1v6LRphp2kYciU4SXp0PCjEMuev1bDejc"
+        self.file_id_2024 = "1IjIEhLc9n8eLKeY-yh_YigKVWbhgGBsN"
+        # 로컬 csv 경로를 넣으면 구글 드라이브 대신 사용 (오프라인 테스트용)
+        self.source = source or f"https://drive.google.com/uc?id={self.file_id_2025}"
+        self.chunksize = 10000
 
     def download_csv(self):
-        file_id = "1v6LRphp2kYciU4SXp0PCjEMuev1bDejc"
-        url = f"https://drive.google.com/uc?id={file_id}"
+        url = f"https://drive.google.com/uc?id={self.file_id_2025}"
         output = "2025_LoL_esports_match_data.csv"
         gdown.download(url, output, quiet=False)
 
-    def update_oracle_elixirs(self):
-        file_id_2025 = "1v6LRphp2kYciU4SXp0PCjEMuev1bDejc"
-        file_id_2024 = "1IjIEhLc9n8eLKeY-yh_YigKVWbhgGBsN"
-        url = f"https://drive.google.com/uc?id={file_id_2025}"
-        chunksize = 10000
-        last_date = self.database.get_last_date_from_db()
-        for chunk in pd.read_csv(url, dtype={'url': 'str'}, chunksize=chunksize):
-            chunk = chunk.rename(columns={
-                'year': 'game_year',
-                'date': 'game_date',
-                'dragons (type unknown)': 'dragons_type_unknown',
-                'team kpm': 'team_kpm',
-                'earned gpm': 'earned_gpm',
-                'total cs': 'total_cs',
-                'champion': 'name_us'
-            })
-            position_mapping = {
-                'sup': 'support',
-                'jng': 'jungle',
-                'bot': 'bottom'
+    def get_source_version(self, source):
+        if os.path.exists(source):
+            stat = os.stat(source)
+            return {"etag": f"{stat.st_mtime_ns}-{stat.st_size}", "file_size": stat.st_size}
+        try:
+            response = re.head(source, allow_redirects=True, timeout=30)
+            content_length = response.headers.get("Content-Length")
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+            if etag is None and last_modified is not None:
+                # ETag 가 없으면 Last-Modified + 크기를 파일 버전으로 사용
+                etag = f"last-modified:{last_modified}:{content_length}"
+            if etag is None:
+                print(f"oracle elixir 파일 버전 헤더(ETag, Last-Modified) 없음, 변경 없음 스킵/이어받기 없이 전체 파일 확인 : {source}")
+            return {
+                "etag": etag,
+                "file_size": int(content_length) if content_length else None
             }
-            chunk['position'] = chunk['position'].replace(position_mapping)
-            if 'patch' in chunk.columns:
-                chunk['patch'] = chunk['patch'].astype(str).str.replace(r'^15\.(\d+)$', r'25.\1', regex=True)
-            if not pd.api.types.is_datetime64_any_dtype(chunk['game_date']):
-                chunk['game_date'] = pd.to_datetime(chunk['game_date'])
-            chunk = chunk[chunk['game_date'] > last_date]
-            self.database.insert_oracle_elixir(chunk)
+        except re.exceptions.RequestException as e:
+            print(f"oracle elixir 파일 버전 확인 실패, 변경 없음 스킵/이어받기 없이 전체 파일 확인 : {e}")
+            return {"etag": None, "file_size": None}
 
+    def transform_chunk(self, chunk):
+        chunk = chunk.rename(columns={
+            'year': 'game_year',
+            'date': 'game_date',
+            'dragons (type unknown)': 'dragons_type_unknown',
+            'team kpm': 'team_kpm',
+            'earned gpm': 'earned_gpm',
+            'total cs': 'total_cs',
+            'champion': 'name_us'
+        })
+        position_mapping = {
+            'sup': 'support',
+            'jng': 'jungle',
+            'bot': 'bottom'
+        }
+        chunk['position'] = chunk['position'].replace(position_mapping)
+        if 'patch' in chunk.columns:
+            chunk['patch'] = chunk['patch'].astype(str).str.replace(r'^15\.(\d+)$', r'25.\1', regex=True)
+        if not pd.api.types.is_datetime64_any_dtype(chunk['game_date']):
+            chunk['game_date'] = pd.to_datetime(chunk['game_date'])
+        return chunk
+
+    def update_oracle_elixirs(self):
+        """
+        watermark(oracle_elixir_sync) 기준 증분 동기화
+        - 파일 버전(ETag, 없으면 Last-Modified / 로컬 파일은 수정 시간, size)이 같고 완료된 상태면 스킵
+          버전을 알 수 없으면 스킵/이어받기 없이 sync_from_date 이후만 insert
+        - 같은 파일로 실행 중 죽었으면 마지막으로 커밋된 chunk 다음부터 이어서 진행
+        - sync_from_date 보다 오래된 chunk 는 날짜 컬럼만 보고 건너뜀
+        - 끝나면 insert 된 패치의 columnar store(parquet) 스냅샷, champion_matchup 집계 갱신
+        """
+        source = self.source
+        version = self.get_source_version(source)
+        watermark = self.database.get_oracle_elixir_watermark(source)
+        same_file = (
+            watermark is not None
+            and version['etag'] is not None
+            and watermark['etag'] == version['etag']
+            and watermark['file_size'] == version['file_size']
+        )
+        if same_file and watermark['status'] == 'COMPLETE':
+            print(f"oracle elixir 변경 없음, 동기화 스킵 : {source}")
+            # 스냅샷, 매치업 집계가 아직 없으면 처음 한번 만들어 둠
+            self.database.refresh_columnar_store()
+            self.database.update_champion_matchup()
+            return
+
+        if same_file and watermark['status'] == 'RUNNING':
+            committed_rows = watermark['committed_rows']
+            chunk_index = watermark['last_chunk_index'] + 1
+            sync_from_date = watermark['sync_from_date']
+            last_game_date = watermark['last_game_date']
+            last_gameid = watermark['last_gameid']
+            print(f"oracle elixir 이전 동기화 이어서 진행 : {committed_rows} rows 이후부터")
+        else:
+            committed_rows = 0
+            chunk_index = 0
+            if watermark is not None and watermark['last_game_date'] is not None:
+                sync_from_date = watermark['last_game_date']
+            else:
+                sync_from_date = self.database.get_last_date_from_db()
+            last_game_date = sync_from_date
+            last_gameid = watermark['last_gameid'] if watermark else None
+        sync_from_date = pd.to_datetime(sync_from_date)
+
+        state = {
+            'etag': version['etag'],
+            'file_size': version['file_size'],
+            'sync_from_date': sync_from_date.to_pydatetime(),
+            'last_game_date': pd.to_datetime(last_game_date).to_pydatetime() if last_game_date is not None else None,
+            'last_gameid': last_gameid,
+            'committed_rows': committed_rows,
+            'last_chunk_index': chunk_index - 1,
+            'status': 'RUNNING'
+        }
+        reader = pd.read_csv(source, dtype={'url': 'str'}, chunksize=self.chunksize, skiprows=range(1, committed_rows + 1))
+        for chunk in reader:
+            game_dates = pd.to_datetime(chunk['date'])
+            new_rows = game_dates > sync_from_date
+            if new_rows.any():
+                chunk = self.transform_chunk(chunk[new_rows])
+                self.database.insert_oracle_elixir_bulk(chunk, commit=False)
+                chunk_last_date = chunk['game_date'].max()
+                if last_game_date is None or chunk_last_date > pd.to_datetime(last_game_date):
+                    last_game_date = chunk_last_date
+                last_gameid = chunk['gameid'].iloc[-1]
+            committed_rows += len(game_dates)
+            state.update({
+                'last_game_date': pd.to_datetime(last_game_date).to_pydatetime() if last_game_date is not None else None,
+                'last_gameid': last_gameid,
+                'committed_rows': committed_rows,
+                'last_chunk_index': chunk_index
+            })
+            # chunk insert 와 watermark 가 같이 커밋됨
+            self.database.save_oracle_elixir_watermark(source, state)
+            chunk_index += 1
+        state['status'] = 'COMPLETE'
+        self.database.save_oracle_elixir_watermark(source, state)
+        # 이번에 insert 된 패치만 parquet 스냅샷 갱신, 새 경기만 매치업 집계에 반영
+        self.database.refresh_columnar_store()
+        self.database.update_champion_matchup()
@@ -0,0 +1,87 @@
+import threading
+
+
+class ChampionRegistry:
+    """
+    champion_info 를 한번 읽어서 들고 있는 챔피언 이름 사전
+    ps_name(oracle elixir name_us) <-> name_kr, oracle_elixir_name, lol_official_image_name 을 dict 로 바로 조회
+    champion_info 가 바뀌면 (update_ps_name, ChampionInfo.update_champion_info) refresh() 호출
+    """
+
+    def __init__(self, database):
+        self.database = database
+        self.lock = threading.Lock()
+        self.loaded = False
+        self.champions = {}
+        self.ps_name_by_name_kr = {}
+        self.ps_name_by_oracle_elixir_name = {}
+        self.ps_name_by_image_name = {}
+        # 사전에도 DB 에도 없는 이름은 다시 조회하지 않음
+        self.missing = set()
+
+    def refresh(self):
+        rows = self.database.fetch_all("select * from champion_info")
+        with self.lock:
+            self.champions = {}
+            self.ps_name_by_name_kr = {}
+            self.ps_name_by_oracle_elixir_name = {}
+            self.ps_name_by_image_name = {}
+            self.missing = set()
+            for row in rows:
+                self.add(row)
+            self.loaded = True
+
+    def add(self, row):
+        ps_name = row.get('ps_name')
+        if ps_name is None:
+            return
+        self.champions[ps_name] = row
+        if row.get('name_kr'):
+            self.ps_name_by_name_kr[row['name_kr']] = ps_name
+        if row.get('oracle_elixir_name'):
+            self.ps_name_by_oracle_elixir_name[row['oracle_elixir_name']] = ps_name
+        if row.get('lol_official_image_name'):
+            self.ps_name_by_image_name[row['lol_official_image_name']] = ps_name
+
+    def get(self, ps_name):
+        if not self.loaded:
+            self.refresh()
+        champion = self.champions.get(ps_name)
+        if champion is not None or ps_name in self.missing:
+            return champion
+        # 사전에 없는 챔피언(신챔 등)만 한번 DB 확인
+        row = self.database.fetch_one("select * from champion_info where ps_name = %s", args=(ps_name,))
+        with self.lock:
+            if row is None:
+                self.missing.add(ps_name)
+            else:
+                self.add(row)
+        return row
+
+    def get_name_kr(self, ps_name):
+        champion = self.get(ps_name)
+        return champion['name_kr'] if champion else None
+
+    def get_image_name(self, ps_name):
+        champion = self.get(ps_name)
+        return champion.get('lol_official_image_name') if champion else None
+
+    def get_ps_name_by_name_kr(self, name_kr):
+        if not self.loaded:
+            self.refresh()
+        return self.ps_name_by_name_kr.get(name_kr)
+
+    def get_ps_name_by_oracle_elixir_name(self, oracle_elixir_name):
+        if not self.loaded:
+            self.refresh()
+        return self.ps_name_by_oracle_elixir_name.get(oracle_elixir_name)
+
+    def get_ps_name_by_image_name(self, image_name):
+        if not self.loaded:
+            self.refresh()
+        return self.ps_name_by_image_name.get(image_name)
+
+    def get_name_kr_list(self):
+        if not self.loaded:
+            self.refresh()
+        return [champion.get('name_kr') for champion in self.champions.values()]
@@ -0,0 +1,93 @@
+import json
+import os
+from pathlib import Path
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+
+class ColumnarStore:
+    """
+    oracle_elixir_{year} 테이블의 패치별 parquet 스냅샷
+    Cache/Columnar/oracle_elixir_2025/patch_25.02.parquet 형태로 저장하고
+    조회는 pyarrow filter(predicate pushdown) + columns(projection) 으로 필요한 row, 컬럼만 읽음
+    pyarrow 가 없거나 스냅샷이 없으면 available() 이 False 이므로 MySQL 로 조회하면 됨
+    manifest.json 에 패치별로 내보낸 시점의 MySQL 상태(row 수, 마지막 gameid)를 저장해서
+    Database 가 현재 MySQL 상태와 비교해 오래된 스냅샷인지 확인함 (프로세스가 죽어도 남음)
+    """
+
+    def __init__(self, base_dir, year, enabled=True, row_group_size=10000):
+        self.base_dir = Path(base_dir) / f"oracle_elixir_{year}"
+        self.enabled = enabled and pa is not None
+        self.row_group_size = row_group_size
+
+    def patch_key(self, patch):
+        return f"{float(patch):.2f}"
+
+    def patch_path(self, patch):
+        return self.base_dir / f"patch_{self.patch_key(patch)}.parquet"
+
+    def manifest_path(self):
+        return self.base_dir / "manifest.json"
+
+    def read_manifest(self):
+        path = self.manifest_path()
+        if not path.exists():
+            return {}
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def record_export(self, patch, export_state):
+        manifest = self.read_manifest()
+        manifest[self.patch_key(patch)] = export_state
+        temp_path = self.manifest_path().with_suffix(".tmp")
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, self.manifest_path())
+
+    def snapshot_files(self):
+        if not self.base_dir.exists():
+            return []
+        return sorted(self.base_dir.glob("patch_*.parquet"))
+
+    def available(self):
+        return self.enabled and len(self.snapshot_files()) > 0
+
+    def write_patch(self, patch, df, export_state):
+        """
+        export_state : 내보낸 시점의 MySQL 패치 상태, parquet 교체 후 manifest 에 기록
+        """
+        if not self.enabled:
+            return
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+        # gameid 로 정렬해야 row group 통계로 gameid 필터가 잘 걸러짐
+        df = df.sort_values(['gameid', 'participantid']).reset_index(drop=True)
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        save_path = self.patch_path(patch)
+        temp_path = save_path.with_suffix(".tmp")
+        pq.write_table(table, temp_path, row_group_size=self.row_group_size)
+        os.replace(temp_path, save_path)
+        self.record_export(patch, export_state)
+
+    def read(self, filters=None, columns=None, patch=None):
+        """
+        filters : pyarrow DNF 형식 [('gameid', '==', 'xxx'), ('position', '!=', 'team')]
+        patch : 지정하면 해당 패치 파일만 읽음
+        스냅샷이 없으면 None
+        """
+        if not self.enabled:
+            return None
+        if patch is not None:
+            files = [path for path in [self.patch_path(patch)] if path.exists()]
+        else:
+            files = self.snapshot_files()
+        if not files:
+            return None
+        # 패치마다 전부 null 인 컬럼 타입이 달라질 수 있어서 스키마 통합
+        schema = pa.unify_schemas([pq.read_schema(path) for path in files], promote_options="permissive")
+        dataset = ds.dataset([str(path) for path in files], schema=schema, format="parquet")
+        expression = pq.filters_to_expression(filters) if filters else None
+        return dataset.to_table(columns=columns, filter=expression).to_pandas()
@@ -0,0 +1,159 @@
+import queue
+import threading
+import time
+import weakref
+import pymysql
+
+READ_STATEMENTS = ("SELECT", "SHOW", "DESCRIBE", "EXPLAIN", "SET")
+
+
+class LostTransactionError(RuntimeError):
+    """
+    커밋 안 된 쓰기가 있는 커넥션이 끊김 (새 커넥션으로 이어서 진행하면 쓰기가 사라지므로 재시도하지 않음)
+    """
+
+
+class TrackedConnection(pymysql.connections.Connection):
+    """
+    커밋 안 된 쓰기(INSERT, UPDATE 등)가 있는지 기록하는 커넥션
+    """
+    pending_writes = False
+
+    def query(self, sql, unbuffered=False):
+        statement = sql.decode(self.encoding, "ignore") if isinstance(sql, bytes) else sql
+        if not statement.lstrip().upper().startswith(READ_STATEMENTS):
+            self.pending_writes = True
+        return super().query(sql, unbuffered)
+
+    def commit(self):
+        super().commit()
+        self.pending_writes = False
+
+    def rollback(self):
+        super().rollback()
+        self.pending_writes = False
+
+
+class ConnectionPool:
+    """
+    pymysql 커넥션 풀
+    최대 size 개까지 만들고, 반납된 커넥션은 다시 꺼내 씀
+    idle_check_seconds 이상 쉬었던 커넥션은 ping(재연결 없이) 으로 확인
+    - 풀에서 꺼낼 때 끊겼으면 버리고 새로 연결 (반납 때 rollback 해서 열린 트랜잭션 없음)
+    - 사용 중 끊겼으면 커밋 안 된 쓰기가 없을 때만 새로 연결, 있으면 LostTransactionError
+    """
+
+    def __init__(self, db_info, size=5, idle_check_seconds=60, checkout_timeout=300, logger=None):
+        self.db_info = db_info
+        self.size = size
+        self.idle_check_seconds = idle_check_seconds
+        self.checkout_timeout = checkout_timeout
+        self.logger = logger
+        self.idle_connections = queue.LifoQueue()
+        self.slots = threading.BoundedSemaphore(size)
+
+    def create_connection(self):
+        return TrackedConnection(
+            host=self.db_info['host'],
+            user=self.db_info['id'],
+            password=self.db_info['password'],
+            db=self.db_info['db'],
+            charset='utf8mb4',
+        )
+
+    def acquire(self):
+        if not self.slots.acquire(timeout=self.checkout_timeout):
+            raise TimeoutError(f"DB 커넥션 풀 대기 시간 초과 (size={self.size})")
+        try:
+            try:
+                connection, last_used = self.idle_connections.get_nowait()
+            except queue.Empty:
+                return self.create_connection()
+            if time.monotonic() - last_used > self.idle_check_seconds and not self.is_alive(connection):
+                self.close_connection(connection)
+                return self.create_connection()
+            return connection
+        except Exception:
+            self.slots.release()
+            raise
+
+    def is_alive(self, connection):
+        # reconnect=True 는 트랜잭션 중에도 몰래 새 커넥션으로 바꾸므로 사용하지 않음
+        try:
+            connection.ping(reconnect=False)
+            return True
+        except pymysql.err.Error as e:
+            if self.logger:
+                self.logger.error(f"DB 커넥션 끊김: {e}")
+            return False
+
+    def release(self, connection):
+        try:
+            # 커밋 안 된 작업은 다음 사용자에게 넘기지 않음
+            connection.rollback()
+            self.idle_connections.put((connection, time.monotonic()))
+        except pymysql.err.Error:
+            self.close_connection(connection)
+        finally:
+            self.slots.release()
+
+    # 끊긴 커넥션은 풀에 돌려놓지 않고 버림
+    def discard(self, connection):
+        self.close_connection(connection)
+        self.slots.release()
+
+    def close_connection(self, connection):
+        try:
+            connection.close()
+        except pymysql.err.Error:
+            pass
+
+    def close_all(self):
+        while True:
+            try:
+                connection, _ = self.idle_connections.get_nowait()
+            except queue.Empty:
+                break
+            self.close_connection(connection)
+
+
+class PooledSession:
+    """
+    스레드 하나가 쓰는 커넥션 + DictCursor
+    release 를 안 하고 스레드가 끝나도 session 이 정리될 때 커넥션이 풀에 반납됨
+    """
+
+    def __init__(self, pool):
+        self.pool = pool
+        self.attach(pool.acquire())
+
+    def attach(self, connection):
+        self.connection = connection
+        self.cursor = connection.cursor(pymysql.cursors.DictCursor)
+        self.last_used = time.monotonic()
+        self.finalizer = weakref.finalize(self, self.pool.release, connection)
+
+    @property
+    def pending_writes(self):
+        return self.connection.pending_writes
+
+    def touch(self):
+        # LLM 호출 등으로 오래 쉬었으면 서버에서 끊었을 수 있어서 확인
+        if time.monotonic() - self.last_used > self.pool.idle_check_seconds and not self.pool.is_alive(self.connection):
+            if self.pending_writes:
+                raise LostTransactionError("커밋 안 된 쓰기가 있는 DB 커넥션이 끊겼습니다")
+            self.reconnect()
+        self.last_used = time.monotonic()
+
+    def reconnect(self):
+        # 풀 자리는 그대로 두고 커넥션만 교체
+        self.finalizer.detach()
+        self.pool.close_connection(self.connection)
+        self.attach(self.pool.create_connection())
+
+    def release(self):
+        self.finalizer()
+
+    def discard(self):
+        if self.finalizer.detach():
+            self.pool.discard(self.connection)
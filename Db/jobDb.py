@@ -20,14 +20,21 @@ class Database:
             logger.error(f"데이터베이스 연결 실패: {e}")
             raise
 
+    # 스케줄러가 오래 들고 있는 커넥션이라 실행 전에 끊겼는지 확인 후 재연결
+    def ensure_connection(self):
+        self.db.ping(reconnect=True)
+
     def execute(self, query, args=None):
+        self.ensure_connection()
         return self.cursor.execute(query, args)
 
     def fetch_all(self, query, args=None):
+        self.ensure_connection()
         self.cursor.execute(query, args)
         return self.cursor.fetchall()
 
     def fetch_one(self, query, args=None):
+        self.ensure_connection()
         self.cursor.execute(query, args)
         return self.cursor.fetchone()
 
@@ -1,51 +1,147 @@
 import os
 import sys
+import time
+import threading
 import re as regex
 import numpy as np
 import pymysql
 import pandas as pd
-from datetime import datetime, date
+from collections import OrderedDict
+from datetime import datetime, date, timedelta
 from fuzzywuzzy import fuzz
 from util.commonException import CommonError,ErrorCode
+from Db.columnar_store import ColumnarStore
+from Db.champion_registry import ChampionRegistry
+from Db.connection_pool import ConnectionPool, PooledSession, LostTransactionError
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(os.path.dirname(__file__)))))
 
 class Database:
     def __init__(self, db_info, meta_data, logger):
         self.db_info = db_info
         self.logger = logger
-        self.connection = None
-        self.cursor = None
+        # 스레드마다 풀에서 커넥션, 커서를 하나씩 받아서 씀
+        self.pool = ConnectionPool(db_info, size=self.get_pool_size(meta_data.basic_info), logger=logger)
+        self.local = threading.local()
         self.connect()
         self.year = meta_data.basic_info.get("year")
+        self.insert_batch_size = meta_data.basic_info.get("insert_batch_size", 1000)
+        # 분석용 조회는 parquet 스냅샷에서 읽음 (pyarrow 없으면 MySQL 그대로 사용)
+        columnar_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Cache", "Columnar")
+        self.columnar_store = ColumnarStore(columnar_dir, self.year, enabled=meta_data.basic_info.get("columnar_store", False))
+        # 스냅샷이 MySQL 과 같은지 확인한 결과 (insert 하면 None 으로 돌려서 다시 확인)
+        self.columnar_fresh = None
+        self.columnar_lock = threading.Lock()
+        # gameid 별 경기 데이터 LRU 캐시 (기사 하나에서 같은 경기를 여러번 조회함)
+        self.game_cache = OrderedDict()
+        self.game_cache_size = meta_data.basic_info.get("game_cache_size", 64)
+        self.game_cache_lock = threading.Lock()
+        self.game_cache_hits = 0
+        self.game_cache_misses = 0
+        # gameid 별 MVP 점수 LRU, 값은 (채점한 경기 데이터, 점수) (game_cache 와 같은 lock / 크기, 경기 데이터가 바뀌면 같이 비움)
+        self.mvp_cache = OrderedDict()
+        # (라인, 패치) 별 챔피언 랭킹 스냅샷
+        self.champion_rank_cache = {}
+        # champion_info 이름 사전, 첫 조회 때 한번 로드
+        self.champion_registry = ChampionRegistry(self)
 
     def connect(self):
         try:
-            self.connection = pymysql.connect(
-                host=self.db_info['host'],
-                user=self.db_info['id'],
-                password=self.db_info['password'],
-                db=self.db_info['db'],
-                charset='utf8mb4',
-            )
-            self.cursor = self.connection.cursor(pymysql.cursors.DictCursor)
+            self.checkout()
             self.logger.info("데이터베이스 연결 성공")
         except Exception as e:
             self.logger.error(f"데이터베이스 연결 실패: {e}")
             raise
 
+    def get_pool_size(self, basic_info):
+        """
+        메인 스레드 1개 + 기사 스레드마다 (기사 스레드 1 + 페이지 노드 page_workers) 개가 동시에 커넥션을 쓸 수 있음
+        db_pool_size 가 더 작으면 대기 시간 초과가 나므로 필요한 개수로 늘림
+        """
+        required = 1 + basic_info.get("article_workers", 4) * (1 + basic_info.get("page_workers", 5))
+        size = basic_info.get("db_pool_size", required)
+        if size < required:
+            self.logger.info(f"db_pool_size {size} 가 작업 스레드 수보다 작아서 {required} 로 늘림")
+            size = required
+        return size
+
+    def checkout(self):
+        session = getattr(self.local, "session", None)
+        if session is None:
+            session = PooledSession(self.pool)
+            self.local.session = session
+        else:
+            try:
+                session.touch()
+            except LostTransactionError:
+                # 끊긴 커넥션은 버리고 예외는 그대로 올려서 작업을 중단
+                self.reset_connection()
+                raise
+        return session
+
+    @property
+    def connection(self):
+        return self.checkout().connection
+
+    @property
+    def cursor(self):
+        return self.checkout().cursor
+
+    # 작업 스레드가 끝날 때 커넥션을 풀에 반납
+    def release_connection(self):
+        session = getattr(self.local, "session", None)
+        if session is not None:
+            self.local.session = None
+            session.release()
+
+    # LLM 응답처럼 오래 기다리기 전에 커넥션을 풀에 반납 (커밋 안 된 쓰기가 있으면 그대로 유지)
+    def release_idle_connection(self):
+        session = getattr(self.local, "session", None)
+        if session is not None and not session.pending_writes:
+            self.release_connection()
+
+    # OperationalError 난 커넥션은 버리고 다음 사용 때 새로 받음
+    def reset_connection(self):
+        session = getattr(self.local, "session", None)
+        if session is not None:
+            self.local.session = None
+            session.discard()
+
+    # 조회는 커넥션이 끊겼으면 한번 재연결해서 재시도 (커밋 안 된 쓰기가 있으면 재시도하지 않음)
+    def run_read(self, read):
+        try:
+            return read()
+        except pymysql.err.OperationalError as e:
+            session = getattr(self.local, "session", None)
+            pending_writes = session is not None and session.pending_writes
+            self.reset_connection()
+            if pending_writes:
+                raise LostTransactionError(f"커밋 안 된 쓰기가 있는 DB 커넥션이 끊겼습니다: {e}") from e
+            self.logger.error(f"DB 조회 실패, 재연결 후 재시도: {e}")
+            return read()
+
+    def read_sql(self, query, params=None):
+        return self.run_read(lambda: pd.read_sql(query, self.connection, params=params))
+
     def fetch_all(self, query, args=None):
-        self.cursor.execute(query, args)
-        return self.cursor.fetchall()
+        def read():
+            cursor = self.cursor
+            cursor.execute(query, args)
+            return cursor.fetchall()
+        return self.run_read(read)
 
     def fetch_one(self, query, args=None):
-        self.cursor.execute(query, args)
-        return self.cursor.fetchone()
+        def read():
+            cursor = self.cursor
+            cursor.execute(query, args)
+            return cursor.fetchone()
+        return self.run_read(read)
 
     def commit(self):
         self.connection.commit()
 
     def close(self):
-        self.connection.close()
+        self.release_connection()
+        self.pool.close_all()
 
     def process_value(self, value):
         if pd.isna(value):
@@ -75,6 +171,157 @@ class Database:
                     print(f"Problematic row data: {row}")
                     continue
         self.commit()
+        self.mark_columnar_stale()
+        self.invalidate_game_cache(df['gameid'].unique())
+
+    # process_value 를 컬럼 단위로 적용 (NaN, 빈 문자열 -> NULL, bool -> int)
+    def frame_to_rows(self, df):
+        cleaned = df.copy()
+        for column in cleaned.columns:
+            series = cleaned[column]
+            if pd.api.types.is_bool_dtype(series):
+                cleaned[column] = series.astype(int)
+            elif series.dtype == object or pd.api.types.is_string_dtype(series):
+                blank = series.astype('string').str.strip().eq('').fillna(False)
+                series = series.mask(blank)
+                cleaned[column] = series.replace({True: 1, False: 0})
+        cleaned = cleaned.astype(object)
+        cleaned = cleaned.where(cleaned.notna(), None)
+        return cleaned.values.tolist()
+
+    def insert_oracle_elixir_bulk(self, df, batch_size=None, commit=True):
+        """
+        commit=False 이면 배치마다 커밋하지 않고 호출한 쪽에서 한번에 커밋 (watermark 와 같은 트랜잭션으로 묶을 때)
+        """
+        if df.empty:
+            return 0
+        batch_size = batch_size or self.insert_batch_size
+        columns = ', '.join(df.columns)
+        placeholders = ', '.join(['%s'] * len(df.columns))
+        insert_query = f"INSERT IGNORE INTO oracle_elixir_{self.year} ({columns}) VALUES ({placeholders})"
+        rows = self.frame_to_rows(df)
+        start_time = time.perf_counter()
+        inserted = 0
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start:start + batch_size]
+            self.cursor.execute("SAVEPOINT oracle_elixir_batch")
+            try:
+                inserted += self.cursor.executemany(insert_query, batch)
+            except pymysql.Error as e:
+                # 배치 실패 시 해당 배치만 한 줄씩 다시 넣어서 문제 row 만 건너뜀
+                self.cursor.execute("ROLLBACK TO SAVEPOINT oracle_elixir_batch")
+                self.logger.error(f"배치 insert 실패, 단건 insert 로 재시도 ({start}~{start + len(batch)}): {e}")
+                for offset, values in enumerate(batch):
+                    try:
+                        inserted += self.cursor.execute(insert_query, values)
+                    except pymysql.Error as row_error:
+                        self.logger.error(f"Error inserting row {start + offset + 1}: {row_error}")
+            if commit:
+                self.commit()
+        self.mark_columnar_stale()
+        self.invalidate_game_cache(df['gameid'].unique())
+        elapsed = time.perf_counter() - start_time
+        rows_per_sec = len(rows) / elapsed if elapsed > 0 else float(len(rows))
+        self.logger.info(f"oracle_elixir_{self.year} bulk insert {len(rows)} rows (new {inserted}), {elapsed:.2f}s, {rows_per_sec:.0f} rows/sec")
+        return inserted
+
+    def mark_columnar_stale(self):
+        with self.columnar_lock:
+            self.columnar_fresh = None
+
+    def get_patch_export_states(self):
+        """
+        MySQL 패치별 상태 (row 수, 마지막 gameid), 스냅샷 manifest 와 비교하는 export watermark
+        oracle_elixir 는 INSERT IGNORE 로만 추가되므로 두 값이 같으면 스냅샷도 같음
+        """
+        select_query = f"""
+            select patch, count(*) as row_count, max(gameid) as last_gameid
+            from oracle_elixir_{self.year}
+            where patch is not null
+            group by patch
+        """
+        return {
+            row['patch']: {"rows": int(row['row_count']), "last_gameid": row['last_gameid']}
+            for row in self.fetch_all(select_query)
+        }
+
+    def get_stale_patches(self, export_states=None):
+        if export_states is None:
+            export_states = self.get_patch_export_states()
+        manifest = self.columnar_store.read_manifest()
+        return [
+            patch for patch, state in export_states.items()
+            if manifest.get(self.columnar_store.patch_key(patch)) != state
+        ]
+
+    def use_columnar_store(self):
+        """
+        스냅샷이 있고 모든 패치의 export watermark 가 MySQL 과 같을 때만 parquet 에서 읽음
+        커밋 후 내보내기 전에 죽었으면 오래된 패치가 남으므로 MySQL 로 조회
+        """
+        with self.columnar_lock:
+            if self.columnar_fresh is None:
+                if not self.columnar_store.available():
+                    self.columnar_fresh = False
+                else:
+                    stale_patches = self.get_stale_patches()
+                    self.columnar_fresh = not stale_patches
+                    if stale_patches:
+                        self.logger.warning(f"columnar store 스냅샷이 오래됨, MySQL 로 조회 : {stale_patches}")
+            return self.columnar_fresh
+
+    def refresh_columnar_store(self, patches=None):
+        """
+        export watermark 가 MySQL 과 다른 패치만 parquet 스냅샷을 다시 만듦
+        (스냅샷이 없거나 이전 실행이 내보내기 전에 죽은 패치도 여기서 다시 내보냄)
+        """
+        if not self.columnar_store.enabled:
+            return
+        export_states = self.get_patch_export_states()
+        if patches is None:
+            patches = self.get_stale_patches(export_states)
+        for patch in patches:
+            select_query = f"select * from oracle_elixir_{self.year} where patch = %s"
+            patch_df = self.read_sql(select_query, params=(patch,))
+            self.columnar_store.write_patch(patch, patch_df, export_states.get(patch))
+            self.logger.info(f"columnar store 갱신 patch {patch} : {len(patch_df)} rows")
+        self.mark_columnar_stale()
+
+    def get_oracle_elixir_watermark(self, source):
+        select_query = "select * from oracle_elixir_sync where source = %s and game_year = %s"
+        return self.fetch_one(select_query, args=(source, self.year))
+
+    # 커밋까지 같이 하므로 commit=False 로 넣은 chunk 와 watermark 가 한 트랜잭션으로 반영됨
+    def save_oracle_elixir_watermark(self, source, watermark):
+        query = """
+            INSERT INTO oracle_elixir_sync (source, game_year, etag, file_size, sync_from_date, last_game_date, last_gameid, committed_rows, last_chunk_index, status, updated_at)
+            VALUES (%(source)s, %(game_year)s, %(etag)s, %(file_size)s, %(sync_from_date)s, %(last_game_date)s, %(last_gameid)s, %(committed_rows)s, %(last_chunk_index)s, %(status)s, %(updated_at)s)
+            ON DUPLICATE KEY UPDATE
+                etag = VALUES(etag),
+                file_size = VALUES(file_size),
+                sync_from_date = VALUES(sync_from_date),
+                last_game_date = VALUES(last_game_date),
+                last_gameid = VALUES(last_gameid),
+                committed_rows = VALUES(committed_rows),
+                last_chunk_index = VALUES(last_chunk_index),
+                status = VALUES(status),
+                updated_at = VALUES(updated_at)
+        """
+        params = {
+            'source': source,
+            'game_year': self.year,
+            'etag': watermark.get('etag'),
+            'file_size': watermark.get('file_size'),
+            'sync_from_date': watermark.get('sync_from_date'),
+            'last_game_date': watermark.get('last_game_date'),
+            'last_gameid': watermark.get('last_gameid'),
+            'committed_rows': watermark.get('committed_rows', 0),
+            'last_chunk_index': watermark.get('last_chunk_index', -1),
+            'status': watermark.get('status'),
+            'updated_at': datetime.now()
+        }
+        self.cursor.execute(query, params)
+        self.commit()
 
     def get_last_date_from_db(self):
         query = f"SELECT MAX(game_date) FROM oracle_elixir_{self.year}"
@@ -119,117 +366,103 @@ class Database:
         self.cursor.execute(insert_query, (latest_patch_version, new_url_number))
         self.commit()
 
+    def build_upsert_query(self, table, columns):
+        column_str = ', '.join(columns)
+        placeholders = ', '.join(['%s'] * len(columns))
+        update_str = ',\n                '.join([f"{column} = VALUES({column})" for column in columns])
+        return f"""
+            INSERT INTO {table} ({column_str})
+            VALUES ({placeholders})
+            ON DUPLICATE KEY UPDATE
+                {update_str}
+        """
+
     def insert_champion_score(self, line, patch, survey_target_tier, region, data_list):
+        """
+        한 라인 전체를 executemany 한번(multi-row upsert)으로 넣고 한번 커밋
+        형식이 이상한 레코드는 로그 남기고 건너뜀
+        반환값은 실행한 statement 수 (실패해서 rollback 하면 0)
+        """
+        table = f"champion_score_{line}"
+        columns = [
+            'name_us', 'name_kr', 'champion_tier', 'ranking', 'ranking_variation', 'is_op', 'ps_score', 'honey_score',
+            'win_rate', 'pick_rate', 'ban_rate', 'sample_size', 'patch', 'survey_target_tier', 'region', 'updated_at', 'position'
+        ]
+        insert_query = self.build_upsert_query(table, columns)
+        if not data_list:
+            return 0
+        line_id = {0:"top",1:"jungle",2:"mid",3:"bottom",4:"support"}
+
+        def build_row(data):
+            info = data.get("championInfo")
+            updated_at = datetime.strptime(data.get("updatedAt"), "%Y-%m-%dT%H:%M:%S.%fZ").strftime("%Y-%m-%d %H:%M:%S")
+            # 전체 라인(all)은 챔피언마다 laneId 로 라인을 정함
+            position = line_id[data.get("laneId")] if line == "all" else line
+            return (
+                info.get("nameUs"), info.get("nameKr"), data.get("opTier"), data.get("ranking"), data.get("rankingVariation"),
+                data.get("isOp"), data.get("opScore"), data.get("honeyScore"), data.get("winRate"), data.get("pickRate"),
+                data.get("banRate"), data.get("count"), patch, survey_target_tier, region, updated_at, position
+            )
+
         try:
-            table = f"champion_score_{line}"
+            values = []
             for data in data_list:
-                insert_query = f"""
-                    INSERT INTO {table} (
-                        name_us,
-                        name_kr,
-                        champion_tier,
-                        ranking,
-                        ranking_variation,
-                        is_op,
-                        ps_score,
-                        honey_score,
-                        win_rate,
-                        pick_rate,
-                        ban_rate,
-                        sample_size,
-                        patch,
-                        survey_target_tier,
-                        region,
-                        updated_at,
-                        position)
-                    VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
-                    ON DUPLICATE KEY UPDATE 
-                        name_us = VALUES(name_us),
-                        name_kr = VALUES(name_kr),
-                        champion_tier = VALUES(champion_tier),
-                        ranking = VALUES(ranking),
-                        ranking_variation = VALUES(ranking_variation),
-                        is_op = VALUES(is_op),
-                        ps_score = VALUES(ps_score),
-                        honey_score = VALUES(honey_score),
-                        win_rate = VALUES(win_rate),
-                        pick_rate = VALUES(pick_rate),
-                        ban_rate = VALUES(ban_rate),
-                        sample_size = VALUES(sample_size),
-                        patch = VALUES(patch),
-                        survey_target_tier = VALUES(survey_target_tier),
-                        region = VALUES(region),
-                        updated_at = VALUES(updated_at),
-                        position = VALUES(position)
-                """
-                line_id = {0:"top",1:"jungle",2:"mid",3:"bottom",4:"support"}
-                if line == "all":
-                    line = line_id[data.get("laneId")]
-                updated_at = datetime.strptime(data.get("updatedAt"), "%Y-%m-%dT%H:%M:%S.%fZ").strftime("%Y-%m-%d %H:%M:%S")
-                values = [
-                    data.get("championInfo").get("nameUs"),
-                    data.get("championInfo").get("nameKr"),
-                    data.get("opTier"),
-                    data.get("ranking"),
-                    data.get("rankingVariation"),
-                    data.get("isOp"),
-                    data.get("opScore"),
-                    data.get("honeyScore"),
-                    data.get("winRate"),
-                    data.get("pickRate"),
-                    data.get("banRate"),
-                    data.get("count"),
-                    patch,
-                    survey_target_tier,
-                    region,
-                    updated_at,
-                    line
-                    ]
-                self.cursor.execute(insert_query, values)
+                try:
+                    values.append(build_row(data))
+                except (AttributeError, TypeError, KeyError, ValueError) as e:
+                    # 형식이 이상한 챔피언 하나는 건너뛰고 나머지는 저장
+                    self.logger.error(f"{table} 챔피언 스코어 데이터 형식 오류, 건너뜀 : {e} {data}")
+            if not values:
+                return 0
+            self.cursor.executemany(insert_query, values)
             self.commit()
         except Exception as e:
-            print(f"{insert_query} \n {values} \n {e}")
+            self.connection.rollback()
+            print(f"{insert_query} \n {e}")
+            return 0
+        self.build_champion_rank_snapshot(line, patch)
+        return 1
+
+    def build_champion_rank_snapshot(self, position, patch):
+        """
+        champion_score_{position} 한 패치를 한번 읽어서 픽/승/밴 순위를 pandas 로 계산
+        순위는 기존 COUNT(*) + 1 (더 높은 값 개수 + 1) 과 같은 method='min' 기준
+        """
+        select_query = f"select name_us, name_kr, ranking, pick_rate, win_rate, ban_rate, champion_tier, position from champion_score_{position} where patch = %s"
+        df = self.read_sql(select_query, params=(patch,))
+        df['total_champion_count'] = len(df)
+        for column, rank_column in [('pick_rate', 'pick_rank'), ('win_rate', 'win_rank'), ('ban_rate', 'ban_rank')]:
+            df[rank_column] = df[column].rank(method='min', ascending=False).fillna(1).astype(int)
+        records = df.astype(object).where(df.notna(), None).to_dict('records')
+        snapshot = {record['name_us']: record for record in records}
+        self.champion_rank_cache[(position, f"{float(patch):.2f}")] = snapshot
+        return snapshot
+
+    def get_champion_rank(self, name_us, position, patch):
+        snapshot = self.champion_rank_cache.get((position, f"{float(patch):.2f}"))
+        if snapshot is None:
+            snapshot = self.build_champion_rank_snapshot(position, patch)
+        return snapshot.get(name_us)
 
     def get_champion_score_by_line(self, line, patch):
         table = f"champion_score_{line}"
         select_query = f"""
             select * from {table} where patch = {patch};"""
-        return pd.read_sql(select_query, self.connection)
+        return self.read_sql(select_query)
 
     def insert_performance_score(self, line, df):
+        """
+        한 라인 전체를 executemany 한번으로 upsert, 반환값은 실행한 statement 수
+        """
         table = f"performance_score"
-        df = df.replace({np.nan: None})
-        for _,row in df.iterrows():
-            insert_query = f"""
-            insert into {table} (name_us, name_kr, pick_rate, win_rate, ban_rate, champion_tier, patch, line, performance_score, anomaly_score, is_outlier)
-            values (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
-            on duplicate key update
-                name_us = values(name_us),
-                name_kr = values(name_kr),
-                pick_rate = values(pick_rate),
-                win_rate = values(win_rate),
-                ban_rate = values(ban_rate),
-                champion_tier = values(champion_tier),
-                patch = values(patch),
-                line = values(line),
-                performance_score = values(performance_score),
-                anomaly_score = values(anomaly_score),
-                is_outlier = values(is_outlier)"""
-            values = [
-                row['name_us'],
-                row['name_kr'],
-                row['pick_rate'],
-                row['win_rate'],
-                row['ban_rate'],
-                row['champion_tier'],
-                row['patch'],
-                line,
-                row['performance_score'],
-                row['anomaly_score'],
-                row['is_outlier']
-            ]
-            self.cursor.execute(insert_query, values)
+        columns = ['name_us', 'name_kr', 'pick_rate', 'win_rate', 'ban_rate', 'champion_tier', 'patch', 'line', 'performance_score', 'anomaly_score', 'is_outlier']
+        if df.empty:
+            return 0
+        insert_query = self.build_upsert_query(table, columns)
+        rows = self.frame_to_rows(df.assign(line=line)[columns])
+        self.cursor.executemany(insert_query, rows)
         self.commit()
+        return 1
 
     def detect_by_performance_score(self, patch):
         select_query = f"""
@@ -263,21 +496,25 @@ class Database:
             AND o.patch = {patch}
             ORDER BY o.position, o.gameid;
             """
-        return pd.read_sql(select_query, self.connection)
+        return self.read_sql(select_query)
 
     def get_latest_patch_oracle_elixirs(self):
         select_query = f"select max(patch) from oracle_elixir_{self.year}"
         return self.fetch_one(select_query)['max(patch)']
 
     def get_all_champion_list(self, patch):
-        position_champions = {}
+        table = self.get_champion_position_table(patch)
         positions = ['top', 'jungle', 'mid', 'bottom', 'support']
-        for position in positions:
-            query = f"SELECT name_us FROM champion_score_{position} where patch = {patch}"
-            position_champions[position] = pd.read_sql(query, self.connection)['name_us'].tolist()
-        return position_champions
+        return {position: table.loc[table['position'] == position, 'name_us'].tolist() for position in positions}
 
     def get_all_data_without_team(self, patch, game_date=None):
+        if self.use_columnar_store():
+            filters = [('position', '!=', 'team'), ('result', '==', 1)]
+            if game_date is None:
+                yesterday = datetime.combine(date.today() - timedelta(days=1), datetime.min.time())
+                filters += [('game_date', '>=', yesterday), ('game_date', '<', yesterday + timedelta(days=1))]
+            match_info = self.columnar_store.read(filters=filters)
+            return match_info.sort_values(['gameid', 'side']).reset_index(drop=True)
         select_query = f"""
         SELECT *
         FROM oracle_elixir_{self.year} 
@@ -287,37 +524,116 @@ class Database:
         if game_date is None:
             select_query += " AND DATE(game_date) = (CURDATE() - 1)"
         select_query += "ORDER BY gameid, side"
-        match_info = pd.read_sql(select_query, self.connection)
+        match_info = self.read_sql(select_query)
         return match_info
 
+    def get_day_player_rows(self, game_date=None):
+        """
+        탐지 엔진용 하루치 선수 row (승패 모두), game_date 가 None 이면 어제 경기
+        """
+        if self.use_columnar_store():
+            filters = [('position', '!=', 'team')]
+            if game_date is None:
+                yesterday = datetime.combine(date.today() - timedelta(days=1), datetime.min.time())
+                filters += [('game_date', '>=', yesterday), ('game_date', '<', yesterday + timedelta(days=1))]
+            rows = self.columnar_store.read(filters=filters)
+            return rows.sort_values(['gameid', 'side']).reset_index(drop=True)
+        select_query = f"""
+        SELECT *
+        FROM oracle_elixir_{self.year}
+        WHERE position != 'team'
+        """
+        if game_date is None:
+            select_query += " AND DATE(game_date) = (CURDATE() - 1)"
+        select_query += " ORDER BY gameid, side"
+        return self.read_sql(select_query)
+
     def get_oracle_elixirs_all_team_info(self):
+        if self.use_columnar_store():
+            team_info = self.columnar_store.read(filters=[('position', '==', 'team')])
+            return team_info.sort_values(['gameid', 'game_date']).reset_index(drop=True)
         select_query = f"""
         select * 
         from oracle_elixir_{self.year}
         where position = "team"
         order by gameid, game_date
         """
-        return pd.read_sql(select_query, self.connection)
+        return self.read_sql(select_query)
+
+    def get_champion_position_table(self, patch):
+        """
+        5개 라인 champion_score 를 쿼리 한번으로 읽은 테이블
+        position, name_us, name_kr, pick_rate, low_pickrate_threshold(라인별 픽률 하위 10%), is_low_pick_rate
+        """
+        positions = ['top', 'jungle', 'mid', 'bottom', 'support']
+        select_query = " union all ".join(
+            f"select '{position}' as position, name_us, name_kr, pick_rate from champion_score_{position} where patch = {patch}"
+            for position in positions
+        )
+        df = self.read_sql(select_query)
+        df['low_pickrate_threshold'] = df.groupby('position')['pick_rate'].transform(lambda pick_rate: np.percentile(pick_rate, 10))
+        df['is_low_pick_rate'] = df['pick_rate'] <= df['low_pickrate_threshold']
+        return df
+
+    def get_recent_team_rows(self, columns, limit):
+        """
+        최근 경기 team row limit 개 (이상치 모델 학습 구간)
+        """
+        column_str = ', '.join(columns)
+        select_query = f"""
+        select {column_str}
+        from oracle_elixir_{self.year}
+        where position = 'team'
+        order by game_date desc
+        limit {int(limit)}
+        """
+        return self.read_sql(select_query)
+
+    def iter_unscored_team_rows(self, columns, chunk_size):
+        """
+        match_anomaly_score 에 아직 없는 team row 를 (gameid, teamname) 순서로 chunk_size 개씩 반환
+        """
+        column_str = ', '.join([f"o.{column}" for column in columns])
+        last_key = ("", "")
+        while True:
+            select_query = f"""
+            select o.gameid, o.teamname, o.patch, o.game_date, {column_str}
+            from oracle_elixir_{self.year} o
+            left join match_anomaly_score m on m.gameid = o.gameid and m.teamname = o.teamname
+            where o.position = 'team'
+            and m.gameid is null
+            and (o.gameid, o.teamname) > (%s, %s)
+            order by o.gameid, o.teamname
+            limit {int(chunk_size)}
+            """
+            chunk = self.read_sql(select_query, params=last_key)
+            if chunk.empty:
+                return
+            yield chunk
+            last_key = (chunk['gameid'].iloc[-1], chunk['teamname'].iloc[-1])
+
+    def insert_match_anomaly_scores(self, df):
+        """
+        경기(팀) 별 이상치 점수 upsert, 반환값은 저장한 row 수
+        """
+        columns = ['gameid', 'teamname', 'patch', 'game_date', 'anomaly_score', 'is_outlier', 'model_version']
+        if df.empty:
+            return 0
+        insert_query = self.build_upsert_query("match_anomaly_score", columns)
+        self.cursor.executemany(insert_query, self.frame_to_rows(df[columns]))
+        self.commit()
+        return len(df)
 
     def get_all_position_pick_rate(self, patch):
+        table = self.get_champion_position_table(patch)
         position_champions = {}
         positions = ['top', 'jungle', 'mid', 'bottom', 'support']
         for position in positions:
-            select_query = f"""
-            select name_us, name_kr, pick_rate
-            from champion_score_{position}
-            where patch = {patch}
-            """
-            df = pd.read_sql(select_query, self.connection)
-            thresh_hold = np.percentile(df['pick_rate'], 10)
-            champions_dict = {row['name_us']: {
-                'pick_rate': row['pick_rate'],
-                'name_kr': row['name_kr']
-            } for _, row in df.iterrows()}
+            df = table[table['position'] == position]
             position_champions[position] = {
-                'name_us_list': champions_dict,
-                'low_pickrate_threshold': thresh_hold,
-                'low_pickrate_champions': df[df['pick_rate'] <= thresh_hold]['name_us'].tolist()
+                'name_us_list': df.set_index('name_us')[['pick_rate', 'name_kr']].to_dict('index'),
+                'low_pickrate_threshold': np.percentile(df['pick_rate'], 10),
+                'low_pickrate_champions': df.loc[df['is_low_pick_rate'], 'name_us'].tolist()
             }
         return position_champions
 
@@ -328,7 +644,7 @@ class Database:
         where patch = {patch}
         and cb.name_us not in (select name_us from champion_score_mid)
         """
-        return pd.read_sql(select_query, self.connection)['name_us'].tolist()
+        return self.read_sql(select_query)['name_us'].tolist()
 
     def get_penta_kill_game_id(self, patch, game_date=None):
         select_query = f"""select playername, gameid from oracle_elixir_{self.year} where pentakills >= 1 and patch = %s and playername is not null"""
@@ -338,126 +654,141 @@ class Database:
         return penta_kill_list
 
     def get_match_series_info(self, game_id, player_name):
-        select_query = f"""
-        select
-            name_us,
-            goldat10,
-            xpat10,
-            csat10,
-            opp_goldat10,
-            opp_xpat10,
-            opp_csat10,
-            golddiffat10,
-            xpdiffat10,
-            csdiffat10,
-            killsat10,
-            assistsat10,
-            deathsat10,
-            opp_killsat10,
-            opp_assistsat10,
-            opp_deathsat10,
-            goldat15,
-            xpat15,
-            csat15,
-            opp_goldat15,
-            opp_xpat15,
-            opp_csat15,
-            golddiffat15,
-            xpdiffat15,
-            csdiffat15,
-            killsat15,
-            assistsat15,
-            deathsat15,
-            opp_killsat15,
-            opp_assistsat15,
-            opp_deathsat15,
-            goldat20,
-            xpat20,
-            csat20,
-            opp_goldat20,
-            opp_xpat20,
-            opp_csat20,
-            golddiffat20,
-            xpdiffat20,
-            csdiffat20,
-            killsat20,
-            assistsat20,
-            deathsat20,
-            opp_killsat20,
-            opp_assistsat20,
-            opp_deathsat20,
-            goldat25,
-            xpat25,
-            csat25,
-            opp_goldat25,
-            opp_xpat25,
-            opp_csat25,
-            golddiffat25,
-            xpdiffat25,
-            csdiffat25,
-            killsat25,
-            assistsat25,
-            deathsat25,
-            opp_killsat25,
-            opp_assistsat25,
-            opp_deathsat25
-        from oracle_elixir_{self.year} 
-        where gameid = %s and playername = %s
-        """
-        return pd.read_sql(select_query, self.connection, params=(game_id, player_name))
+        columns = [
+            'name_us',
+            'goldat10', 'xpat10', 'csat10', 'opp_goldat10', 'opp_xpat10', 'opp_csat10', 'golddiffat10', 'xpdiffat10', 'csdiffat10', 'killsat10', 'assistsat10', 'deathsat10', 'opp_killsat10', 'opp_assistsat10', 'opp_deathsat10',
+            'goldat15', 'xpat15', 'csat15', 'opp_goldat15', 'opp_xpat15', 'opp_csat15', 'golddiffat15', 'xpdiffat15', 'csdiffat15', 'killsat15', 'assistsat15', 'deathsat15', 'opp_killsat15', 'opp_assistsat15', 'opp_deathsat15',
+            'goldat20', 'xpat20', 'csat20', 'opp_goldat20', 'opp_xpat20', 'opp_csat20', 'golddiffat20', 'xpdiffat20', 'csdiffat20', 'killsat20', 'assistsat20', 'deathsat20', 'opp_killsat20', 'opp_assistsat20', 'opp_deathsat20',
+            'goldat25', 'xpat25', 'csat25', 'opp_goldat25', 'opp_xpat25', 'opp_csat25', 'golddiffat25', 'xpdiffat25', 'csdiffat25', 'killsat25', 'assistsat25', 'deathsat25', 'opp_killsat25', 'opp_assistsat25', 'opp_deathsat25'
+        ]
+        # 경기 캐시에서 해당 선수 row 만 꺼냄
+        game_df = self.get_game_data(game_id)
+        return game_df.loc[game_df['playername'] == player_name, columns].reset_index(drop=True)
 
     def get_oppnent_player_name(self, game_id, player_name):
-        select_query = f"""
-        select name_us, playername 
-        from oracle_elixir_{self.year} oe
-        where gameid = (%s) 
-        and position = (select position as p from oracle_elixir_{self.year} where gameid = (%s) and playername = (%s))
-        and playername != (%s) 
-        """
-        return self.fetch_one(select_query, args=(game_id, game_id, player_name, player_name))
+        game_df = self.get_game_data(game_id)
+        player_df = game_df[game_df['playername'] == player_name]
+        if player_df.empty:
+            return None
+        opp_df = game_df[(game_df['position'] == player_df['position'].iloc[0]) & (game_df['playername'] != player_name)]
+        if opp_df.empty:
+            return None
+        return opp_df[['name_us', 'playername']].iloc[0].to_dict()
 
     def get_mvp_base_data(self, game_id):
-        query = f"""
-                    SELECT 
-                        gameid, position, playername, name_us as champion,
-                        kills, deaths, assists, teamkills, firstbloodkill, firstbloodassist,
-                        cspm, damageshare, earnedgoldshare, goldspent, earnedgold,
-                        vspm, wcpm, wpm, gamelength,
-                        firsttower, firstdragon, firstherald, firstbaron,
-                        towers, opp_towers, dragons, barons, heralds, opp_dragons,
-                        damagetochampions, dpm, damagetakenperminute, damagemitigatedperminute,
-                        monsterkillsenemyjungle, visionscore, gspd,
-                        golddiffat15, xpdiffat15, csdiffat15,
-                        result
-                    FROM oracle_elixir_{self.year} 
-                    WHERE gameid = %s 
-                    """
-        return pd.read_sql(query, self.connection, params=(game_id,))
+        columns = [
+            'gameid', 'position', 'playername', 'name_us',
+            'kills', 'deaths', 'assists', 'teamkills', 'firstbloodkill', 'firstbloodassist',
+            'cspm', 'damageshare', 'earnedgoldshare', 'goldspent', 'earnedgold',
+            'vspm', 'wcpm', 'wpm', 'gamelength',
+            'firsttower', 'firstdragon', 'firstherald', 'firstbaron',
+            'towers', 'opp_towers', 'dragons', 'barons', 'heralds', 'opp_dragons',
+            'damagetochampions', 'dpm', 'damagetakenperminute', 'damagemitigatedperminute',
+            'monsterkillsenemyjungle', 'visionscore', 'gspd',
+            'golddiffat15', 'xpdiffat15', 'csdiffat15',
+            'result'
+        ]
+        # 경기 캐시에서 필요한 컬럼만 꺼냄
+        game_df = self.get_game_data(game_id)
+        return game_df[columns].rename(columns={'name_us': 'champion'})
 
     def get_champion_name(self):
         query = "select * from champion_info"
-        return pd.read_sql(query, self.connection)
+        return self.read_sql(query)
 
     def get_game_data(self, game_id):
+        with self.game_cache_lock:
+            if game_id in self.game_cache:
+                self.game_cache.move_to_end(game_id)
+                self.game_cache_hits += 1
+                return self.game_cache[game_id].copy()
+            self.game_cache_misses += 1
+        game_df = self.load_game_data(game_id)
+        # 아직 적재 안 된 경기는 캐시하지 않음 (insert 후 바로 조회될 수 있도록)
+        if game_df.empty:
+            return game_df
+        with self.game_cache_lock:
+            self.game_cache[game_id] = game_df
+            self.game_cache.move_to_end(game_id)
+            while len(self.game_cache) > self.game_cache_size:
+                self.game_cache.popitem(last=False)
+        # 호출하는 쪽에서 컬럼을 추가/수정해도 캐시가 바뀌지 않도록 복사본 반환
+        return game_df.copy()
+
+    # 여러 경기를 캐시에 없는 것만 한번에 조회
+    def get_games_data(self, game_ids):
+        game_frames = {}
+        missing_ids = []
+        with self.game_cache_lock:
+            for game_id in game_ids:
+                if game_id in self.game_cache:
+                    self.game_cache.move_to_end(game_id)
+                    self.game_cache_hits += 1
+                    game_frames[game_id] = self.game_cache[game_id]
+                else:
+                    self.game_cache_misses += 1
+                    missing_ids.append(game_id)
+        if missing_ids:
+            loaded = None
+            if self.use_columnar_store():
+                loaded = self.columnar_store.read(filters=[('gameid', 'in', missing_ids)])
+            if loaded is None or loaded['gameid'].nunique() < len(missing_ids):
+                placeholders = ', '.join(['%s'] * len(missing_ids))
+                select_query = f"select * from oracle_elixir_{self.year} where gameid in ({placeholders})"
+                loaded = self.read_sql(select_query, params=missing_ids)
+            with self.game_cache_lock:
+                for game_id, game_df in loaded.groupby('gameid', sort=False):
+                    game_df = game_df.reset_index(drop=True)
+                    game_frames[game_id] = game_df
+                    self.game_cache[game_id] = game_df
+                while len(self.game_cache) > self.game_cache_size:
+                    self.game_cache.popitem(last=False)
+        frames = [game_frames[game_id] for game_id in game_ids if game_id in game_frames]
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, ignore_index=True)
+
+    def load_game_data(self, game_id):
+        if self.use_columnar_store():
+            game_df = self.columnar_store.read(filters=[('gameid', '==', game_id)])
+            # 스냅샷 갱신 전 경기면 MySQL 에서 조회
+            if not game_df.empty:
+                return game_df.sort_values('participantid').reset_index(drop=True)
         select_query = f"select * from oracle_elixir_{self.year} where gameid = %s"
-        return pd.read_sql(select_query, self.connection, params=game_id)
+        return self.read_sql(select_query, params=game_id)
+
+    # game_ids 가 None 이면 전체 비움
+    def invalidate_game_cache(self, game_ids=None):
+        with self.game_cache_lock:
+            if game_ids is None:
+                self.game_cache.clear()
+                self.mvp_cache.clear()
+                return
+            for game_id in game_ids:
+                self.game_cache.pop(game_id, None)
+                self.mvp_cache.pop(game_id, None)
+
+    def get_game_cache_stats(self):
+        with self.game_cache_lock:
+            total = self.game_cache_hits + self.game_cache_misses
+            return {
+                "hits": self.game_cache_hits,
+                "misses": self.game_cache_misses,
+                "size": len(self.game_cache),
+                "hit_rate": round(self.game_cache_hits / total, 3) if total else 0.0
+            }
 
     def get_name_kr(self, name_us):
-        select_query = "select name_kr from champion_info where ps_name = (%s)"
-        return self.fetch_one(select_query, args=name_us)['name_kr']
+        return self.champion_registry.get_name_kr(name_us)
 
     def get_name_kr_list(self):
-        select_query = "select name_kr from champion_info"
-        res = [record.get('name_kr') for record in self.fetch_all(select_query)]
-        return res
+        return self.champion_registry.get_name_kr_list()
 
     def get_champion_rate_table(self, name_us, patch, position):
-        # unmatch_line일때 체크
-        check_query = self.fetch_one(f"select * from champion_score_{position} where name_us = %s and patch = %s",args=(name_us, patch))
-        if check_query is None:
-            position = "all"
-        select_query = f"select name_us, pick_rate, win_rate, ban_rate, champion_tier,position from champion_score_{position} where name_us = (%s) and patch = (%s) "
-        result = self.fetch_one(select_query, args=(name_us, patch))
+        # unmatch_line일때 해당 라인에 없으면 전체 라인 기준
+        result = self.get_champion_rank(name_us, position, patch)
+        if result is None:
+            result = self.get_champion_rank(name_us, "all", patch)
         # 모든 라인에서 고인인 경우
         if result is None:
             return {
@@ -479,18 +810,11 @@ class Database:
         return champion_stats
 
     def get_champion_pick_rate_info(self, name_us, patch, position):
-        #unmatch_line일때 체크
-        check_query = self.fetch_one(f"select * from champion_score_{position} where name_us = %s and patch = %s", args=(name_us, patch))
-        if check_query is None:
+        #unmatch_line일때 해당 라인에 없으면 전체 라인 기준
+        result = self.get_champion_rank(name_us, position, patch)
+        if result is None:
             position = "all"
-        select_query = f"""
-        select name_kr, ranking, pick_rate, win_rate, ban_rate, champion_tier,
-         (SELECT COUNT(*) FROM champion_score_{position} WHERE patch = %s) as total_champion_count, 
-         (select COUNT(*) + 1 FROM champion_score_{position} c2 WHERE c2.pick_rate > c1.pick_rate AND patch = %s) as pick_rank, 
-         (select COUNT(*) + 1 FROM champion_score_{position} c2 WHERE c2.win_rate > c1.win_rate AND patch = %s) as win_rank, 
-         (select COUNT(*) + 1 FROM champion_score_{position} c2 WHERE c2.ban_rate > c1.ban_rate AND patch = %s) as ban_rank 
-         from champion_score_{position} c1 where name_us = %s and patch = %s """
-        result = self.fetch_one(select_query, args=(patch, patch, patch, patch, name_us, patch))
+            result = self.get_champion_rank(name_us, position, patch)
         # 전체, 특정라인에서 안나오면 고인임.
         if result is None:
             raise CommonError(ErrorCode.DEAD_CHAMPION, "Dead Champion")
@@ -509,43 +833,108 @@ class Database:
         }
         return champion_stats
 
-    def get_counter_champion(self, name_us, position, patch):
-        query = f"""
-               WITH matchups AS (
-                    SELECT 
-                        m1.gameid,
-                        m1.name_us as target_champ,
-                        m1.position as target_pos,
-                        m2.name_us as opponent_champ,
-                        m2.position as opponent_pos,
+    def update_champion_matchup(self, batch_size=500):
+        """
+        champion_matchup 집계 테이블 증분 갱신
+        champion_matchup_game 에 없는 경기만 self join 해서 (패치, 라인, 챔피언, 상대 챔피언) 합계를 더함
+        """
+        select_query = f"""
+        select distinct oe.gameid
+        from oracle_elixir_{self.year} oe
+        where oe.position != 'team'
+        and not exists (select 1 from champion_matchup_game g where g.game_year = %s and g.gameid = oe.gameid)
+        """
+        new_game_ids = [row['gameid'] for row in self.fetch_all(select_query, args=(self.year,))]
+        if not new_game_ids:
+            return 0
+        start_time = time.perf_counter()
+        for start in range(0, len(new_game_ids), batch_size):
+            batch = new_game_ids[start:start + batch_size]
+            placeholders = ', '.join(['%s'] * len(batch))
+            # GROUP BY 결과를 ON DUPLICATE KEY UPDATE 에서 참조하려면 derived table 로 감싸야 함
+            insert_query = f"""
+            INSERT INTO champion_matchup (
+                game_year, patch, position, name_us, opponent_name_us, games, wins,
+                gold_diff_15_sum, gold_diff_15_count, xp_diff_15_sum, xp_diff_15_count,
+                kda_sum, kda_count, opponent_kda_sum, opponent_kda_count, updated_at
+            )
+            SELECT * FROM (
+                SELECT
+                    %s as game_year,
+                    m.patch, m.position, m.name_us, m.opponent_name_us,
+                    COUNT(*) as games,
+                    SUM(CASE WHEN m.target_won = 1 THEN 1 ELSE 0 END) as wins,
+                    COALESCE(SUM(m.golddiffat15), 0) as gold_diff_15_sum,
+                    COUNT(m.golddiffat15) as gold_diff_15_count,
+                    COALESCE(SUM(m.xpdiffat15), 0) as xp_diff_15_sum,
+                    COUNT(m.xpdiffat15) as xp_diff_15_count,
+                    COALESCE(SUM(m.target_kda), 0) as kda_sum,
+                    COUNT(m.target_kda) as kda_count,
+                    COALESCE(SUM(m.opponent_kda), 0) as opponent_kda_sum,
+                    COUNT(m.opponent_kda) as opponent_kda_count,
+                    NOW() as updated_at
+                FROM (
+                    SELECT
+                        m1.patch,
+                        m1.position,
+                        m1.name_us,
+                        m2.name_us as opponent_name_us,
                         m1.result as target_won,
                         m1.golddiffat15,
                         m1.xpdiffat15,
                         (m1.kills + m1.assists) / CASE WHEN m1.deaths = 0 THEN 1 ELSE m1.deaths END as target_kda,
                         (m2.kills + m2.assists) / CASE WHEN m2.deaths = 0 THEN 1 ELSE m2.deaths END as opponent_kda
                     FROM oracle_elixir_{self.year} m1
-                    JOIN oracle_elixir_{self.year} m2 
+                    JOIN oracle_elixir_{self.year} m2
                         ON m1.gameid = m2.gameid
                         AND m1.side != m2.side
                         AND m1.position = m2.position
-                    WHERE m1.name_us = %s
-                        AND m1.position = %s
-                        AND m1.patch = %s
-                )
-                SELECT 
-                    m.opponent_champ,
-                    ci.name_kr,
-                    COUNT(*) as games_played,
-                    ROUND(AVG(CASE WHEN m.target_won = 1 THEN 1 ELSE 0 END) * 100, 2) as win_rate,
-                    ROUND(AVG(m.golddiffat15), 2) as avg_gold_diff_15,
-                    ROUND(AVG(m.xpdiffat15), 2) as avg_xp_diff_15,
-                     ROUND(AVG(m.target_kda), 2) + ROUND(AVG(m.opponent_kda), 2) as kda_diff
-                FROM matchups m
-                LEFT JOIN champion_info ci ON m.opponent_champ = ci.ps_name  
-                GROUP BY m.opponent_champ, ci.name_kr 
-                ORDER BY win_rate DESC, games_played DESC
+                    WHERE m1.gameid in ({placeholders})
+                        AND m1.position != 'team'
+                        AND m1.patch is not null
+                        AND m1.name_us is not null
+                        AND m2.name_us is not null
+                ) m
+                GROUP BY m.patch, m.position, m.name_us, m.opponent_name_us
+            ) agg
+            ON DUPLICATE KEY UPDATE
+                games = champion_matchup.games + agg.games,
+                wins = champion_matchup.wins + agg.wins,
+                gold_diff_15_sum = champion_matchup.gold_diff_15_sum + agg.gold_diff_15_sum,
+                gold_diff_15_count = champion_matchup.gold_diff_15_count + agg.gold_diff_15_count,
+                xp_diff_15_sum = champion_matchup.xp_diff_15_sum + agg.xp_diff_15_sum,
+                xp_diff_15_count = champion_matchup.xp_diff_15_count + agg.xp_diff_15_count,
+                kda_sum = champion_matchup.kda_sum + agg.kda_sum,
+                kda_count = champion_matchup.kda_count + agg.kda_count,
+                opponent_kda_sum = champion_matchup.opponent_kda_sum + agg.opponent_kda_sum,
+                opponent_kda_count = champion_matchup.opponent_kda_count + agg.opponent_kda_count,
+                updated_at = agg.updated_at
             """
-        results = pd.read_sql(query, self.connection, params=[name_us, position, patch])
+            self.cursor.execute(insert_query, [self.year] + batch)
+            # 집계와 처리 완료 경기 기록을 같은 트랜잭션으로 커밋
+            self.cursor.executemany(
+                "INSERT IGNORE INTO champion_matchup_game (game_year, gameid, created_at) VALUES (%s, %s, NOW())",
+                [(self.year, game_id) for game_id in batch]
+            )
+            self.commit()
+        self.logger.info(f"champion_matchup 갱신 : 신규 {len(new_game_ids)} 경기, {time.perf_counter() - start_time:.2f}s")
+        return len(new_game_ids)
+
+    def get_counter_champion(self, name_us, position, patch):
+        query = """
+        SELECT
+            opponent_name_us as opponent_champ,
+            games as games_played,
+            ROUND(wins / games * 100, 2) as win_rate,
+            ROUND(gold_diff_15_sum / NULLIF(gold_diff_15_count, 0), 2) as avg_gold_diff_15,
+            ROUND(xp_diff_15_sum / NULLIF(xp_diff_15_count, 0), 2) as avg_xp_diff_15,
+            ROUND(kda_sum / NULLIF(kda_count, 0), 2) + ROUND(opponent_kda_sum / NULLIF(opponent_kda_count, 0), 2) as kda_diff
+        FROM champion_matchup
+        WHERE game_year = %s AND patch = %s AND position = %s AND name_us = %s
+        ORDER BY win_rate DESC, games_played DESC
+        """
+        results = self.read_sql(query, params=[self.year, patch, position, name_us])
+        results.insert(1, 'name_kr', results['opponent_champ'].map(self.champion_registry.get_name_kr))
         results['counter_score'] = (
                 results['win_rate'] * 0.4 +
                 results['avg_gold_diff_15'].clip(-2000, 2000) / 20 * 0.3 +
@@ -554,7 +943,6 @@ class Database:
         results = results.dropna()
         return results
 
-
     def get_player_comparison_series(self, game_id, player_name, opponent_player_name):
         query = f"""
                SELECT 
@@ -576,9 +964,8 @@ class Database:
                AND p.playername IN (%(player1)s, %(player2)s)
            """
 
-        df = pd.read_sql(
+        df = self.read_sql(
             query,
-            self.connection,
             params={
                 'game_id': game_id,
                 'player1': player_name,
@@ -859,6 +1246,84 @@ class Database:
         return mvp_player
 
     def calculate_mvp_score(self, df):
+        """
+        한 경기 MVP 점수, gameid 별로 캐시
+        캐시는 넘겨받은 df 가 채점했던 경기 데이터와 같을 때만 사용 (값을 바꾼 df 면 다시 계산)
+        새로 계산한 점수는 df 가 get_game_data 로 받은 그대로일 때만 캐시에 넣음
+        """
+        game_ids = df['gameid'].unique()
+        if len(game_ids) == 1:
+            game_id = game_ids[0]
+            scores = self.get_cached_mvp_score(game_id, df)
+            if scores is None:
+                mvp_df = self.calculate_mvp_scores(df)
+                if self.is_cached_game_data(game_id, df):
+                    scores = self.cache_mvp_scores(df, mvp_df)[game_id]
+                else:
+                    scores = mvp_df.drop(columns='gameid').reset_index(drop=True).sort_values('mvp_score', ascending=False)
+            return scores.copy()
+        return self.calculate_mvp_scores(df).drop(columns='gameid')
+
+    # game_df 가 있으면 채점했던 경기 데이터와 같을 때만 반환 (없거나 다르면 None)
+    def get_cached_mvp_score(self, game_id, game_df=None):
+        with self.game_cache_lock:
+            entry = self.mvp_cache.get(game_id)
+            if entry is None:
+                return None
+            self.mvp_cache.move_to_end(game_id)
+        source_df, scores = entry
+        if game_df is not None and not source_df.equals(game_df.reset_index(drop=True)):
+            return None
+        return scores
+
+    def is_cached_game_data(self, game_id, game_df):
+        with self.game_cache_lock:
+            cached_df = self.game_cache.get(game_id)
+        return cached_df is not None and cached_df.equals(game_df.reset_index(drop=True))
+
+    def cache_mvp_scores(self, games_df, mvp_df):
+        """
+        calculate_mvp_scores 결과를 경기별로 나눠서 채점한 경기 데이터와 같이 캐시
+        반환 : gameid -> 점수 DataFrame
+        """
+        game_scores = {}
+        for game_id, game_mvp in mvp_df.groupby('gameid', sort=False):
+            game_mvp = game_mvp.drop(columns='gameid').reset_index(drop=True)
+            game_scores[game_id] = game_mvp.sort_values('mvp_score', ascending=False)
+        with self.game_cache_lock:
+            for game_id, game_df in games_df.groupby('gameid', sort=False):
+                if game_id in game_scores:
+                    self.mvp_cache[game_id] = (game_df.reset_index(drop=True), game_scores[game_id])
+                    self.mvp_cache.move_to_end(game_id)
+            while len(self.mvp_cache) > self.game_cache_size:
+                self.mvp_cache.popitem(last=False)
+        return game_scores
+
+    def score_games(self, game_ids):
+        """
+        여러 경기를 한번에 조회, 채점해서 캐시에 넣음 (하루치 경기를 한번에 처리할 때)
+        """
+        game_ids = list(dict.fromkeys(game_ids))
+        game_scores = {}
+        for game_id in game_ids:
+            scores = self.get_cached_mvp_score(game_id)
+            if scores is not None:
+                game_scores[game_id] = scores
+        missing_ids = [game_id for game_id in game_ids if game_id not in game_scores]
+        if missing_ids:
+            games_df = self.get_games_data(missing_ids)
+            if not games_df.empty:
+                game_scores.update(self.cache_mvp_scores(games_df, self.calculate_mvp_scores(games_df)))
+        scored = [game_scores[game_id].assign(gameid=game_id) for game_id in game_ids if game_id in game_scores]
+        if not scored:
+            return pd.DataFrame(columns=['playername', 'champion', 'teamname', 'name_kr', 'position', 'mvp_score', 'gameid'])
+        return pd.concat(scored, ignore_index=True)
+
+    def calculate_mvp_scores(self, df):
+        """
+        여러 경기 MVP 점수를 gameid 기준 배열 연산으로 한번에 계산 (캐시는 cache_mvp_scores 에서)
+        정규화는 경기별 min-max, 오브젝트 점수는 같은 경기 같은 result 의 team row 기준
+        """
         position_weights = {
             'top': {
                 'combat': 1.7,
@@ -897,98 +1362,82 @@ class Database:
             }
         }
 
-        team_data = df[df['position'] == 'team'].copy()
-        player_data = df[df['position'] != 'team'].copy()
-
-        def normalize_stats(group):
-            stats_to_normalize = [
-                'kills', 'deaths', 'assists', 'cspm', 'damageshare', 'earnedgoldshare',
-                'vspm', 'wcpm', 'wpm', 'damagetakenperminute', 'damagemitigatedperminute',
-                'monsterkillsenemyjungle', 'visionscore', 'gspd',
-                'golddiffat15', 'xpdiffat15', 'csdiffat15'
-            ]
-
-            for stat in stats_to_normalize:
-                if stat in group.columns:
-                    max_val = group[stat].max()
-                    min_val = group[stat].min()
-                    if max_val != min_val:
-                        group[f'normalized_{stat}'] = (group[stat] - min_val) / (max_val - min_val)
-                    else:
-                        group[f'normalized_{stat}'] = 0.5
-            return group
-        player_data = normalize_stats(player_data)
-        mvp_scores = []
-        for _, player in player_data.iterrows():
-            position = player['position'].lower()
-            weights = position_weights[position]
-
-            combat_score = (
-                                   (player['normalized_kills'] * 0.15) +
-                                   ((1 - player['normalized_deaths']) * 0.15) +
-                                   (player['normalized_assists'] * 0.1) +
-                                   (player['normalized_damageshare'] * 0.4) +
-                                   (player['normalized_damagemitigatedperminute'] * 0.2)
-                           ) * weights['combat']
-
-            economy_score = (
-                                    (player['normalized_cspm'] * 0.4) +
-                                    (player['normalized_earnedgoldshare'] * 0.6)
-                            ) * weights['economy']
-
-            vision_score = (
-                                   (player['normalized_visionscore'] * 0.5) +
-                                   (player['normalized_wcpm'] * 0.3) +
-                                   (player['normalized_wpm'] * 0.2)
-                           ) * weights['vision']
-
-            laning_score = (
-                                   (player['normalized_golddiffat15'] * 0.4) +
-                                   (player['normalized_xpdiffat15'] * 0.3) +
-                                   (player['normalized_csdiffat15'] * 0.3)
-                           ) * weights['laning']
-
-            team_row = team_data[team_data['result'] == player['result']].iloc[0]
-
-            max_dragons = 4
-            max_barons = 3
-            max_towers = 11
-            tower_score = min(team_row['towers'] / max_towers, 1.0) * 0.20
-            dragon_score = min(team_row['dragons'] / max_dragons, 1.0) * 0.40
-            baron_score = min(team_row['barons'] / max_barons, 1.0) * 0.40
-            objective_participation = tower_score + dragon_score + baron_score
-            objective_score = objective_participation * weights['objective']
-            score_breakdown = {
-                'combat': combat_score,
-                'economy': economy_score,
-                'vision': vision_score,
-                'objective': objective_score,
-                'laning': laning_score
-            }
-
-            final_score = sum(score_breakdown.values())
-
-            if player['result']:
-                final_score *= 1.1
-
-            mvp_scores.append({
-                'playername': player['playername'],
-                'champion': player['name_us'],
-                'teamname': player['teamname'],
-                'name_kr': self.get_name_kr(player['name_us']),
-                'position': position,
-                'mvp_score': final_score
-            })
-
-        mvp_df = pd.DataFrame(mvp_scores)
+        stats_to_normalize = [
+            'kills', 'deaths', 'assists', 'cspm', 'damageshare', 'earnedgoldshare',
+            'vspm', 'wcpm', 'wpm', 'damagetakenperminute', 'damagemitigatedperminute',
+            'monsterkillsenemyjungle', 'visionscore', 'gspd',
+            'golddiffat15', 'xpdiffat15', 'csdiffat15'
+        ]
+        team_data = df[df['position'] == 'team']
+        player_data = df[df['position'] != 'team'].reset_index(drop=True)
+        player_data['position'] = player_data['position'].str.lower()
+
+        grouped = player_data.groupby('gameid', sort=False)
+        normalized = {}
+        for stat in stats_to_normalize:
+            if stat in player_data.columns:
+                values = player_data[stat].astype(float)
+                min_val = grouped[stat].transform('min').astype(float)
+                max_val = grouped[stat].transform('max').astype(float)
+                # 경기 안에서 값이 전부 같으면 0.5
+                normalized[stat] = ((values - min_val) / (max_val - min_val)).where(max_val != min_val, 0.5)
+
+        weights = pd.DataFrame(position_weights).T.reindex(player_data['position']).reset_index(drop=True)
+
+        combat_score = (
+                               (normalized['kills'] * 0.15) +
+                               ((1 - normalized['deaths']) * 0.15) +
+                               (normalized['assists'] * 0.1) +
+                               (normalized['damageshare'] * 0.4) +
+                               (normalized['damagemitigatedperminute'] * 0.2)
+                       ) * weights['combat']
+
+        economy_score = (
+                                (normalized['cspm'] * 0.4) +
+                                (normalized['earnedgoldshare'] * 0.6)
+                        ) * weights['economy']
+
+        vision_score = (
+                               (normalized['visionscore'] * 0.5) +
+                               (normalized['wcpm'] * 0.3) +
+                               (normalized['wpm'] * 0.2)
+                       ) * weights['vision']
+
+        laning_score = (
+                               (normalized['golddiffat15'] * 0.4) +
+                               (normalized['xpdiffat15'] * 0.3) +
+                               (normalized['csdiffat15'] * 0.3)
+                       ) * weights['laning']
+
+        team_rows = team_data.drop_duplicates(['gameid', 'result'])[['gameid', 'result', 'towers', 'dragons', 'barons']]
+        team_rows = player_data[['gameid', 'result']].merge(team_rows, on=['gameid', 'result'], how='left')
+        max_dragons = 4
+        max_barons = 3
+        max_towers = 11
+        tower_score = (team_rows['towers'] / max_towers).clip(upper=1.0) * 0.20
+        dragon_score = (team_rows['dragons'] / max_dragons).clip(upper=1.0) * 0.40
+        baron_score = (team_rows['barons'] / max_barons).clip(upper=1.0) * 0.40
+        objective_score = (tower_score + dragon_score + baron_score) * weights['objective']
+
+        final_score = combat_score + economy_score + vision_score + objective_score + laning_score
+        final_score = final_score.where(~player_data['result'].astype(bool), final_score * 1.1)
+
+        mvp_df = pd.DataFrame({
+            'gameid': player_data['gameid'],
+            'playername': player_data['playername'],
+            'champion': player_data['name_us'],
+            'teamname': player_data['teamname'],
+            'name_kr': player_data['name_us'].map(self.get_name_kr),
+            'position': player_data['position'],
+            'mvp_score': final_score
+        })
         ideal_max_score = 5.5
         mvp_df['mvp_score'] = mvp_df['mvp_score'] / ideal_max_score
         scaling_factor = 8.0
         power_factor = 1.2
         mvp_df['mvp_score'] = (mvp_df['mvp_score'] * power_factor) * scaling_factor
         mvp_df['mvp_score'] = mvp_df['mvp_score'].clip(0, 10)
-        mvp_df = mvp_df.sort_values('mvp_score', ascending=False)
-        return mvp_df
+        return mvp_df.sort_values(['gameid', 'mvp_score'], ascending=[True, False])
 
     def get_sets_score(self, game_id, blue_team_name, red_team_name):
         info_query = f"""select game_date, game, league from oracle_elixir_{self.year} where gameid = %s"""
@@ -996,8 +1445,7 @@ class Database:
         game_date = base_info.get('game_date')
         game = base_info.get('game')
         league = base_info.get('league')
-        info_query = f"""select * from oracle_elixir_{self.year} where league = %s and (teamname = %s or teamname = %s) and position = 'team' and game_date between Date(%s) and Date_Add(Date(%s), interval 1 Day) order by game_date"""
-        info = pd.read_sql(info_query, self.connection, params=(league, blue_team_name, red_team_name, game_date, game_date))
+        info = self.get_series_team_rows(league, blue_team_name, red_team_name, game_date)
         blue_score = len(info[(info['teamname'] == blue_team_name) & (info['result'] == 1)])
         red_score = len(info[(info['teamname'] == red_team_name) & (info['result'] == 1)])
         return blue_score, red_score
@@ -1008,8 +1456,7 @@ class Database:
         game_date = base_info.get('game_date')
         game = base_info.get('game')
         league = base_info.get('league')
-        info_query = f"""select gameid, game from oracle_elixir_{self.year} where league = %s and (teamname = %s or teamname = %s) and position = 'team' and game_date between Date(%s) and Date_Add(Date(%s), interval 1 Day)"""
-        info = pd.read_sql(info_query, self.connection, params=(league, blue_team_name, red_team_name, game_date, game_date))
+        info = self.get_series_team_rows(league, blue_team_name, red_team_name, game_date)[['gameid', 'game']]
         result = info.sort_values('game').groupby('gameid', sort=False).first().reset_index()
         return result
  
@@ -1018,6 +1465,22 @@ class Database:
         info = self.fetch_one(query, game_id)
         return info
 
+    # 같은 날(다음날 0시까지) 두 팀의 세트별 team row
+    def get_series_team_rows(self, league, team1, team2, game_date):
+        if self.use_columnar_store():
+            start_date = pd.Timestamp(game_date).normalize()
+            filters = [
+                ('league', '==', league),
+                ('teamname', 'in', [team1, team2]),
+                ('position', '==', 'team'),
+                ('game_date', '>=', start_date.to_pydatetime()),
+                ('game_date', '<=', (start_date + pd.Timedelta(days=1)).to_pydatetime())
+            ]
+            series_data = self.columnar_store.read(filters=filters)
+            return series_data.sort_values('game_date', kind='stable').reset_index(drop=True)
+        info_query = f"""select * from oracle_elixir_{self.year} where league = %s and (teamname = %s or teamname = %s) and position = 'team' and game_date between Date(%s) and Date_Add(Date(%s), interval 1 Day) order by game_date"""
+        return self.read_sql(info_query, params=(league, team1, team2, game_date, game_date))
+
     def calculate_overall_mvp_score(self, game_df, match_id, player_name):
         info_query = f"""select game_date, game, league from oracle_elixir_{self.year} where gameid = %s"""
         base_info = self.fetch_one(info_query, match_id)
@@ -1026,20 +1489,14 @@ class Database:
         league = base_info.get('league')
         player_team = game_df[game_df['playername'] == player_name]['teamname'].iloc[0]
         opp_team = game_df[game_df['teamname'] != player_team]['teamname'].iloc[0]
-        info_query = f"""select * from oracle_elixir_{self.year} where league = %s and (teamname = %s or teamname = %s) and position = 'team' and game_date between Date(%s) and Date_Add(Date(%s), interval 1 Day) order by game_date"""
-        series_data = pd.read_sql(info_query, self.connection, params=(league, player_team, opp_team, game_date, game_date))
+        series_data = self.get_series_team_rows(league, player_team, opp_team, game_date)
 
         game_ids = series_data['gameid'].unique()
+        game_numbers = series_data.drop_duplicates('gameid').set_index('gameid')['game']
 
-        all_mvp_scores = []
-        for game_id in game_ids:
-            game_data = self.get_game_data(game_id)
-            mvp_df = self.calculate_mvp_score(game_data)
-            game_num = game_data['game'].iloc[0]
-            mvp_df['game'] = game_num
-            all_mvp_scores.append(mvp_df)
-
-        combined_mvp = pd.concat(all_mvp_scores)
+        # 시리즈 전체 세트를 한번에 채점
+        combined_mvp = self.score_games(game_ids)
+        combined_mvp['game'] = combined_mvp['gameid'].map(game_numbers)
         overall_mvp = combined_mvp.groupby(['playername', 'position', 'teamname']).agg({
             'mvp_score': 'mean',
             'name_kr': lambda x: ', '.join(set(x))
@@ -1292,5 +1749,6 @@ class Database:
         update_query = """UPDATE champion_info ci JOIN oracle_elixir_2025 oe ON ci.ps_name = oe.name_us SET ci.oracle_elixir_name = oe.name_us WHERE ci.oracle_elixir_name IS NULL"""
         self.cursor.execute(update_query)
         self.commit()
+        self.champion_registry.refresh()
 
 
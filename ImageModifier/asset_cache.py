@@ -0,0 +1,127 @@
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from PIL import Image, ImageFont
+from ImageModifier.text_layout import GlyphMetrics
+
+
+class AssetCache:
+    """
+    프로세스 전체에서 같이 쓰는 폰트 / 이미지 캐시
+    - 폰트 : (경로, 크기) 별 FreeTypeFont 를 한번만 로드, 글자 advance 표도 폰트별로 유지
+    - 이미지 : 배경, 테이블, 아이콘 파일을 한번만 디코딩
+    - 변환 이미지 : resize, 테두리, 흑백, 원형 등 변환 결과를 (파일, 변환 key) 별로 저장
+    이미지는 max_bytes 를 넘으면 오래 안 쓴 것부터 삭제 (LRU)
+    캐시된 이미지는 여러 스레드가 같이 쓰므로 항상 복사본을 반환
+    """
+
+    def __init__(self, max_bytes=256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.fonts = {}
+        self.glyph_metrics = {}
+        self.images = OrderedDict()
+        self.current_bytes = 0
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_font(self, font_path, font_size):
+        key = (str(font_path), font_size)
+        with self.lock:
+            font = self.fonts.get(key)
+            if font is None:
+                font = ImageFont.truetype(font_path, font_size)
+                self.fonts[key] = font
+            return font
+
+    def get_glyph_metrics(self, font):
+        # 폰트별 글자 advance 표, 캐시된 폰트 객체와 같이 유지 (모든 페이지 클래스가 공유)
+        with self.lock:
+            metrics = self.glyph_metrics.get(font)
+            if metrics is None:
+                metrics = GlyphMetrics(font)
+                self.glyph_metrics[font] = metrics
+            return metrics
+
+    @staticmethod
+    def file_key(path):
+        # 파일이 다시 다운로드되면(선수 사진, 팀 아이콘) 수정 시간이 바뀌어서 다른 key
+        path = Path(path)
+        return str(path), path.stat().st_mtime_ns
+
+    @staticmethod
+    def image_bytes(image):
+        return image.width * image.height * len(image.getbands())
+
+    @staticmethod
+    def decode(path):
+        with Image.open(path) as image:
+            image.load()
+            return image
+
+    def get_cached(self, key, load):
+        with self.lock:
+            image = self.images.get(key)
+            if image is not None:
+                self.images.move_to_end(key)
+                self.hits += 1
+                return image
+            self.misses += 1
+        # 디코딩, 변환은 잠금 밖에서 (같은 key 를 동시에 만들어도 결과는 같음)
+        image = load()
+        with self.lock:
+            if key not in self.images:
+                self.images[key] = image
+                self.current_bytes += self.image_bytes(image)
+                self.evict()
+        return image
+
+    def evict(self):
+        while self.current_bytes > self.max_bytes and len(self.images) > 1:
+            _, image = self.images.popitem(last=False)
+            self.current_bytes -= self.image_bytes(image)
+
+    def load_image(self, path):
+        return self.get_cached(self.file_key(path), lambda: self.decode(path))
+
+    def get_image(self, path):
+        return self.load_image(path).copy()
+
+    def get_variant(self, path, transform, build):
+        """
+        transform : 변환 key (tuple), build(원본 복사본) : 변환된 이미지
+        """
+        key = self.file_key(path) + (transform,)
+        return self.get_cached(key, lambda: build(self.load_image(path).copy())).copy()
+
+    def clear(self):
+        with self.lock:
+            self.fonts.clear()
+            self.glyph_metrics.clear()
+            self.images.clear()
+            self.current_bytes = 0
+
+    def get_stats(self):
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "images": len(self.images),
+                "image_mb": round(self.current_bytes / (1024 * 1024), 1),
+                "fonts": len(self.fonts)
+            }
+
+
+shared_asset_cache = None
+shared_asset_cache_lock = threading.Lock()
+
+
+def get_shared_asset_cache(max_megabytes=256):
+    """
+    PickRate, MatchResult, Interview 가 같은 캐시를 쓰도록 프로세스에 하나만 생성
+    """
+    global shared_asset_cache
+    with shared_asset_cache_lock:
+        if shared_asset_cache is None:
+            shared_asset_cache = AssetCache(max_megabytes * 1024 * 1024)
+        return shared_asset_cache
@@ -0,0 +1,85 @@
+import numpy as np
+from PIL import Image
+
+"""
+    그라데이션 / 합성 도구
+    알파 값은 줄 단위로 draw.line 하지 않고 NumPy 로 한번에 계산
+    그라데이션 레이어는 덮는 영역 크기로만 만들고, 합성도 그 영역만 함 (전체 크기 레이어 X)
+"""
+
+
+def fade_in_alphas(length, max_alpha=255):
+    # 위에서 아래로 진해짐 : int(max_alpha * (i / length) ** 2)
+    progress = np.arange(length) / length
+    return (max_alpha * progress ** 2).astype(np.uint8)
+
+
+def fade_out_alphas(length, max_alpha=255):
+    # 위에서 아래로 옅어짐 : int(max_alpha * (1 - i / length))
+    progress = np.arange(length) / length
+    return (max_alpha * (1 - progress)).astype(np.uint8)
+
+
+def box_alphas(height, max_alpha, min_alpha):
+    # 아래 줄이 max_alpha, 위로 갈수록 min_alpha 쪽으로 (아래 줄부터 계산해서 뒤집음)
+    progress = 1 - (np.arange(height) / height) ** 2
+    alphas = (min_alpha + progress * (max_alpha - min_alpha)).astype(np.uint8)
+    return alphas[::-1]
+
+
+def border_alphas(width, height, border_size):
+    """
+    가장자리에서 안쪽으로 옅어지는 테두리 알파 (안쪽은 0)
+    가장자리 거리는 기존 사각형 외곽선 방식과 같게 왼쪽/위는 x, y, 오른쪽/아래는 width - x, height - y
+    """
+    xs = np.arange(width)
+    ys = np.arange(height)
+    distance_x = np.minimum(xs, width - xs)
+    distance_y = np.minimum(ys, height - ys)
+    distance = np.minimum(distance_y[:, None], distance_x[None, :])
+    mask = (255 * (np.minimum(distance, border_size) / border_size) ** 2).astype(np.uint8)
+    mask[distance >= border_size] = 255
+    return 255 - mask
+
+
+def black_layer(alpha):
+    # alpha : (height, width) 알파 -> 검은색 RGBA 레이어
+    alpha = np.ascontiguousarray(alpha, dtype=np.uint8)
+    layer = Image.new("RGBA", (alpha.shape[1], alpha.shape[0]), (0, 0, 0, 0))
+    layer.putalpha(Image.fromarray(alpha))
+    return layer
+
+
+def row_layer(alphas, width):
+    # 줄별 알파를 width 만큼 늘린 레이어
+    return black_layer(np.broadcast_to(alphas[:, None], (len(alphas), width)))
+
+
+def composite_region(image, layer, position):
+    """
+    image (RGBA) 의 layer 가 덮는 영역만 그 자리에서 alpha_composite
+    이미지 밖으로 나가는 부분은 잘라냄 (기존 전체 크기 레이어에 paste 한 것과 같음)
+    """
+    x, y = position
+    left, top = max(0, -x), max(0, -y)
+    right = min(layer.width, image.width - x)
+    bottom = min(layer.height, image.height - y)
+    if left < right and top < bottom:
+        image.alpha_composite(layer, dest=(x + left, y + top), source=(left, top, right, bottom))
+    return image
+
+
+def composite_border(image, layer, border_size):
+    # 테두리 레이어는 가장자리 띠 4개만 합성 (안쪽은 알파 0)
+    width, height = image.size
+    if width <= 2 * border_size or height <= 2 * border_size:
+        return composite_region(image, layer, (0, 0))
+    strips = [
+        (0, 0, width, border_size),
+        (0, height - border_size, width, height),
+        (0, border_size, border_size, height - border_size),
+        (width - border_size, border_size, width, height - border_size),
+    ]
+    for box in strips:
+        image.alpha_composite(layer, dest=box[:2], source=box)
+    return image
@@ -1,10 +1,12 @@
 from abc import ABC
 import os
-from PIL import Image, ImageDraw, ImageFont, ImageFilter
+from PIL import Image, ImageDraw, ImageFilter
 from pathlib import Path
 from datetime import datetime
 from util.commonException import CommonError, ErrorCode
-import re as regex
+from ImageModifier.asset_cache import get_shared_asset_cache
+from ImageModifier import text_layout, gradient
+from ImageModifier.template_renderer import TemplateRenderer
 
 class BaseContentProcessor(ABC):
 
@@ -12,8 +14,12 @@ class BaseContentProcessor(ABC):
         self.database = database
         self.meta_data = meta_data
         self.properties = meta_data.image_modifier_info
+        # 폰트, 배경, 아이콘은 모든 페이지 클래스가 같은 캐시 사용
+        self.asset_cache = get_shared_asset_cache(meta_data.basic_info.get("asset_cache_mb", 256))
         self._setup_common_paths()
         self._setup_fonts()
+        # 페이지 고정 레이아웃은 MyMetaData/page_templates.json 템플릿으로 그림
+        self.template_renderer = TemplateRenderer(self, meta_data.page_templates)
 
     def _setup_common_paths(self):
         base_path = Path(__file__).parent.parent
@@ -35,13 +41,34 @@ class BaseContentProcessor(ABC):
         self.main_font_size = self.properties.get("main_font_size")
         self.main_line_spacing = self.properties.get("main_line_spacing")
 
+    def get_font(self, font_path, font_size):
+        return self.asset_cache.get_font(font_path, font_size)
+
+    def get_glyph_metrics(self, font):
+        return self.asset_cache.get_glyph_metrics(font)
+
+    def open_asset(self, path):
+        # 배경, 테이블, 도장 같은 고정 이미지 (복사본이라 그대로 그려도 됨)
+        return self.asset_cache.get_image(path)
+
+    def open_icon(self, path, width, height, border_size=None, grayscale=False):
+        # 아이콘 resize -> 테두리 그라데이션 -> 흑백 결과를 변환별로 캐시
+        def build(image):
+            image = self.resize_image(image, width, height)
+            if border_size is not None:
+                image = self.add_gradient_border(image, border_size)
+            if grayscale:
+                image = self.convert_to_grayscale(image)
+            return image
+        return self.asset_cache.get_variant(path, ("icon", width, height, border_size, grayscale), build)
+
+    def open_circle_icon(self, path, width, height):
+        return self.asset_cache.get_variant(path, ("circle", width, height), lambda image: self.resize_circle(image, width, height))
+
     def calculate_text_max_chars(self, font_path, font_size, box_size):
-        font = ImageFont.truetype(font_path, font_size)
+        metrics = self.get_glyph_metrics(self.get_font(font_path, font_size))
         box_width, box_height = box_size
-        test_img = Image.new('RGB', (1, 1))
-        draw = ImageDraw.Draw(test_img)
-        test_chars = "가나다라마바사아자차카타파하"
-        avg_char_width = sum(draw.textlength(char, font=font) for char in test_chars) / len(test_chars)
+        avg_char_width = metrics.average_width(text_layout.HANGUL_SAMPLE_CHARS)
         line_height = font_size * 1.1
         chars_per_line = int(box_width / avg_char_width)
         available_lines = int(box_height / line_height)
@@ -51,7 +78,7 @@ class BaseContentProcessor(ABC):
     def add_text_box(self, image, text, x, y, font_size=20, color=(0, 0, 0), font_path=None):
         draw = ImageDraw.Draw(image)
         if font_path is None: font_path = self.noto_font_bold_path
-        font = ImageFont.truetype(font_path, font_size)
+        font = self.get_font(font_path, font_size)
         draw.text((x, y), str(text), font=font, fill=color)
 
     def resize_circle(self, image, width, height, stroke_width=2):
@@ -83,9 +110,10 @@ class BaseContentProcessor(ABC):
         top_image.save(output_path1)
         bottom_image.save(output_path2)
 
-    def save_image(self, image, match_id, file_name):
+    def save_image(self, image, match_id, file_name, output_dir=None):
         today_date = datetime.today().date().strftime("%y_%m_%d")
-        output_path = self.output_dir / today_date / match_id / f"{file_name}.png"
+        output_dir = output_dir or self.output_dir
+        output_path = output_dir / today_date / match_id / f"{file_name}.png"
         os.makedirs(output_path.parent, exist_ok=True)
         image.save(output_path)
 
@@ -100,49 +128,24 @@ class BaseContentProcessor(ABC):
 
     # 일반 내용 숫자나 bullet point 는 금색
     def add_main_text(self, image, text, position, box_size=(990, 700), font_size=50):
-        draw = ImageDraw.Draw(image)
         x, y = position
         box_width, box_height = box_size
         #draw.rectangle([x, y, x + box_width, y + box_height], fill=(255, 255, 255, 30))
-        main_font = ImageFont.truetype(self.noto_font_bold_path, font_size)
+        main_font = self.get_font(self.noto_font_bold_path, font_size)
+        metrics = self.get_glyph_metrics(main_font)
         main_text_color = (255, 255, 255)
         number_color = "#C89B3C"
 
-        words = text.split()
-        lines = []
-        current_line = []
-        current_width = 0
-        is_first_word = True
-        for word in words:
-            word_width = draw.textlength(word + " ", font=main_font)
-            if (not is_first_word and (word == "ㆍ" or word == "\u200b")) or (current_width + word_width > box_width):
-                if word == "\u200b":
-                    lines.append(" ".join(current_line))
-                    current_line = []
-                    continue
-                lines.append(" ".join(current_line))
-                current_line = [word]
-                current_width = word_width
-            else:
-                current_line.append(word)
-                current_width += word_width
+        def color_of(char):
+            is_numeric = char.isdigit() or char == 'ㆍ' or char == '%'
+            return number_color if is_numeric else main_text_color
 
-            is_first_word = False
-        if current_line:
-            lines.append(" ".join(current_line))
+        lines = text_layout.wrap_main_words(text.split(), metrics, box_width)
         line_height = self.main_font_size + self.main_line_spacing
         for line in lines:
-            current_x = x
-            for word in line.split():
-                word_start_x = current_x
-                for char in word:
-                    is_numeric = char.isdigit() or char == 'ㆍ' or char == '%'
-                    char_width = draw.textlength(char, font=main_font)
-                    color = number_color if is_numeric else main_text_color
-                    draw.text((current_x, y), char, font=main_font, fill=color)
-                    current_x += char_width
-                space_width = draw.textlength(" ", font=main_font)
-                current_x += space_width
+            # 같은 색 구간은 한번에 그림
+            for span_x, span_text, color in text_layout.color_spans(line, metrics, color_of):
+                text_layout.draw_span(image, (x + span_x, y), span_text, metrics, color)
             y += line_height
             if y > position[1] + box_height:
                 break
@@ -150,112 +153,27 @@ class BaseContentProcessor(ABC):
 
     #그림자 있는 큰 제목 -> 기획 변경으로 안쓸듯?
     def add_sub_title_text(self, image, text, x=50, y=50):
-        draw = ImageDraw.Draw(image)
-        font = ImageFont.truetype(self.cafe24_font_path, self.title_font_size)
-        shadow_color = '#2B2B2B'
-        shadow_offset = 8
-        for i in range(2):
-            offset = shadow_offset + i
-            draw.text((x + offset, y + offset), text,
-                      font=font, fill=shadow_color)
-        outline_thickness = 5
-        for offset_x in range(-outline_thickness, outline_thickness + 1):
-            for offset_y in range(-outline_thickness, outline_thickness + 1):
-                if offset_x * offset_x + offset_y * offset_y <= outline_thickness * outline_thickness:
-                    draw.text((x + offset_x, y + offset_y),
-                              text, font=font, fill='black')
-        draw.text((x, y), text, font=font, fill='white')
+        font = self.get_font(self.cafe24_font_path, self.title_font_size)
+        text_layout.draw_outlined_text(image, (x, y), text, self.get_glyph_metrics(font), 'white', outline_thickness=5, shadow_offset=8)
 
     # ^^ 사이 red, 글자수 조정
     def add_first_page_title(self, image, text, x=120, y=990, box_width=860, box_height=150):
         min_font_size = 50
-        current_font_size = self.title_font_size
-        draw = ImageDraw.Draw(image)
-        pattern = r'\^(.*?)\^'
-        parts = regex.split(pattern, text)
-        words = []
-        for i, part in enumerate(parts):
-            if not part:
-                continue
-            part_words = part.split()
-            for word in part_words:
-                words.append((word, i % 2 == 1))
-        while current_font_size >= min_font_size:
-            font = ImageFont.truetype(self.cafe24_font_path, current_font_size)
-
-            def calculate_line_width(line):
-                total_width = 0
-                for word, _ in line:
-                    bbox = draw.textbbox((0, 0), word + " ", font=font)
-                    total_width += bbox[2] - bbox[0]
-                return total_width
-            test_line = [(word, highlight) for word, highlight in words]
-            total_width = calculate_line_width(test_line)
-            line_height = int(current_font_size + current_font_size * 0.2)
-            test_lines = []
-            test_line = []
-            test_x = 0
-
-            for word, is_highlighted in words:
-                bbox = draw.textbbox((0, 0), word + " ", font=font)
-                word_width = bbox[2] - bbox[0]
-
-                if test_x + word_width > box_width:
-                    test_lines.append(test_line)
-                    test_line = []
-                    test_x = 0
-
-                test_line.append((word, is_highlighted))
-                test_x += word_width
-            if test_line:
-                test_lines.append(test_line)
-            total_height = len(test_lines) * line_height
-            if total_width <= box_width or (current_font_size == min_font_size and total_height <= box_height):
-                break
-            current_font_size -= 10
-        if current_font_size < min_font_size:
-            current_font_size = min_font_size
-            font = ImageFont.truetype(self.cafe24_font_path, current_font_size)
-        def draw_text_with_effects(x, y, word, is_highlighted):
-            shadow_color = '#2B2B2B'
-            shadow_offset = max(3, int(current_font_size / self.title_font_size * 8))
-            for i in range(2):
-                offset = shadow_offset + i
-                draw.text((x + offset, y + offset), word + " ",
-                          font=font, fill=shadow_color)
-            outline_thickness = max(2, int(current_font_size / self.title_font_size * 5))
-            for offset_x in range(-outline_thickness, outline_thickness + 1):
-                for offset_y in range(-outline_thickness, outline_thickness + 1):
-                    if offset_x * offset_x + offset_y * offset_y <= outline_thickness * outline_thickness:
-                        draw.text((x + offset_x, y + offset_y),
-                                  word + " ", font=font, fill='black')
-
-            text_color = '#ef2c28' if is_highlighted else 'white'
-            draw.text((x, y), word + " ", font=font, fill=text_color)
+        words = text_layout.split_highlight_words(text)
+
+        # 한 줄에 다 들어가는 가장 큰 크기 (10 단위), 없으면 최소 크기
+        def fits(font_size):
+            metrics = self.get_glyph_metrics(self.get_font(self.cafe24_font_path, font_size))
+            return sum(metrics.box_width(word + " ") for word, _ in words) <= box_width
+        current_font_size = text_layout.fit_font_size(fits, self.title_font_size, min_font_size)
+        font = self.get_font(self.cafe24_font_path, current_font_size)
+        metrics = self.get_glyph_metrics(font)
+        shadow_offset = max(3, int(current_font_size / self.title_font_size * 8))
+        outline_thickness = max(2, int(current_font_size / self.title_font_size * 5))
+
         # draw.rectangle([x, y, x + box_width, y + box_height], fill=(0, 0, 255, 128))  # 디버깅용
         line_height = int(current_font_size + current_font_size * 0.2)
-        current_x = x
-        current_line = []
-        lines = []
-        for word, is_highlighted in words:
-            bbox = draw.textbbox((0, 0), word + " ", font=font)
-            word_width = bbox[2] - bbox[0]
-            if current_x + word_width > x + box_width:
-                if len(current_line) == 0:
-                    current_line.append((word, is_highlighted))
-                    lines.append(current_line)
-                    current_line = []
-                    current_x = x
-                else:
-                    lines.append(current_line)
-                    current_line = [(word, is_highlighted)]
-                    current_x = x + word_width
-                    continue
-            else:
-                current_line.append((word, is_highlighted))
-                current_x += word_width
-        if current_line:
-            lines.append(current_line)
+        lines = text_layout.wrap_title_words(words, metrics, box_width)
         total_lines_height = len(lines) * line_height
         if total_lines_height > box_height:
             line_height = min(line_height, int(box_height / len(lines)))
@@ -267,78 +185,53 @@ class BaseContentProcessor(ABC):
             if current_y + line_height > y + box_height:
                 break
             if use_center_align:
-                line_width = sum(
-                    draw.textbbox((0, 0), word + " ", font=font)[2] - draw.textbbox((0, 0), word + " ", font=font)[0]
-                    for word, _ in line)
+                line_width = sum(metrics.box_width(word + " ") for word, _ in line)
                 start_x = x + (box_width - line_width) // 2
             else:
                 start_x = x
             current_x = start_x
             for word, is_highlighted in line:
-                bbox = draw.textbbox((0, 0), word + " ", font=font)
-                word_width = bbox[2] - bbox[0]
-                draw_text_with_effects(current_x, current_y, word, is_highlighted)
-                current_x += word_width
+                text_color = '#ef2c28' if is_highlighted else 'white'
+                text_layout.draw_outlined_text(image, (current_x, current_y), word + " ", metrics, text_color,
+                                               outline_thickness=outline_thickness, shadow_offset=shadow_offset)
+                current_x += metrics.box_width(word + " ")
             current_y += line_height
 
+    def get_gradient_layer(self, key, build):
+        # 그라데이션 레이어는 (종류, 크기, 값) 별로 캐시, 합성 원본으로만 쓰므로 복사하지 않음
+        return self.asset_cache.get_cached(("gradient",) + key, build)
 
+    # 그라데이션 함수는 RGBA 이미지면 그 자리에서 합성하고 반환 (반환값을 계속 사용)
     def add_gradient_border(self, image, border_size=20):
+        if image.mode != 'RGBA':
+            image = image.convert('RGBA')
         width, height = image.size
-        gradient_mask = Image.new('L', (width, height), 255)
-        draw = ImageDraw.Draw(gradient_mask)
-        inner_rect = (border_size, border_size, width - border_size, height - border_size)
-        for i in range(border_size):
-            rect = (i, i, width - i, height - i)
-            value = int(255 * ((i / border_size) ** 2))
-            draw.rectangle(rect, outline=value)
-        draw.rectangle(inner_rect, fill=255)
-        black_layer = Image.new('RGBA', (width, height), (0, 0, 0, 255))
-
-        gradient_layer = Image.composite(
-            Image.new('RGBA', (width, height), (0, 0, 0, 0)),
-            black_layer,
-            gradient_mask
-        )
-        result = Image.alpha_composite(image.convert('RGBA'), gradient_layer)
-        return result
+        layer = self.get_gradient_layer(("border", width, height, border_size),
+                                        lambda: gradient.black_layer(gradient.border_alphas(width, height, border_size)))
+        return gradient.composite_border(image, layer, border_size)
 
     def add_bottom_gradient(self, image, border_size=20):
+        if image.mode != 'RGBA':
+            image = image.convert('RGBA')
         width, height = image.size
-        gradient_layer = Image.new('RGBA', (width, height), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(gradient_layer)
-        for i in range(border_size):
-            alpha = int(255 * ((i / border_size) ** 2))
-            y_position = height - border_size + i
-            draw.line((0, y_position, width, y_position), fill=(0, 0, 0, alpha))
-        result = Image.alpha_composite(image.convert('RGBA'), gradient_layer)
-        return result
+        layer = self.get_gradient_layer(("bottom", width, border_size),
+                                        lambda: gradient.row_layer(gradient.fade_in_alphas(border_size), width))
+        return gradient.composite_region(image, layer, (0, height - border_size))
 
     def add_gradient_box(self, image, x, y, width, height, max_alpha=200, min_alpha=50):
         if image.mode != 'RGBA':
             image = image.convert('RGBA')
-        gradient_layer = Image.new('RGBA', (width, height), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(gradient_layer)
-        for i in range(height):
-            progress = 1 - (i / height) ** 2
-            alpha = int(min_alpha + progress * (max_alpha - min_alpha))
-            draw.line((0, height - i - 1, width - 1, height - i - 1), fill=(0, 0, 0, alpha))
-        full_layer = Image.new('RGBA', image.size, (0, 0, 0, 0))
-        full_layer.paste(gradient_layer, (x, y))
-        result = Image.alpha_composite(image, full_layer)
-        return result
+        layer = self.get_gradient_layer(("box", width, height, max_alpha, min_alpha),
+                                        lambda: gradient.row_layer(gradient.box_alphas(height, max_alpha, min_alpha), width))
+        return gradient.composite_region(image, layer, (x, y))
 
     def add_top_gradient(self, image, border_size=15, max_alpha=255):
+        if image.mode != 'RGBA':
+            image = image.convert('RGBA')
         width, height = image.size
-        gradient_layer = Image.new('RGBA', (width, height), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(gradient_layer)
-
-        for i in range(border_size):
-            progress = i / border_size
-            alpha = int(max_alpha * (1 - progress))
-            y_position = i
-            draw.line((0, y_position, width, y_position), fill=(0, 0, 0, alpha))
-        result = Image.alpha_composite(image.convert('RGBA'), gradient_layer)
-        return result
+        layer = self.get_gradient_layer(("top", width, border_size, max_alpha),
+                                        lambda: gradient.row_layer(gradient.fade_out_alphas(border_size, max_alpha), width))
+        return gradient.composite_region(image, layer, (0, 0))
 
     def resize_with_crop_image(self, image, width, height=None):
         if height is None:
@@ -373,7 +266,7 @@ class BaseContentProcessor(ABC):
         return self.player_dir / "default.png"
 
     def add_icon_to_image(self, image, icon_path, position):
-        icon = Image.open(icon_path).convert("RGBA")
+        icon = self.open_asset(icon_path).convert("RGBA")
         if icon is None:
             raise FileNotFoundError(f"Icon at path '{icon_path}' not found.")
         icon_width, icon_height = icon.size
@@ -381,7 +274,7 @@ class BaseContentProcessor(ABC):
         return image
 
     def add_logo(self, image):
-        icon = Image.open(self.logo_path)
+        icon = self.open_asset(self.logo_path)
         image.paste(icon, (491,1250), icon)
         return image
 
@@ -469,6 +362,5 @@ class BaseContentProcessor(ABC):
 
     def get_player_image(self, player_name, width, height):
         player_path = self.get_player_image_path(player_name.lower())
-        player_image = Image.open(player_path)
-        return self.resize_with_crop_image(player_image, width, height)
+        return self.open_icon(player_path, width, height)
 
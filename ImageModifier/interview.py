@@ -1,5 +1,5 @@
 from ImageModifier.image_utils import BaseContentProcessor
-from PIL import Image, ImageDraw, ImageFont
+from PIL import ImageDraw
 from pathlib import Path
 import cv2
 
@@ -13,8 +13,6 @@ class Interview(BaseContentProcessor):
         self.properties = meta_data.image_modifier_info
 
         #path
-        self.title_background_dir = Path(__file__).parent.parent / "Assets" / "Interview" / "title.png"
-        self.main_background_dir = Path(__file__).parent.parent / "Assets" / "Interview" / "main.png"
         self.line_dir = Path(__file__).parent.parent / "Assets" / "Interview" / "line.png"
         self.video_assets_dir = Path(__file__).parent.parent / "Assets" / "Video"
         self.output_dir = Path(__file__).parent.parent / "ImageOutput" / "Interview"
@@ -61,56 +59,56 @@ class Interview(BaseContentProcessor):
         return frame if ret else None
 
     def title_page(self, video_path):
-        #썸네일 생성 및 붙이기
-        background = Image.open(self.title_background_dir)
+        #썸네일 생성, 제목
         thumbnail_path = self.extract_thumbnail(video_path)
-        thumbnail = Image.open(thumbnail_path)
-        thumbnail = self.resize_image(thumbnail, 900, 720)
-        background.paste(thumbnail,(91, 231))
-        
-        #제목
         document = self.mongo_db.find_by_video_path(video_path)
-        self.add_first_page_title(background, document['summary']['main_title'])
+        background = self.template_renderer.render("interview_title", {
+            "thumbnail": thumbnail_path,
+            "title": document['summary']['main_title']
+        })
         self.save_image(background, video_path, "1")
 
     def main_page(self, video_path):
         document = self.mongo_db.find_by_video_path(video_path)
         summaries = document['summary']['summaries']
-        line_image = Image.open(self.line_dir)
+        line_image = self.open_asset(self.line_dir)
         total_pages = (len(summaries) + 2) // 3
 
         # 각 페이지 생성
         for page_num in range(total_pages):
-            background = Image.open(self.main_background_dir)
-            draw = ImageDraw.Draw(background)
-
             start_idx = page_num * 3
             end_idx = min(start_idx + 3, len(summaries))
             page_summaries = summaries[start_idx:end_idx]
+            background = self.template_renderer.render("interview_main", {
+                "summaries": lambda background: self.draw_summaries(background, page_summaries, start_idx, line_image)
+            })
+
+            # 이미지 저장
+            page_number = page_num + 2  # 첫 페이지가 2부터 시작
+            self.save_image(background, video_path, f"{page_number}")
 
-            # 각 항목 표시
-            x = 91
-            y = 231
-            subtitle_spacing = 50
-            main_content_spacing = 80
-            for i, summary in enumerate(page_summaries):
-                subtitle = summary['subtitle']
-                content = summary['content']
-                item_number = start_idx + i + 1
+    def draw_summaries(self, background, page_summaries, start_idx, line_image):
+        draw = ImageDraw.Draw(background)
 
-                # 제목 그리기
-                subtitle_height = self.draw_subtitle(draw, f"{item_number}. {subtitle}", x, y)
-                y += subtitle_height + subtitle_spacing  # 제목과 내용 사이 간격
+        # 각 항목 표시
+        x = 91
+        y = 231
+        subtitle_spacing = 50
+        main_content_spacing = 80
+        for i, summary in enumerate(page_summaries):
+            subtitle = summary['subtitle']
+            content = summary['content']
+            item_number = start_idx + i + 1
 
-                background.paste(line_image, (x, y-15), )
+            # 제목 그리기
+            subtitle_height = self.draw_subtitle(draw, f"{item_number}. {subtitle}", x, y)
+            y += subtitle_height + subtitle_spacing  # 제목과 내용 사이 간격
 
-                # 내용 그리기
-                content_height = self.draw_content(draw, content, x, y)
-                y += content_height + main_content_spacing  # 다음 항목과의 간격
+            background.paste(line_image, (x, y-15), )
 
-            # 이미지 저장
-            page_number = page_num + 2  # 첫 페이지가 2부터 시작
-            self.save_image(background, video_path, f"{page_number}")
+            # 내용 그리기
+            content_height = self.draw_content(draw, content, x, y)
+            y += content_height + main_content_spacing  # 다음 항목과의 간격
 
     def draw_subtitle(self, draw, subtitle_text, x, y):
         text_box_width = 900
@@ -118,9 +116,8 @@ class Interview(BaseContentProcessor):
         min_title_font_size = 40
 
         while title_font_size >= min_title_font_size:
-            title_font = ImageFont.truetype(self.noto_font_bold_path, title_font_size)
-            title_bbox = draw.textbbox((0, 0), subtitle_text, font=title_font)
-            title_width = title_bbox[2] - title_bbox[0]
+            title_font = self.get_font(self.noto_font_bold_path, title_font_size)
+            title_width = self.get_glyph_metrics(title_font).width(subtitle_text)
 
             if title_width <= text_box_width:
                 break
@@ -129,7 +126,7 @@ class Interview(BaseContentProcessor):
 
         if title_font_size < min_title_font_size:
             title_font_size = min_title_font_size
-            title_font = ImageFont.truetype(self.noto_font_bold_path, title_font_size)
+            title_font = self.get_font(self.noto_font_bold_path, title_font_size)
 
         draw.text((x, y), subtitle_text, font=title_font, fill="#C89B3C")
         title_bbox = draw.textbbox((0, 0), subtitle_text, font=title_font)
@@ -137,24 +134,27 @@ class Interview(BaseContentProcessor):
 
     def draw_content(self, draw, content, x, y):
         text_box_width = 900
-        content_font = ImageFont.truetype(self.noto_font_bold_path, 40)
+        content_font = self.get_font(self.noto_font_bold_path, 40)
+        metrics = self.get_glyph_metrics(content_font)
+        space_width = metrics.advance(" ")
 
-        # 텍스트를 여러 줄로 분할
+        # 텍스트를 여러 줄로 분할, 줄 폭은 단어 폭을 더해서 계산
         words = content.split()
         lines = []
         current_line = []
+        current_width = 0
 
         for word in words:
-            test_line = current_line + [word]
-            test_text = " ".join(test_line)
-            content_bbox = draw.textbbox((0, 0), test_text, font=content_font)
-            content_width = content_bbox[2] - content_bbox[0]
+            word_width = metrics.width(word)
+            content_width = current_width + space_width + word_width if current_line else word_width
 
             if content_width <= text_box_width:
-                current_line = test_line
+                current_line.append(word)
+                current_width = content_width
             else:
                 lines.append(" ".join(current_line))
                 current_line = [word]
+                current_width = word_width
 
         if current_line:
             lines.append(" ".join(current_line))
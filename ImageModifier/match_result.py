@@ -2,10 +2,11 @@ import os
 import shutil
 from datetime import datetime
 
-from PIL import Image, ImageDraw, ImageFont
+from PIL import ImageDraw
 from pathlib import Path
 from ImageModifier.image_utils import BaseContentProcessor
 from Ai.LangChain.article_generator import ArticleGenerator
+from util.task_graph import TaskGraph
 
 class MatchResult(BaseContentProcessor):
 
@@ -17,9 +18,6 @@ class MatchResult(BaseContentProcessor):
         self.pick_rate = pick_rate
 
         self.assets_dir = Path(__file__).parent.parent / "Assets" / "MatchResult"
-        self.title_background_dir = Path(__file__).parent.parent / "Assets" / "MatchResult" / "title.png"
-        self.main_background_dir = Path(__file__).parent.parent / "Assets" / "MatchResult" / "main.png"
-        self.set_result_dir = Path(__file__).parent.parent / "Assets" / "MatchResult" / "set_result.png"
         self.gradient_dir = Path(__file__).parent.parent / "Assets" / "MatchResult" / "gradient.png"
         self.output_dir = Path(__file__).parent.parent / "ImageOutput" / "MatchResult"
 
@@ -29,48 +27,45 @@ class MatchResult(BaseContentProcessor):
         self.title_font_size = self.properties.get("title_font_size")
 
         self.article_generator = article_generator
+        self.page_workers = meta_data.basic_info.get("page_workers", 5)
 
-    def title_page(self, match_id, player_name, detection_type):
-        background = Image.open(self.title_background_dir)
-        game_df = self.database.get_game_data(match_id)
+    def title_page(self, match_id, player_name, detection_type, game_df=None):
+        if game_df is None:
+            game_df = self.database.get_game_data(match_id)
         player_team = game_df[game_df['playername'] == player_name]['teamname'].iloc[0]
         self.database.get_all_team_slug()
         opp_team_name = game_df[game_df['teamname'] != player_team]['teamname'].iloc[0]
         game_date = datetime.strftime(game_df['game_date'].iloc[0], "%Y/%m/%d")
         league_title = f"{game_df['game_year'].iloc[0]} {game_df['league'].iloc[0]} {game_df['split'].iloc[0]}"
 
-        #선수
-        player_image = self.get_player_image(player_name, 520, 497)
-        background.paste(player_image, (470, 399), player_image)
-
-        #팀로고
-        player_team_icon = self.open_team_icon(player_team)
-        opp_team_icon = self.open_team_icon(opp_team_name)
-        player_team_icon = self.resize_image(player_team_icon, 200, 200)
-        opp_team_icon = self.resize_image(opp_team_icon, 200, 200)
-        background.paste(player_team_icon, (134,300), player_team_icon)
-        background.paste(opp_team_icon, (134,666), opp_team_icon)
-
-        #스코어, 리그, 날짜
+        #스코어
         player_team_score, opp_team_score = self.database.get_sets_score(match_id, player_team, opp_team_name)
-        self.add_text_box(background, player_team_score, 395, 327, 96, (255,255,255), self.anton_font_path)
-        self.add_text_box(background, opp_team_score, 395, 693, 96, (255,255,255), self.anton_font_path)
-        self.add_text_box(background, league_title, 134, 542, 45, (255,255,255), self.noto_font_bold_kr_path)
-        self.add_text_box(background, game_date, 822, 209, 36, (255,255,255), self.noto_font_bold_kr_path)
 
-        # 메인 제목
-        title = self.article_generator.generate_match_result_title(detection_type, game_df, player_name)
-        self.add_first_page_title(background, title)
-        self.add_logo(background)
+        # 선수, 팀로고, 스코어, 리그, 날짜, 메인 제목
+        background = self.template_renderer.render("match_result_title", {
+            "player": self.get_player_image(player_name, 520, 497),
+            "player_team_icon": self.open_team_icon(player_team, 200),
+            "opp_team_icon": self.open_team_icon(opp_team_name, 200),
+            "player_team_score": player_team_score,
+            "opp_team_score": opp_team_score,
+            "league_title": league_title,
+            "game_date": game_date,
+            "title": self.article_generator.generate_match_result_title(detection_type, game_df, player_name)
+        })
         self.save_image(background, match_id, "1")
 
 
-    def set_page(self, match_id, player_name):
-        today_date = datetime.today().date().strftime("%y_%m_%d")
-        game_df = self.database.get_game_data(match_id)
+    def get_set_game_ids(self, match_id, player_name, game_df=None):
+        if game_df is None:
+            game_df = self.database.get_game_data(match_id)
         player_team = game_df[game_df['playername'] == player_name]['teamname'].iloc[0]
         opp_team_name = game_df[game_df['teamname'] != player_team]['teamname'].iloc[0]
-        game_id_list = self.database.get_sets_game_id(match_id, player_team, opp_team_name)['gameid']
+        return list(self.database.get_sets_game_id(match_id, player_team, opp_team_name)['gameid'])
+
+    def set_page(self, match_id, player_name, game_id_list=None):
+        today_date = datetime.today().date().strftime("%y_%m_%d")
+        if game_id_list is None:
+            game_id_list = self.get_set_game_ids(match_id, player_name)
         print(game_id_list)
         print(match_id, " ", player_name)
         page_index = 2
@@ -83,49 +78,35 @@ class MatchResult(BaseContentProcessor):
         return page_index + len(game_id_list) - 1
 
     def one_set_page(self, match_id, player_name, save_path, highlight_player=False):
-        background = Image.open(self.set_result_dir)
         game_df = self.database.get_game_data(match_id)
         player_team_name = game_df[game_df['playername'] == player_name]['teamname'].iloc[0]
         opp_team_name = game_df[game_df['teamname'] != player_team_name]['teamname'].iloc[0]
 
-        # 팀 로고
-        player_team_icon = self.open_team_icon(player_team_name)
-        opp_team_icon = self.open_team_icon(opp_team_name)
-
-        player_team_icon = self.resize_image(player_team_icon, 150, 150)
-        opp_team_icon = self.resize_image(opp_team_icon, 150, 150)
-        background.paste(player_team_icon, (158, 230), player_team_icon)
-        background.paste(opp_team_icon, (771, 230), opp_team_icon)
-        
         # 세트 정보, 승패 정보
-        win_text = Image.open(self.assets_dir / "win.png")
-        lose_text = Image.open(self.assets_dir / "lose.png")
+        win_text = self.assets_dir / "win.png"
+        lose_text = self.assets_dir / "lose.png"
         player_team_result = game_df[game_df['playername'] == player_name]['result'].iloc[0]
         set_info = f"{game_df[game_df['playername'] == player_name]['game'].iloc[0]} SET"
-        if player_team_result == 1:
-            background.paste(win_text, (364, 279), win_text)
-            background.paste(lose_text, (663, 279), lose_text)
-        else:
-            background.paste(lose_text, (364, 279), lose_text)
-            background.paste(win_text, (663, 279), win_text)
-        self.add_text_box(background, set_info, 472, 275, 50, "#C89B3C", self.noto_font_bold_kr_path)
 
-        # 경기 결과 테이블
         player_team = game_df[(game_df['teamname'] == player_team_name)]
         opp_player_team = game_df[(game_df['teamname'] == opp_team_name)]
-        self.draw_result_table(background, player_team, opp_player_team, (42, 412))
+        mvp_score = self.database.calculate_mvp_score(game_df)
 
         # 경기 전체 테이블
-        mvp_score = self.database.calculate_mvp_score(game_df)
-        table = Image.open(self.assets_dir / "table.png")
-        background.paste(table, (42, 534), table)
-        draw = ImageDraw.Draw(background)
-        self.draw_ban_info(background, player_team, opp_player_team)
-        if highlight_player:
-            self.draw_table_info(background, player_team, opp_player_team, draw, mvp_score, player_name)
-        else:
-            self.draw_table_info(background, player_team, opp_player_team, draw, mvp_score)
-        self.add_logo(background)
+        def match_table(background):
+            self.draw_ban_info(background, player_team, opp_player_team)
+            self.draw_table_info(background, player_team, opp_player_team, ImageDraw.Draw(background), mvp_score,
+                                 player_name if highlight_player else None)
+
+        background = self.template_renderer.render("match_result_set", {
+            "player_team_icon": self.open_team_icon(player_team_name, 150),
+            "opp_team_icon": self.open_team_icon(opp_team_name, 150),
+            "player_team_result": win_text if player_team_result == 1 else lose_text,
+            "opp_team_result": lose_text if player_team_result == 1 else win_text,
+            "set_info": set_info,
+            "result_table": lambda background: self.draw_result_table(background, player_team, opp_player_team, (42, 412)),
+            "match_table": match_table
+        })
         background.save(save_path)
 
     def pick_rate_page(self, match_id, player_name, page_index):
@@ -135,28 +116,21 @@ class MatchResult(BaseContentProcessor):
         return page_index+4
 
     # 전체 경기 평점 페이지 (맨 마지막 페이지)
-    def main_page(self, match_id, player_name, page_index):
-        background = Image.open(self.main_background_dir)
-        game_df = self.database.get_game_data(match_id)
+    def main_page(self, match_id, player_name, page_index, game_df=None):
+        if game_df is None:
+            game_df = self.database.get_game_data(match_id)
         player_team_name = game_df[game_df['playername'] == player_name]['teamname'].iloc[0]
         opp_team_name = game_df[game_df['teamname'] != player_team_name]['teamname'].iloc[0]
 
-        #팀 로고
-        player_team_icon = self.open_team_icon(player_team_name)
-        opp_team_icon = self.open_team_icon(opp_team_name)
-        player_team_icon = self.resize_image(player_team_icon, 150, 150)
-        opp_team_icon = self.resize_image(opp_team_icon, 150, 150)
-        background.paste(player_team_icon, (159, 224), player_team_icon)
-        background.paste(opp_team_icon, (772, 224), opp_team_icon)
-
-        # 스코어
+        # 스코어, 이름 및 테이블
         player_team_score, opp_team_score = self.database.get_sets_score(match_id, player_team_name, opp_team_name)
-        self.add_text_box(background, f"{player_team_score} - {opp_team_score}", 459, 224, 96, (255, 255, 255), self.anton_font_path)
-
-        #이름 및 테이블
         overall_mvp_score = self.database.calculate_overall_mvp_score(game_df, match_id, player_name)
-        self.draw_overall_mvp_table(background, overall_mvp_score, player_team_name, opp_team_name)
-        self.add_logo(background)
+        background = self.template_renderer.render("match_result_main", {
+            "player_team_icon": self.open_team_icon(player_team_name, 150),
+            "opp_team_icon": self.open_team_icon(opp_team_name, 150),
+            "score": f"{player_team_score} - {opp_team_score}",
+            "mvp_table": lambda background: self.draw_overall_mvp_table(background, overall_mvp_score, player_team_name, opp_team_name)
+        })
         self.save_image(background, match_id, page_index+1)
 
     def draw_overall_mvp_table(self, background, overall_mvp_df, player_team, opp_team):
@@ -183,12 +157,12 @@ class MatchResult(BaseContentProcessor):
 
     def draw_result_table(self, background, player_team, opp_player_team, position):
         if player_team['result'].iloc[0] == 1:
-            result_table = Image.open(self.assets_dir / "win_result.png")
+            result_table = self.open_asset(self.assets_dir / "win_result.png")
         else:
-            result_table = Image.open(self.assets_dir / "defeat_result.png")
+            result_table = self.open_asset(self.assets_dir / "defeat_result.png")
         win_team_name = player_team['teamname'].iloc[0]
         result_draw = ImageDraw.Draw(result_table)
-        font = ImageFont.truetype(self.noto_font_bold_kr_path, 18)
+        font = self.get_font(self.noto_font_bold_path, 18)
         blue_bbox = font.getbbox(win_team_name)
         blue_text_width = blue_bbox[2] - blue_bbox[0]
         blue_x = 300 - (blue_text_width / 2)
@@ -203,7 +177,7 @@ class MatchResult(BaseContentProcessor):
     
     #왼쪽이 무조건 플레이어팀
     def draw_table_info(self, background, player_team, opp_player_team, draw, mvp_score, highlight_player=None):
-        font = ImageFont.truetype(self.noto_font_bold_kr_path, 20)
+        font = self.get_font(self.noto_font_bold_path, 20)
         positions = ['top', 'jungle', 'mid', 'bottom', 'support']
         row_start_y = 598
         row_height = 91
@@ -222,9 +196,7 @@ class MatchResult(BaseContentProcessor):
         for i, position in enumerate(positions):
             current_y = row_start_y + (i * row_height)
             blue_pos_data = player_team[player_team['position'] == position].iloc[0]
-            blue_champion_icon = Image.open(self.champion_icon_dir / f"{blue_pos_data['name_us']}.png")
-            blue_champion_icon = self.resize_image(blue_champion_icon, 100, 60)
-            blue_champion_icon = self.add_gradient_border(blue_champion_icon, 10)
+            blue_champion_icon = self.open_icon(self.champion_icon_dir / f"{blue_pos_data['name_us']}.png", 100, 60, border_size=10)
             background.paste(blue_champion_icon, (left_side['champion'], current_y))
 
             blue_kda = f"{blue_pos_data['kills']} / {blue_pos_data['deaths']} / {blue_pos_data['assists']}"
@@ -240,9 +212,7 @@ class MatchResult(BaseContentProcessor):
             draw.text((left_side['damage'], current_y + 20), blue_damage, font=font, fill=color)
 
             red_pos_data = opp_player_team[opp_player_team['position'] == position].iloc[0]
-            red_champion_icon = Image.open(self.champion_icon_dir / f"{red_pos_data['name_us']}.png")
-            red_champion_icon = self.resize_image(red_champion_icon, 100, 60)
-            red_champion_icon = self.add_gradient_border(red_champion_icon, 10)
+            red_champion_icon = self.open_icon(self.champion_icon_dir / f"{red_pos_data['name_us']}.png", 100, 60, border_size=10)
             background.paste(red_champion_icon, (right_side['champion'], current_y))
             if red_pos_data['playername'] == highlight_player:
                 color = "#ED2A2A"
@@ -268,10 +238,7 @@ class MatchResult(BaseContentProcessor):
         for i, ban in enumerate(blue_bans):
             if ban:
                 try:
-                    ban_icon = Image.open(self.champion_icon_dir / f"{ban}.png")
-                    ban_icon = self.resize_image(ban_icon, 100, 60)
-                    ban_icon = self.add_gradient_border(ban_icon, 10)
-                    ban_icon = self.convert_to_grayscale(ban_icon)
+                    ban_icon = self.open_icon(self.champion_icon_dir / f"{ban}.png", 100, 60, border_size=10, grayscale=True)
                     background.paste(ban_icon, (42 + i * ban_spacing, ban_y))
                 except Exception as e:
                     print(f"블루팀 ban 이미지 처리 중 오류: {e}")
@@ -279,26 +246,48 @@ class MatchResult(BaseContentProcessor):
         for i, ban in enumerate(reversed(red_bans)):
             if ban:
                 try:
-                    ban_icon = Image.open(self.champion_icon_dir / f"{ban}.png")
-                    ban_icon = self.resize_image(ban_icon, 100, 60)
-                    ban_icon = self.add_gradient_border(ban_icon, 10)
-                    ban_icon = self.convert_to_grayscale(ban_icon)
+                    ban_icon = self.open_icon(self.champion_icon_dir / f"{ban}.png", 100, 60, border_size=10, grayscale=True)
                     background.paste(ban_icon, (938 - i * ban_spacing, ban_y))
                 except Exception as e:
                     print(f"레드팀 ban 이미지 처리 중 오류: {e}")
 
-    def open_team_icon(self, player_team_name):
+    def open_team_icon(self, player_team_name, size):
         player_team_name = self.database.get_team_icon_name_by_oracle_elixir(player_team_name)
-        image = Image.open(self.team_icon_dir / f"{player_team_name}.png")
-        return image.convert('RGBA')
+        return self.asset_cache.get_variant(
+            self.team_icon_dir / f"{player_team_name}.png", ("team_icon", size),
+            lambda image: self.resize_image(image.convert('RGBA'), size, size)
+        )
 
     # match_result detection_type -> general, penta_kill, unmatch_line, two_bottom_choice
     def run(self, match_id, player_name, detection_type):
-        # try:
-        self.title_page(match_id, player_name, detection_type)
-        last_page_index = self.set_page(match_id, player_name)
-        last_page_index = self.pick_rate_page(match_id, player_name, last_page_index)
-        self.main_page(match_id, player_name, last_page_index)
+        """
+        페이지 번호는 세트 수로 미리 정해지므로 세트 목록만 먼저 구하고 나머지 페이지는 동시에 생성
+        실패 시 예외를 그대로 올려서 ArticleExecutor 가 출력 폴더를 정리
+        """
+        # 세트 페이지는 2 부터 세트 수만큼, 픽률 페이지는 마지막 세트 페이지 번호부터 이어짐
+        def pick_rate_index(set_game_ids):
+            return 2 + len(set_game_ids) - 1
+
+        pick_rate = self.pick_rate
+        graph = TaskGraph(self.page_workers, after_task=self.database.release_connection)
+        pick_rate.add_shared_inputs(graph, match_id, player_name)
+        pick_rate.add_articles(graph, player_name, ["third_page", "fourth_page"])
+        graph.add("set_game_ids", lambda game_df: self.get_set_game_ids(match_id, player_name, game_df), ["game_df"])
+        graph.add("title", lambda game_df: self.title_page(match_id, player_name, detection_type, game_df), ["game_df"])
+        graph.add("sets", lambda set_game_ids: self.set_page(match_id, player_name, set_game_ids), ["set_game_ids"])
+        # 픽률 첫 페이지는 마지막 세트 페이지와 번호가 같아서 기존처럼 세트 페이지 다음에 덮어씀
+        graph.add("pick_rate3", lambda game_df, radar_stats, set_game_ids, sets, articles: pick_rate.third_page(
+            match_id, player_name, pick_rate_index(set_game_ids), pick_rate_index(set_game_ids)+1, self.output_dir,
+            game_df=game_df, radar_stats=radar_stats, articles=articles), ["game_df", "radar_stats", "set_game_ids", "sets", "articles"])
+        graph.add("pick_rate4", lambda game_df, set_game_ids, articles: pick_rate.fourth_page(
+            match_id, player_name, pick_rate_index(set_game_ids)+2, pick_rate_index(set_game_ids)+3, self.output_dir,
+            game_df=game_df, articles=articles), ["game_df", "set_game_ids", "articles"])
+        graph.add("pick_rate5", lambda game_df, counter_info, set_game_ids: pick_rate.fifth_page(
+            match_id, player_name, pick_rate_index(set_game_ids)+4, self.output_dir,
+            game_df=game_df, counter_info=counter_info), ["game_df", "counter_info", "set_game_ids"])
+        graph.add("main", lambda game_df, set_game_ids: self.main_page(
+            match_id, player_name, pick_rate_index(set_game_ids)+4, game_df), ["game_df", "set_game_ids"])
+        graph.run()
         # except Exception as e:
         #     today_date = datetime.today().date().strftime("%y_%m_%d")
         #     output_path = self.output_dir / today_date / match_id
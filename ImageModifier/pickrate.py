@@ -1,12 +1,13 @@
 import os
 import shutil
 
-from PIL import Image, ImageDraw, ImageFont
+from PIL import ImageDraw
 from pathlib import Path
 from datetime import datetime
 from Ai.LangChain.article_generator import ArticleGenerator
 from ImageModifier.image_utils import BaseContentProcessor
 from AnomalyDetection.plt_draw import PltDraw
+from util.task_graph import TaskGraph
 
 
 class PickRate(BaseContentProcessor):
@@ -25,166 +26,126 @@ class PickRate(BaseContentProcessor):
         self.title_font_size = self.properties.get("title_font_size")
         self.black = self.properties.get("black")
         self.tier_color = self.properties.get("tier_color")
-        self.plt_draw = PltDraw(database, self.patch)
+        self.plt_draw = PltDraw(database, self.patch, meta_data.basic_info.get("chart_workers", 0))
         self.article_generator = article_generator
+        self.page_workers = meta_data.basic_info.get("page_workers", 5)
 
-    def first_page(self, match_id, player_name):
-        background_path = self.pick_rate_assets_dir / "1" / "background.png"
-        game_df = self.database.get_game_data(match_id)
+    def first_page(self, match_id, player_name, game_df=None, articles=None):
+        if game_df is None:
+            game_df = self.database.get_game_data(match_id)
         name_us = game_df[game_df['playername'] == player_name]['name_us'].iloc[0]
-        background = Image.open(background_path)
-
-        #선수 얼굴
-        player_path = self.get_player_image_path(player_name)
-        player_image = Image.open(player_path)
-        player_image = self.resize_with_crop_image(player_image, 400, 400)
-        player_image = self.add_bottom_gradient(player_image)
-        background.paste(player_image, (544, 383), player_image)
-
-        #챔피언 얼굴
-        champion_icon = Image.open(self.champion_icon_dir / f"{name_us}.png")
-        champion_icon = self.resize_image(champion_icon, 350,350)
-        champion_icon = self.add_gradient_border(champion_icon)
-        background.paste(champion_icon, (165, 433), champion_icon)
-
-        #그라데이션
-        background = self.add_gradient_box(background, 90, 230, 900, 700, 190, 40)
-
-        #기사 제목
-        text = self.article_generator.generate_first_page_article(game_df, player_name, 15)
-        self.add_first_page_title(background, text, 100, 990)
-        self.add_logo(background)
+        if articles is None:
+            title = self.article_generator.generate_first_page_article(game_df, player_name, self.article_max_chars("first_page"))
+        else:
+            title = self.get_article(articles, "first_page")
+        background = self.template_renderer.render("pick_rate_1", {
+            "player": self.get_player_image_path(player_name),
+            "champion_icon": self.champion_icon_dir / f"{name_us}.png",
+            "title": title
+        })
         self.save_image(background, match_id, "1")
 
-    def second_page(self, match_id, player_name):
-        background_path = self.pick_rate_assets_dir / "2" / "background2.png"
-        table_path = self.pick_rate_assets_dir / "2" / "Table2.png"
-        game_df = self.database.get_game_data(match_id)
+    def second_page(self, match_id, player_name, game_df=None, mvp_score=None, articles=None):
+        if game_df is None:
+            game_df = self.database.get_game_data(match_id)
         win_team = game_df[(game_df['result'] == 1)]
         lose_team = game_df[(game_df['result'] == 0)]
-        background = Image.open(background_path)
-
-        #경기 승리 정보
-        self.draw_result_table(background, win_team, lose_team, (42, 202))
-
-        #경기 스탯 정보 kda, score 등등
-        mvp_score = self.database.calculate_mvp_score(game_df)
-        table = Image.open(table_path)
-        background.paste(table, (42, 326), table)
-        draw = ImageDraw.Draw(background)
-        self.draw_ban_info(background, win_team, lose_team)
-        self.draw_match_result_table(background, win_team, lose_team, draw, mvp_score)
-
-        box_size = (995,472)
-        max_chars = self.calculate_text_max_chars(self.noto_font_bold_kr_path, self.main_font_size, box_size)
-        main_text = self.article_generator.generate_second_page_article(game_df, player_name, max_chars)
-        self.add_main_text(background, main_text, (45, 850), box_size, 45)
-        self.add_logo(background)
+        if mvp_score is None:
+            mvp_score = self.database.calculate_mvp_score(game_df)
+
+        def match_table(background):
+            #경기 스탯 정보 kda, score 등등
+            self.draw_ban_info(background, win_team, lose_team)
+            self.draw_match_result_table(background, win_team, lose_team, ImageDraw.Draw(background), mvp_score)
+
+        if articles is None:
+            main_text = self.article_generator.generate_second_page_article(game_df, player_name, self.article_max_chars("second_page"))
+        else:
+            main_text = self.get_article(articles, "second_page")
+        background = self.template_renderer.render("pick_rate_2", {
+            "result_table": lambda background: self.draw_result_table(background, win_team, lose_team, (42, 202)),
+            "match_table": match_table,
+            "main_text": main_text
+        })
         self.save_image(background, match_id, "2")
 
-    def third_page(self, match_id, player_name, left_save_name="3", right_save_name="4", output_dir=None):
-        game_df = self.database.get_game_data(match_id)
-        left_background = Image.open(self.pick_rate_assets_dir / "3" / "background.png")
-        right_background = Image.open(self.pick_rate_assets_dir / "3" / "background.png")
-
-        # 왼쪽
-        # 방사형 차트
-        radar_chart_path = self.plt_draw.draw_radar_chart(match_id, player_name)
-        radar_chart = Image.open(radar_chart_path)
-        radar_chart = self.resize_image(radar_chart, 800, 630)
-        left_background.paste(radar_chart, (120,209), radar_chart)
-
-        # 텍스트
-        max_chars = self.calculate_text_max_chars(self.noto_font_bold_kr_path, self.main_font_size, (1000, 500))
-        main_text = self.article_generator.generate_third_page_article(game_df, player_name, max_chars)
-        self.add_main_text(left_background, main_text, (76, 850), (1000,500))
-
-        # 오른쪽
-        self.plt_draw.draw_all_series(match_id, player_name)
-        today_date = datetime.today().date().strftime("%y_%m_%d")
-        series_dir = self.plt_dir / "PickRate" / "Series" / today_date
-        gold = Image.open(series_dir / f"{match_id}_{player_name}_goldat.png")
-        exp = Image.open(series_dir / f"{match_id}_{player_name}_xpat.png")
-        gold = self.resize_image(gold, 909, 528)
-        exp = self.resize_image(exp, 909, 528)
-        right_background.paste(gold, (82, 202), gold)
-        right_background.paste(exp, (82, 752), exp)
-        self.add_logo(left_background)
-        self.add_logo(right_background)
+    def third_page(self, match_id, player_name, left_save_name="3", right_save_name="4", output_dir=None, game_df=None, radar_stats=None, articles=None):
+        if game_df is None:
+            game_df = self.database.get_game_data(match_id)
+
+        # 왼쪽 방사형 차트, 텍스트
+        if articles is None:
+            main_text = self.article_generator.generate_third_page_article(game_df, player_name, self.article_max_chars("third_page"), radar_stats)
+        else:
+            main_text = self.get_article(articles, "third_page")
+        left_background = self.template_renderer.render("pick_rate_3_left", {
+            "radar_chart": self.plt_draw.draw_radar_chart(match_id, player_name, radar_stats),
+            "main_text": main_text
+        })
+
+        # 오른쪽 골드, 경험치 그래프
+        series_paths = self.plt_draw.draw_all_series(match_id, player_name)
+        right_background = self.template_renderer.render("pick_rate_3_right", {
+            "gold": series_paths["goldat"],
+            "exp": series_paths["xpat"]
+        })
         self.save_image(left_background, match_id, left_save_name, output_dir)
         self.save_image(right_background, match_id, right_save_name, output_dir)
 
     #챔피언 스탯
-    def fourth_page(self, match_id, player_name, left_save_name="5", right_save_name="6", output_dir=None):
-        game_df = self.database.get_game_data(match_id)
+    def fourth_page(self, match_id, player_name, left_save_name="5", right_save_name="6", output_dir=None, game_df=None, articles=None):
+        if game_df is None:
+            game_df = self.database.get_game_data(match_id)
         player_df = game_df[game_df['playername'] == player_name].iloc[0]
         name_us = player_df['name_us']
-        stat_background = Image.open(self.pick_rate_assets_dir / "4" / "background.png")
-        right_background = Image.open(self.pick_rate_assets_dir / "4" / "background.png")
-
-        # 챔피언 아이콘, 이름
-        champion_icon = Image.open(self.champion_icon_dir / f"{name_us}.png")
-        champion_icon = self.resize_image(champion_icon, 175, 175)
-        champion_icon = self.add_gradient_border(champion_icon, 20)
-        stat_background.paste(champion_icon, (92, 281), champion_icon)
-        champion_name_kr = self.database.get_name_kr(name_us)
         line_dict = {"top":"탑","jungle":"정글","mid":"미드","bottom":"원딜","support":"서포터"}
-        line_kr = line_dict.get(player_df['position'])
-        self.add_text_box(stat_background, champion_name_kr, 296, 281, 77, "#E2E8F0", self.noto_font_regular_path)
-        self.add_text_box(stat_background, line_kr, 296, 381, 50, "#94A3B8", self.noto_font_regular_path)
-
-        # 챔피언 통계 설명 text, 통계 테이블
-        max_chars = self.calculate_text_max_chars(self.noto_font_bold_kr_path, self.main_font_size, (900, 474))
-        main_text = self.article_generator.generate_fourth_page_article(game_df, player_name, max_chars)
-        stat_background = self.add_main_text(stat_background, main_text, (77,806))
+
+        # 챔피언 아이콘, 이름, 챔피언 통계 설명 text, 통계 테이블
+        if articles is None:
+            main_text = self.article_generator.generate_fourth_page_article(game_df, player_name, self.article_max_chars("fourth_page"))
+        else:
+            main_text = self.get_article(articles, "fourth_page")
         champion_stats = self.database.get_champion_rate_table(name_us, self.patch.version, player_df['position'])
-        stat_background = self.draw_pickrate_stat_table(stat_background, champion_stats)
-
-        #오른쪽 픽률 그래프
-        save_path = self.plt_draw.draw_pick_rates_transparent(name_us, player_df['position'])
-        pick_rate_graph = Image.open(save_path)
-        pick_rate_graph = self.resize_image(pick_rate_graph, 920, 920)
-        right_background.paste(pick_rate_graph, (81, 259), pick_rate_graph)
-        self.add_logo(stat_background)
-        self.add_logo(right_background)
+        stat_background = self.template_renderer.render("pick_rate_4_left", {
+            "champion_icon": self.champion_icon_dir / f"{name_us}.png",
+            "champion_name": self.database.get_name_kr(name_us),
+            "line": line_dict.get(player_df['position']),
+            "main_text": main_text,
+            "stat_table": lambda background: self.draw_pickrate_stat_table(background, champion_stats)
+        })
+
+        #오른쪽 픽률 그래프, 같은 챔피언 픽률 그래프는 파일 캐시 경로가 같아서 resize 결과도 재사용
+        right_background = self.template_renderer.render("pick_rate_4_right", {
+            "pick_rate_graph": self.plt_draw.draw_pick_rates_transparent(name_us, player_df['position'])
+        })
         self.save_image(stat_background, match_id, left_save_name, output_dir)
         self.save_image(right_background, match_id, right_save_name, output_dir)
 
-    def fifth_page(self, match_id, player_name, save_name="7", output_dir=None):
-        game_df = self.database.get_game_data(match_id)
+    def fifth_page(self, match_id, player_name, save_name="7", output_dir=None, game_df=None, counter_info=None):
+        if game_df is None:
+            game_df = self.database.get_game_data(match_id)
         player_df = game_df[game_df['playername'] == player_name].iloc[0]
         name_us = player_df['name_us']
         position = player_df['position']
+        if counter_info is None:
+            counter_info = self.database.get_counter_champion(name_us, position, self.patch.version)
 
-        background = Image.open(self.pick_rate_assets_dir / "5" / "background.png")
-        counter_info = self.database.get_counter_champion(name_us, position, self.patch.version)
-
-        table = Image.open(self.pick_rate_assets_dir / "5" / f"table3_3.png")
-        background.paste(table, (38, 58), table)
-        background = self.draw_counter_table(background, player_df, counter_info)
-        
         #텍스트
-        max_chars = self.calculate_text_max_chars(self.noto_font_bold_kr_path, self.main_font_size, (940, 626))
+        max_chars = self.template_renderer.max_chars("pick_rate_5", "main_text")
         result = self.article_generator.generate_fifth_page_article_rag(match_id, player_name, max_chars)
-        recommend = result['recommend']
-        basic_recommend_ment = f'DLK 종합 평가 : '
-        if recommend == "적극 추천":
-            stamp_path = "highly_recommend.png"
-        elif recommend == "추천":
-            stamp_path = "recommend.png"
-        elif recommend == "보류":
-            stamp_path = "on_hold.png"
-        stamp = Image.open(self.pick_rate_assets_dir / "5" / stamp_path)
-        background.paste(stamp, (702, 1061), stamp)
-        self.add_main_text(background, result['text'], (72, 626), (940, 626))
-        self.add_main_text(background, basic_recommend_ment, (408, 1146), (365, 67))
-        self.add_logo(background)
+        stamp_paths = {"적극 추천": "highly_recommend.png", "추천": "recommend.png", "보류": "on_hold.png"}
+        stamp_path = stamp_paths.get(result['recommend'])
+        background = self.template_renderer.render("pick_rate_5", {
+            "counter_table": lambda background: self.draw_counter_table(background, player_df, counter_info),
+            "stamp": self.pick_rate_assets_dir / "5" / stamp_path if stamp_path else None,
+            "main_text": result['text']
+        })
         self.save_image(background, match_id, save_name, output_dir)
 
     def draw_result_table(self, background, win_team, lose_team, position):
-        result_table = Image.open(self.pick_rate_assets_dir / "2" / "result2.png")
+        result_table = self.open_asset(self.pick_rate_assets_dir / "2" / "result2.png")
         result_draw = ImageDraw.Draw(result_table)
-        font = ImageFont.truetype(self.noto_font_bold_path, 18)
+        font = self.get_font(self.noto_font_bold_path, 18)
         win_team_name = win_team['teamname'].iloc[0]
         blue_bbox = font.getbbox(win_team_name)
         blue_text_width = blue_bbox[2] - blue_bbox[0]
@@ -200,8 +161,6 @@ class PickRate(BaseContentProcessor):
 
     def draw_counter_table(self, background, player_df, counter_info):
         layout = {
-            'my_champion_start_x': 125,
-            'my_champion_start_y': 238,
             'start_x': 118,
             'start_y': 282,
             'row_height': 100,
@@ -219,20 +178,11 @@ class PickRate(BaseContentProcessor):
             'positive': '#22C55E',
             'negative': '#EF4444'
         }
-        my_champion_kr = self.database.get_name_kr(player_df['name_us'])
-        position_kr_list = {'top':'탑', 'jungle':'정글', 'mid':'미드', 'bottom':'바텀', 'support':'서포터'}
-        my_position_kr = position_kr_list[player_df['position']]
-        my_champion_icon = Image.open(self.champion_icon_dir / f"{player_df['name_us']}.png")
-        my_champion_icon = self.resize_circle(my_champion_icon, 80, 80)
-        #background.paste(my_champion_icon, (layout['my_champion_start_x'], layout['my_champion_start_y']), my_champion_icon)
-        #self.add_text_box(background, my_champion_kr, layout['my_champion_start_x'] + 120, layout['my_champion_start_y'] - 5, 30, colors['default'], self.noto_font_regular_path)
-        #self.add_text_box(background, my_position_kr, layout['my_champion_start_x'] + 120, layout['my_champion_start_y'] + 40, 25, colors['default'], self.noto_font_regular_path)
         num_counters = min(len(counter_info), 3)
         for i in range(num_counters):
             counter = counter_info.iloc[i]
             current_y = layout['start_y'] + (i * layout['row_height'])
-            champ_icon = Image.open(self.champion_icon_dir / f"{counter['opponent_champ']}.png")
-            champ_icon = self.resize_circle(champ_icon, 68, 68)
+            champ_icon = self.open_circle_icon(self.champion_icon_dir / f"{counter['opponent_champ']}.png", 68, 68)
             background.paste(champ_icon, (layout['start_x'], current_y), champ_icon)
             kda_diff = counter['kda_diff']
             if kda_diff > 0:
@@ -256,9 +206,9 @@ class PickRate(BaseContentProcessor):
 
     def draw_pickrate_stat_table(self, image, stats):
         draw = ImageDraw.Draw(image)
-        table = Image.open(self.pick_rate_assets_dir / "4" / "table.png")
+        table = self.open_asset(self.pick_rate_assets_dir / "4" / "table.png")
         image.paste(table, (91, 545), table)
-        value_font = ImageFont.truetype(self.noto_font_regular_path, 30)
+        value_font = self.get_font(self.noto_font_regular_path, 30)
         value_color = (255,255,255)
         stats_x = 150
         stats_y = 570
@@ -281,10 +231,7 @@ class PickRate(BaseContentProcessor):
         for i, ban in enumerate(blue_bans):
             if ban:
                 try:
-                    ban_icon = Image.open(self.champion_icon_dir / f"{ban}.png")
-                    ban_icon = self.resize_image(ban_icon, 100, 60)
-                    ban_icon = self.add_gradient_border(ban_icon, 10)
-                    ban_icon = self.convert_to_grayscale(ban_icon)
+                    ban_icon = self.open_icon(self.champion_icon_dir / f"{ban}.png", 100, 60, border_size=10, grayscale=True)
                     background.paste(ban_icon, (42 + i * ban_spacing, ban_y))
                 except Exception as e:
                     print(f"블루팀 ban 이미지 처리 중 오류: {e}")
@@ -292,16 +239,13 @@ class PickRate(BaseContentProcessor):
         for i, ban in enumerate(reversed(red_bans)):
             if ban:
                 try:
-                    ban_icon = Image.open(self.champion_icon_dir / f"{ban}.png")
-                    ban_icon = self.resize_image(ban_icon, 100, 60)
-                    ban_icon = self.add_gradient_border(ban_icon, 10)
-                    ban_icon = self.convert_to_grayscale(ban_icon)
+                    ban_icon = self.open_icon(self.champion_icon_dir / f"{ban}.png", 100, 60, border_size=10, grayscale=True)
                     background.paste(ban_icon, (938 - i * ban_spacing, ban_y))
                 except Exception as e:
                     print(f"레드팀 ban 이미지 처리 중 오류: {e}")
 
     def draw_match_result_table(self, background, win_team, lose_team, draw, mvp_score):
-        font = ImageFont.truetype(self.noto_font_bold_kr_path, 20)
+        font = self.get_font(self.noto_font_bold_path, 20)
         positions = ['top', 'jungle', 'mid', 'bottom', 'support']
         row_start_y = 390
         row_height = 91
@@ -320,9 +264,7 @@ class PickRate(BaseContentProcessor):
         for i, position in enumerate(positions):
             current_y = row_start_y + (i * row_height)
             blue_pos_data = win_team[win_team['position'] == position].iloc[0]
-            blue_champion_icon = Image.open(self.champion_icon_dir / f"{blue_pos_data['name_us']}.png")
-            blue_champion_icon = self.resize_image(blue_champion_icon, 100, 60)
-            blue_champion_icon = self.add_gradient_border(blue_champion_icon, 10)
+            blue_champion_icon = self.open_icon(self.champion_icon_dir / f"{blue_pos_data['name_us']}.png", 100, 60, border_size=10)
             background.paste(blue_champion_icon, (left_side['champion'], current_y))
 
             blue_kda = f"{blue_pos_data['kills']} / {blue_pos_data['deaths']} / {blue_pos_data['assists']}"
@@ -335,9 +277,7 @@ class PickRate(BaseContentProcessor):
             draw.text((left_side['damage'], current_y + 20), blue_damage, font=font, fill='white')
 
             red_pos_data = lose_team[lose_team['position'] == position].iloc[0]
-            red_champion_icon = Image.open(self.champion_icon_dir / f"{red_pos_data['name_us']}.png")
-            red_champion_icon = self.resize_image(red_champion_icon, 100, 60)
-            red_champion_icon = self.add_gradient_border(red_champion_icon, 10)
+            red_champion_icon = self.open_icon(self.champion_icon_dir / f"{red_pos_data['name_us']}.png", 100, 60, border_size=10)
             background.paste(red_champion_icon, (right_side['champion'], current_y))
 
             draw.text((right_side['damage'], current_y + 20),
@@ -353,16 +293,72 @@ class PickRate(BaseContentProcessor):
             draw.text((right_side['player'], current_y + 5), str(red_pos_data['playername']), font=font, fill='white')
             draw.text((right_side['player']+10, current_y + 40), f"{red_score:.1f}", font=font, fill='#FFD700')
 
+    def add_shared_inputs(self, graph, match_id, player_name):
+        """
+        여러 페이지가 같이 쓰는 데이터는 그래프 노드로 한번만 계산
+        """
+        def counter_info(game_df):
+            player_df = game_df[game_df['playername'] == player_name].iloc[0]
+            return self.database.get_counter_champion(player_df['name_us'], player_df['position'], self.patch.version)
+
+        graph.add("game_df", lambda: self.database.get_game_data(match_id))
+        graph.add("mvp_score", lambda game_df: self.database.calculate_mvp_score(game_df), ["game_df"])
+        graph.add("counter_info", counter_info, ["game_df"])
+        graph.add("radar_stats", lambda: self.database.get_radar_stats(match_id, player_name))
+        return graph
+
+    def article_max_chars(self, page):
+        if page == "first_page":
+            return 15
+        template_names = {"second_page": "pick_rate_2", "third_page": "pick_rate_3_left", "fourth_page": "pick_rate_4_left"}
+        return self.template_renderer.max_chars(template_names[page], "main_text")
+
+    def add_articles(self, graph, player_name, pages):
+        """
+        pages (first_page ~ fourth_page) 기사를 "articles" 노드에서 article_generator 비동기 API 로 한번에 요청
+        동시 요청 수 제한, 재시도는 article_generator 에서 하고 결과는 page -> 기사 (실패한 page 는 예외 객체)
+        5페이지는 RAG 라서 기존처럼 페이지 노드에서 생성
+        """
+        def articles(game_df, radar_stats):
+            jobs = []
+            for page in pages:
+                kwargs = {"game_df": game_df, "player_name": player_name, "max_chars": self.article_max_chars(page)}
+                if page == "third_page":
+                    kwargs["radar_stats"] = radar_stats
+                jobs.append((page, kwargs))
+            return dict(zip(pages, self.article_generator.generate_page_articles(jobs)))
+
+        graph.add("articles", articles, ["game_df", "radar_stats"])
+        return graph
+
+    @staticmethod
+    def get_article(articles, page):
+        # 실패한 기사는 해당 페이지 노드에서 예외를 올림
+        article = articles[page]
+        if isinstance(article, Exception):
+            raise article
+        return article
+
     def run(self, match_id, player_name):
+        """
+        페이지끼리는 서로 의존하지 않아서 공통 데이터만 먼저 만들고 페이지를 동시에 생성
+        1~4페이지 기사는 articles 노드에서 한번에 비동기로 요청
+        """
         try:
-            self.first_page(match_id, player_name)
-            self.second_page(match_id, player_name)
-            self.third_page(match_id, player_name)
-            self.fourth_page(match_id, player_name)
-            self.fifth_page(match_id, player_name)
+            graph = TaskGraph(self.page_workers, after_task=self.database.release_connection)
+            self.add_shared_inputs(graph, match_id, player_name)
+            self.add_articles(graph, player_name, ["first_page", "second_page", "third_page", "fourth_page"])
+            graph.add("page1", lambda game_df, articles: self.first_page(match_id, player_name, game_df, articles), ["game_df", "articles"])
+            graph.add("page2", lambda game_df, mvp_score, articles: self.second_page(match_id, player_name, game_df, mvp_score, articles), ["game_df", "mvp_score", "articles"])
+            graph.add("page3", lambda game_df, radar_stats, articles: self.third_page(match_id, player_name, game_df=game_df, radar_stats=radar_stats, articles=articles), ["game_df", "radar_stats", "articles"])
+            graph.add("page4", lambda game_df, articles: self.fourth_page(match_id, player_name, game_df=game_df, articles=articles), ["game_df", "articles"])
+            graph.add("page5", lambda game_df, counter_info: self.fifth_page(match_id, player_name, game_df=game_df, counter_info=counter_info), ["game_df", "counter_info"])
+            graph.run()
+            return True
         except Exception as e:
             print(f"픽률 탐지 기사 생성 오류 {match_id}, {player_name}" , e)
             today_date = datetime.today().date().strftime("%y_%m_%d")
             output_path = self.output_dir / today_date / match_id
             if os.path.exists(output_path):
                 shutil.rmtree(output_path)
+            return False
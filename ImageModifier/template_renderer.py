@@ -0,0 +1,141 @@
+from pathlib import Path
+from PIL import Image
+
+"""
+    페이지 템플릿 렌더링 (MyMetaData/page_templates.json)
+    템플릿 : background (Assets 기준 경로) + layers (그리는 순서)
+    - 고정 layer : image(path), gradient_box, main_text(text), logo
+    - slot layer : "slot" 이름이 있는 layer, render 할 때 values[slot] 로 채움 (값이 None 이면 건너뜀)
+      image(경로 또는 PIL 이미지), text, title, main_text, draw(이미지를 받아 그리는 함수)
+    첫 slot 앞의 고정 layer 는 템플릿별로 한번만 합성해서 캐시하고, render 는 그 복사본에서 시작
+    뒤쪽 고정 layer 는 겹치는 순서를 지키려고 slot 사이에서 그리지만 에셋은 캐시된 것을 사용
+"""
+
+ASSETS_DIR = Path(__file__).parent.parent / "Assets"
+
+
+class TemplateRenderer:
+
+    def __init__(self, processor, templates):
+        """
+        processor : 그리기 함수(add_main_text, add_logo 등)와 에셋 캐시를 가진 BaseContentProcessor
+        """
+        self.processor = processor
+        self.templates = templates
+
+    def get_template(self, name):
+        template = self.templates.get(name)
+        if template is None:
+            raise ValueError(f"페이지 템플릿이 없습니다 : {name}")
+        return template
+
+    @staticmethod
+    def split_layers(template):
+        # (미리 합성할 고정 layer, render 때 그릴 layer)
+        layers = template["layers"]
+        for index, layer in enumerate(layers):
+            if "slot" in layer:
+                return layers[:index], layers[index:]
+        return layers, []
+
+    def get_layer(self, name, slot):
+        for layer in self.get_template(name)["layers"]:
+            if layer.get("slot") == slot:
+                return layer
+        raise ValueError(f"{name} 템플릿에 {slot} slot 이 없습니다")
+
+    def asset_path(self, layer):
+        if layer["type"] == "logo":
+            return self.processor.logo_path
+        return ASSETS_DIR / layer["path"]
+
+    def base(self, name):
+        """
+        배경 + 첫 slot 앞 고정 layer 를 합성한 이미지 (복사본)
+        에셋 파일이 바뀌면 수정 시간이 key 에 들어가므로 다시 합성
+        """
+        template = self.get_template(name)
+        static_layers, _ = self.split_layers(template)
+        asset_cache = self.processor.asset_cache
+        asset_paths = [ASSETS_DIR / template["background"]]
+        asset_paths += [self.asset_path(layer) for layer in static_layers if layer["type"] in ("image", "logo")]
+        key = ("template", name) + tuple(asset_cache.file_key(path) for path in asset_paths)
+
+        def build():
+            image = self.processor.open_asset(ASSETS_DIR / template["background"])
+            for layer in static_layers:
+                image = self.draw_layer(image, layer, {})
+            return image
+        return asset_cache.get_cached(key, build).copy()
+
+    def render(self, name, values):
+        """
+        values : slot 이름 -> 값
+        반환 : 완성된 페이지 이미지
+        """
+        _, layers = self.split_layers(self.get_template(name))
+        image = self.base(name)
+        for layer in layers:
+            image = self.draw_layer(image, layer, values)
+        return image
+
+    def max_chars(self, name, slot):
+        # 본문 slot 에 들어갈 기사 글자 수 (max_chars_box 가 있으면 그 크기로 계산)
+        layer = self.get_layer(name, slot)
+        box_size = layer.get("max_chars_box", layer["box_size"])
+        processor = self.processor
+        return processor.calculate_text_max_chars(processor.noto_font_bold_path, processor.main_font_size, tuple(box_size))
+
+    def draw_layer(self, image, layer, values):
+        processor = self.processor
+        layer_type = layer["type"]
+        if "slot" in layer:
+            value = values.get(layer["slot"])
+            if value is None:
+                return image
+        else:
+            value = layer.get("text")
+
+        if layer_type == "image":
+            self.paste_image(image, layer, value)
+        elif layer_type == "text":
+            x, y = layer["position"]
+            color = layer["color"]
+            if isinstance(color, list):
+                color = tuple(color)
+            font_path = getattr(processor, f"{layer['font']}_path")
+            processor.add_text_box(image, value, x, y, layer["font_size"], color, font_path)
+        elif layer_type == "title":
+            processor.add_first_page_title(image, value, *layer.get("position", []))
+        elif layer_type == "main_text":
+            processor.add_main_text(image, value, tuple(layer["position"]), tuple(layer["box_size"]), layer.get("font_size", 50))
+        elif layer_type == "gradient_box":
+            image = processor.add_gradient_box(image, *layer["box"], layer["max_alpha"], layer["min_alpha"])
+        elif layer_type == "logo":
+            processor.add_logo(image)
+        elif layer_type == "draw":
+            result = value(image)
+            if result is not None:
+                image = result
+        else:
+            raise ValueError(f"알 수 없는 layer 종류 : {layer_type}")
+        return image
+
+    def paste_image(self, image, layer, value):
+        """
+        value : PIL 이미지면 그대로, 경로면 size 가 있을 때 resize(테두리, 흑백 포함) 결과를 캐시에서 가져옴
+        """
+        processor = self.processor
+        if isinstance(value, Image.Image):
+            source = value
+        else:
+            path = value if "slot" in layer else self.asset_path(layer)
+            if "size" in layer:
+                width, height = layer["size"]
+                source = processor.open_icon(path, width, height, layer.get("border_size"), layer.get("grayscale", False))
+            else:
+                source = processor.open_asset(path)
+        if "bottom_gradient" in layer:
+            source = processor.add_bottom_gradient(source, layer["bottom_gradient"])
+        mask = source if layer.get("mask", True) else None
+        image.paste(source, tuple(layer["position"]), mask)
@@ -0,0 +1,233 @@
+import math
+import re as regex
+from PIL import Image, ImageColor, ImageDraw
+
+"""
+    기사 이미지 텍스트 배치
+    문자열 폭은 GlyphMetrics 의 글자 advance 합으로 계산하고, 같은 색이 이어지는 구간은 한번에 그림
+    본문 글자는 폰트별로 래스터화한 mask 를 캐시해서 붙여넣음 (같은 글자를 다시 래스터화하지 않음)
+    외곽선은 글자를 여러번 겹쳐 그리지 않고 PIL stroke_width 로 그림
+"""
+
+ZERO_WIDTH_SPACE = "\u200b"
+BULLET = "ㆍ"
+# 글자 시작 위치 소수점은 1/4 px 단위로 맞춰서 mask 재사용 (위치 오차 최대 1/8 px)
+GLYPH_SUBPIXEL = 4
+MAX_GLYPHS = 20000
+# 폰트를 처음 쓸 때 미리 채우는 글자 (나머지 글자는 처음 나올 때 추가)
+HANGUL_SAMPLE_CHARS = "가나다라마바사아자차카타파하"
+PRELOAD_CHARS = "".join(chr(code) for code in range(0x20, 0x7f)) + HANGUL_SAMPLE_CHARS + BULLET
+
+
+class GlyphMetrics:
+    """
+    폰트 하나(경로, 크기)의 글자별 advance 표
+    문자열 폭은 글자 advance 합 (커닝 없음, 힌팅된 advance 라 px 단위)
+    width : draw.textlength 와 같은 advance 폭
+    box_width : 'word ' 처럼 공백으로 끝나는 문자열의 draw.textbbox((0, 0), text) 폭
+    glyph : 글자 mask, offset (draw.text 가 그리는 것과 같은 mask)
+    """
+
+    def __init__(self, font):
+        self.font = font
+        self.advances = {}
+        self.left_bearings = {}
+        self.glyphs = {}
+        for char in PRELOAD_CHARS:
+            self.advance(char)
+
+    def advance(self, char):
+        advance = self.advances.get(char)
+        if advance is None:
+            advance = self.font.getlength(char)
+            self.advances[char] = advance
+        return advance
+
+    def width(self, text):
+        advances = self.advances
+        total = 0
+        for char in text:
+            advance = advances.get(char)
+            total += advance if advance is not None else self.advance(char)
+        return total
+
+    def left_bearing(self, char):
+        bearing = self.left_bearings.get(char)
+        if bearing is None:
+            bearing = self.font.getbbox(char)[0]
+            self.left_bearings[char] = bearing
+        return bearing
+
+    def box_width(self, text):
+        # bbox 는 첫 글자 왼쪽 여백부터 시작하고 끝 공백의 advance 까지 포함
+        if not text:
+            return 0
+        return self.width(text) - self.left_bearing(text[0])
+
+    def average_width(self, chars):
+        return self.width(chars) / len(chars)
+
+    def glyph(self, char, subpixel):
+        key = (char, subpixel)
+        glyph = self.glyphs.get(key)
+        if glyph is None:
+            if len(self.glyphs) >= MAX_GLYPHS:
+                self.glyphs.clear()
+            mask, offset = self.font.getmask2(char, "L", start=(subpixel / GLYPH_SUBPIXEL, 0))
+            mask_image = Image.Image()._new(mask) if mask.size[0] and mask.size[1] else None
+            glyph = (mask_image, offset)
+            self.glyphs[key] = glyph
+        return glyph
+
+
+def wrap_main_words(words, metrics, box_width):
+    """
+    본문 줄바꿈, 'ㆍ' 는 새 줄에서 시작하고 zero width space 는 줄만 바꿈
+    (줄바꿈 후에도 이전 줄 폭이 이어지는 기존 동작 그대로)
+    """
+    lines = []
+    current_line = []
+    current_width = 0
+    is_first_word = True
+    for word in words:
+        word_width = metrics.width(word + " ")
+        if (not is_first_word and (word == BULLET or word == ZERO_WIDTH_SPACE)) or (current_width + word_width > box_width):
+            if word == ZERO_WIDTH_SPACE:
+                lines.append(" ".join(current_line))
+                current_line = []
+                continue
+            lines.append(" ".join(current_line))
+            current_line = [word]
+            current_width = word_width
+        else:
+            current_line.append(word)
+            current_width += word_width
+        is_first_word = False
+    if current_line:
+        lines.append(" ".join(current_line))
+    return lines
+
+
+def color_spans(line, metrics, color_of):
+    """
+    한 줄을 같은 색 구간으로 묶음
+    반환 : [(줄 시작 기준 x, 구간 문자열, 색)], x 는 글자별 폭을 더한 기존 위치와 같음
+    """
+    spans = []
+    span_x = 0
+    span_text = ""
+    span_color = None
+    current_x = 0
+    for word in line.split():
+        for char in word:
+            color = color_of(char)
+            if color != span_color:
+                if span_text.strip():
+                    spans.append((span_x, span_text, span_color))
+                span_x, span_text, span_color = current_x, "", color
+            span_text += char
+            current_x += metrics.advance(char)
+        # 공백은 색이 없으므로 현재 구간에 붙임
+        span_text += " "
+        current_x += metrics.advance(" ")
+    if span_text.strip():
+        spans.append((span_x, span_text, span_color))
+    return spans
+
+
+def draw_span(image, xy, text, metrics, fill):
+    """
+    글자별 위치(앞 글자 폭의 합)에 캐시된 mask 로 fill 색을 붙여넣음
+    RGB, RGBA 가 아닌 이미지는 draw.text 로 그림
+    """
+    if image.mode not in ("RGB", "RGBA"):
+        ImageDraw.Draw(image).text(xy, text, font=metrics.font, fill=fill)
+        return
+    ink = ImageColor.getcolor(fill, image.mode) if isinstance(fill, str) else tuple(fill)
+    if image.mode == "RGBA" and len(ink) == 3:
+        ink = ink + (255,)
+    x, y = xy
+    y = int(y)
+    for char in text:
+        if not char.isspace():
+            base_x = math.floor(x)
+            subpixel = round((x - base_x) * GLYPH_SUBPIXEL)
+            if subpixel == GLYPH_SUBPIXEL:
+                base_x, subpixel = base_x + 1, 0
+            mask, offset = metrics.glyph(char, subpixel)
+            if mask is not None:
+                image.paste(ink, (base_x + offset[0], y + offset[1]), mask)
+        x += metrics.advance(char)
+
+
+def split_highlight_words(text):
+    """
+    ^ ^ 사이 단어는 강조
+    반환 : [(단어, 강조 여부)]
+    """
+    parts = regex.split(r'\^(.*?)\^', text)
+    words = []
+    for i, part in enumerate(parts):
+        if not part:
+            continue
+        for word in part.split():
+            words.append((word, i % 2 == 1))
+    return words
+
+
+def fit_font_size(fits, max_size, min_size, step=10):
+    """
+    max_size 부터 step 씩 줄인 크기 중 fits(size) 가 참인 가장 큰 크기, 없으면 min_size
+    폭은 크기에 따라 단조 증가라서 이분 탐색으로 측정 횟수를 줄임
+    """
+    sizes = list(range(max_size, min_size - 1, -step))
+    low, high = 0, len(sizes)
+    while low < high:
+        mid = (low + high) // 2
+        if fits(sizes[mid]):
+            high = mid
+        else:
+            low = mid + 1
+    return sizes[low] if low < len(sizes) else min_size
+
+
+def wrap_title_words(words, metrics, box_width):
+    """
+    제목 줄바꿈, 단어 폭은 'word ' 의 bbox 폭
+    """
+    current_x = 0
+    current_line = []
+    lines = []
+    for word, is_highlighted in words:
+        word_width = metrics.box_width(word + " ")
+        if current_x + word_width > box_width:
+            if len(current_line) == 0:
+                current_line.append((word, is_highlighted))
+                lines.append(current_line)
+                current_line = []
+                current_x = 0
+            else:
+                lines.append(current_line)
+                current_line = [(word, is_highlighted)]
+                current_x = word_width
+                continue
+        else:
+            current_line.append((word, is_highlighted))
+            current_x += word_width
+    if current_line:
+        lines.append(current_line)
+    return lines
+
+
+def draw_outlined_text(image, xy, text, metrics, fill, outline_thickness, outline_color='black', shadow_offset=None, shadow_color='#2B2B2B'):
+    """
+    그림자(2번) -> stroke 외곽선 -> 본문 순서로 그림, 그림자와 본문은 캐시된 글자 mask 사용
+    """
+    x, y = xy
+    if shadow_offset is not None:
+        for i in range(2):
+            offset = shadow_offset + i
+            draw_span(image, (x + offset, y + offset), text, metrics, shadow_color)
+    ImageDraw.Draw(image).text((x, y), text, font=metrics.font, fill=outline_color,
+                               stroke_width=outline_thickness, stroke_fill=outline_color)
+    draw_span(image, (x, y), text, metrics, fill)
@@ -9,6 +9,7 @@ class MetaData:
         self.prompt = None
         self.key = None
         self.image_modifier_info = None
+        self.page_templates = None
         self.config_dir = Path(__file__).parent
         self.load_all_json()
 
@@ -23,4 +24,5 @@ class MetaData:
         self.prompt = self.load_json('prompt.json')
         self.key = self.load_json('key.json')
         self.image_modifier_info = self.load_json('image_modifier_info.json')
+        self.page_templates = self.load_json('page_templates.json')
 
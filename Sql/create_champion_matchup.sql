@@ -0,0 +1,34 @@
+create table champion_matchup(
+	seq int auto_increment primary key,
+    game_year int not null,
+    patch decimal(4,2) not null,
+    position varchar(20) not null,
+    name_us varchar(50) not null,
+    opponent_name_us varchar(50) not null,
+    games int default 0,
+    wins int default 0,
+    gold_diff_15_sum double default 0,
+    gold_diff_15_count int default 0,
+    xp_diff_15_sum double default 0,
+    xp_diff_15_count int default 0,
+    kda_sum double default 0,
+    kda_count int default 0,
+    opponent_kda_sum double default 0,
+    opponent_kda_count int default 0,
+    updated_at datetime,
+    unique key unique_matchup (game_year, patch, position, name_us, opponent_name_us)
+);
+
+create table champion_matchup_game(
+    game_year int not null,
+    gameid varchar(100) not null,
+    created_at datetime,
+    primary key (game_year, gameid)
+);
+
+create index idx_oracle_elixir_2025_gameid on oracle_elixir_2025 (gameid);
+
+drop table champion_matchup;
+drop table champion_matchup_game;
+select * from champion_matchup where patch = 25.02 and position = 'top' and name_us = 'Aatrox' order by games desc;
+select count(*) from champion_matchup_game;
@@ -0,0 +1,16 @@
+create table match_anomaly_score(
+	seq int auto_increment primary key,
+    gameid varchar(100) not null,
+    teamname varchar(100) not null,
+    patch decimal(4,2),
+    game_date datetime,
+    anomaly_score decimal(6,4),
+    is_outlier boolean,
+    model_version varchar(64),
+    updated_at datetime default current_timestamp on update current_timestamp,
+    unique key unique_game_team (gameid, teamname),
+    index idx_outlier_date (is_outlier, game_date)
+);
+drop table match_anomaly_score;
+select * from match_anomaly_score where is_outlier = true order by game_date desc;
+select model_version, count(*) from match_anomaly_score group by model_version;
@@ -0,0 +1,17 @@
+create table oracle_elixir_sync(
+	seq int auto_increment primary key,
+    source varchar(255) not null,
+    game_year int not null,
+    etag varchar(255),
+    file_size bigint,
+    sync_from_date datetime,
+    last_game_date datetime,
+    last_gameid varchar(100),
+    committed_rows bigint default 0,
+    last_chunk_index int default -1,
+    status varchar(20),
+    updated_at datetime,
+    unique key unique_source (source, game_year)
+);
+drop table oracle_elixir_sync;
+select * from oracle_elixir_sync;
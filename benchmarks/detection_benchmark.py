@@ -0,0 +1,168 @@
+import random
+import time
+import types
+import numpy as np
+import pandas as pd
+from Db.mysql_db import Database
+from AnomalyDetection.detection_engine import DetectionEngine
+
+"""
+    픽률 / 라인 미스매치 탐지 벤치마크
+    가상의 시즌 데이터(기본 5000 경기 = 50000 row) 로 예전 row 루프 방식과 DetectionEngine 결과가 같은지 확인하고 시간 비교
+    python -m benchmarks.detection_benchmark (프로젝트 루트에서 실행)
+"""
+
+POSITIONS = ['top', 'jungle', 'mid', 'bottom', 'support']
+
+
+class SyntheticDatabase:
+    """
+    MySQL 대신 메모리 데이터를 돌려주는 Database, 챔피언 테이블 가공은 Database 메서드를 그대로 씀
+    """
+    get_champion_position_table = Database.get_champion_position_table
+    get_all_position_pick_rate = Database.get_all_position_pick_rate
+    get_all_champion_list = Database.get_all_champion_list
+
+    def __init__(self, games, champion_tables):
+        self.games = games
+        self.champion_tables = champion_tables
+        self.query_count = 0
+
+    def read_sql(self, query, params=None):
+        # 5개 라인 union 쿼리
+        self.query_count += 1
+        frames = [df.assign(position=position)[['position', 'name_us', 'name_kr', 'pick_rate']] for position, df in self.champion_tables.items()]
+        return pd.concat(frames, ignore_index=True)
+
+    def get_day_player_rows(self, game_date=None):
+        return self.games
+
+    def get_all_data_without_team(self, patch, game_date=None):
+        return self.games[self.games['result'] == 1].reset_index(drop=True)
+
+    def get_only_bottom_champion(self, patch):
+        return []
+
+
+def make_synthetic_season(game_count=5000, champion_count=160, seed=42):
+    rng = random.Random(seed)
+    np_rng = np.random.default_rng(seed)
+    champions = [f"Champion{i}" for i in range(champion_count)]
+    champion_tables = {}
+    for position in POSITIONS:
+        names = rng.sample(champions, 60)
+        champion_tables[position] = pd.DataFrame({
+            'name_us': names,
+            'name_kr': [f"{name}_kr" for name in names],
+            'pick_rate': np.round(np_rng.random(len(names)) * 30, 2)
+        })
+    rows = []
+    for game in range(game_count):
+        blue_result = rng.randint(0, 1)
+        for side, result in (('Blue', blue_result), ('Red', 1 - blue_result)):
+            for position in POSITIONS:
+                # 대부분 라인 챔피언, 일부는 다른 라인 챔피언
+                if rng.random() < 0.9:
+                    name_us = rng.choice(champion_tables[position]['name_us'].tolist())
+                else:
+                    name_us = rng.choice(champions)
+                rows.append({
+                    'gameid': f"SYN_{game:06d}", 'side': side, 'result': result, 'position': position,
+                    'name_us': name_us, 'playername': f"{side}_{position}_{game}", 'teamname': f"{side}_team_{game % 20}",
+                    'league': 'LCK', 'game': 1, 'patch': 15.02, 'pentakills': 0
+                })
+    games = pd.DataFrame(rows).sort_values(['gameid', 'side']).reset_index(drop=True)
+    return games, champion_tables
+
+
+# 예전 방식 (row 루프 + 라인별 dict)
+def legacy_position_pick_rate(champion_tables):
+    position_champions = {}
+    for position in POSITIONS:
+        df = champion_tables[position]
+        thresh_hold = np.percentile(df['pick_rate'], 10)
+        champions_dict = {row['name_us']: {
+            'pick_rate': row['pick_rate'],
+            'name_kr': row['name_kr']
+        } for _, row in df.iterrows()}
+        position_champions[position] = {
+            'name_us_list': champions_dict,
+            'low_pickrate_threshold': thresh_hold,
+            'low_pickrate_champions': df[df['pick_rate'] <= thresh_hold]['name_us'].tolist()
+        }
+    return position_champions
+
+
+def legacy_pick_rate(match_info, champion_tables):
+    position_champions = legacy_position_pick_rate(champion_tables)
+    unusual_picks = []
+    for index, row in match_info.iterrows():
+        position = row['position'].lower()
+        name_us = row['name_us']
+        champion = position_champions[position]['name_us_list'].get(name_us, None)
+        if champion is None or row['result'] == 0:
+            continue
+        if name_us in position_champions[position]['low_pickrate_champions']:
+            unusual_picks.append({
+                'gameid': row['gameid'],
+                'league': row['league'],
+                'set': row['game'],
+                'result': row['result'],
+                'playername': row['playername'],
+                'team': row['teamname'],
+                'position': position,
+                'name_us': name_us,
+                'name_kr': champion.get("name_kr"),
+                'pick_rate': champion.get("pick_rate"),
+                'issue_type': [f'낮은 픽률 {champion.get("pick_rate")}']
+            })
+    return unusual_picks
+
+
+def legacy_unmatch_line(match_info, champion_tables):
+    champion_dict_by_line = {position: champion_tables[position]['name_us'].tolist() for position in POSITIONS}
+    off_position_picks = []
+    for index, row in match_info.iterrows():
+        line = row['position'].lower()
+        name_us = row['name_us']
+        if name_us not in champion_dict_by_line[line]:
+            off_position_picks.append({
+                'gameid': row['gameid'],
+                'playername': row['playername'],
+                'team': row['teamname'],
+                'line': line,
+                'name_us': name_us
+            })
+    return off_position_picks
+
+
+def strip_detection_type(results, detection_type):
+    return [{key: value for key, value in result.items() if key != 'detection_type'}
+            for result in results if result['detection_type'] == detection_type]
+
+
+def run(game_count=5000):
+    games, champion_tables = make_synthetic_season(game_count)
+    database = SyntheticDatabase(games, champion_tables)
+    patch = types.SimpleNamespace(version="15.02")
+    print(f"가상 시즌 row 수 : {len(games)}")
+
+    match_info = database.get_all_data_without_team(patch.version)
+    start = time.perf_counter()
+    legacy_pick = legacy_pick_rate(match_info, champion_tables)
+    legacy_unmatch = legacy_unmatch_line(match_info, champion_tables)
+    legacy_time = time.perf_counter() - start
+
+    engine = DetectionEngine(database, patch)
+    start = time.perf_counter()
+    results = engine.run(detection_types=["pick_rate", "unmatch_line"])
+    engine_time = time.perf_counter() - start
+
+    assert strip_detection_type(results, "pick_rate") == legacy_pick, "pick_rate 결과 불일치"
+    assert strip_detection_type(results, "unmatch_line") == legacy_unmatch, "unmatch_line 결과 불일치"
+    print(f"pick_rate {len(legacy_pick)}건, unmatch_line {len(legacy_unmatch)}건 결과 동일")
+    print(f"row 루프 : {legacy_time:.3f}s, DetectionEngine : {engine_time:.3f}s (x{legacy_time / engine_time:.1f}), 챔피언 테이블 쿼리 {database.query_count}회")
+
+
+if __name__ == "__main__":
+    run()
@@ -19,6 +19,7 @@ from Aws.s3 import S3Manager
 from Slack.SlackClient import SlackClient
 from Instagram.instagram_uploader import InstagramUploader
 from MyMetaData.patch_version import Patch
+from util.article_executor import ArticleExecutor
 
 class Main:
 
@@ -28,35 +29,46 @@ class Main:
         self.meta_data = meta_data
         self.logger = logger
         self.patch = Patch(database, meta_data)
-        self.oracle_elixirs_downloader = OracleElixirDownloader(database)
+        self.oracle_elixirs_downloader = OracleElixirDownloader(database, meta_data.basic_info.get("oracle_elixir_source"))
         self.champion_score = ChampionScore(database)
         self.detection = ChampionDetection(database, meta_data, self.patch)
         self.image_download = ImageDownload(database)
         self.article_generator = ArticleGenerator(database, mongo, meta_data, self.patch)
-        self.match_result = MatchResult(database, meta_data, self.article_generator)
-        self.interview = Interview(database, mongo, meta_data, self.article_generator)
         self.pick_rate = PickRate(database, meta_data, self.article_generator, self.patch)
+        self.match_result = MatchResult(database, meta_data, self.article_generator, self.pick_rate)
+        self.interview = Interview(database, mongo, meta_data, self.article_generator)
+        self.article_executor = ArticleExecutor(database, logger, meta_data.basic_info.get("article_workers", 4))
         self.you_tube = LCKOfficial(meta_data, mongo)
         self.s3_manager = S3Manager()
         self.slack_client = SlackClient(database, meta_data.account_info, self.s3_manager, logger)
         self.instagram_uploader = InstagramUploader(meta_data.account_info, logger)
         self.champion_info_downloader = ChampionInfo(database)
 
+    # 그래프 렌더링 프로세스 정리 (daily_work 가 중간에 실패해도 호출되도록 실행하는 쪽 finally 에서 호출)
+    def close(self):
+        self.pick_rate.plt_draw.close()
 
     # 1. oracle_elixirs 업데이트
     # 2. 패치 버전 업데이트 확인
     # 3. ps 챔피언 티어 업데이트
-    # 4. 이상치 탐색 글 작성
-    # 5. 유튜브 영상 다운로드
-    # 6. 인터뷰 글 작성
-    # 7. slack 전송
+    # 4. 새 경기 이상치 점수 저장
+    # 5. 이상치 탐색 글 작성
+    # 6. 유튜브 영상 다운로드
+    # 7. 인터뷰 글 작성
+    # 8. slack 전송
     def daily_work(self):
         self.patch.set_patch_version()
         self.oracle_elixirs_downloader.update_oracle_elixirs()
         self.database.update_patch_url_number()
         self.champion_score.update_score()
+        self.detection.score_match_info()
         self.run_pick_rate()
         self.run_match_result()
+        self.logger.info(f"경기 데이터 캐시 : {self.database.get_game_cache_stats()}")
+        self.logger.info(f"LLM 응답 캐시 : {self.article_generator.llm_cache.get_stats()}")
+        self.logger.info(f"그래프 캐시 : {self.pick_rate.plt_draw.chart_cache.get_stats()}")
+        self.pick_rate.plt_draw.close()
+        self.logger.info(f"이미지 에셋 캐시 : {self.pick_rate.asset_cache.get_stats()}")
         self.you_tube.download_videos_by_date()
         self.interview.run()
         self.s3_manager.upload_today_folders()
@@ -70,27 +82,38 @@ class Main:
         self.image_download.run_team()
         self.database.match_team_name()
         self.champion_info_downloader.update_champion_info()
+        self.database.champion_registry.refresh()
 
     def run_pick_rate(self):
         pick_rate_list = self.detection.run_pick_rate()
         print(f"픽률 탐지 개수 : {len(pick_rate_list)}")
-        for pick_rate_info in pick_rate_list:
-            self.pick_rate.run(pick_rate_info['gameid'], pick_rate_info['playername'])
+        # 탐지된 경기 MVP 점수를 한번에 계산해서 캐시
+        self.database.score_games([pick_rate_info['gameid'] for pick_rate_info in pick_rate_list])
+        self.article_executor.run(
+            "pick_rate",
+            pick_rate_list,
+            lambda pick_rate_info: self.pick_rate.run(pick_rate_info['gameid'], pick_rate_info['playername']),
+            self.pick_rate.output_dir
+        )
 
     # detection_type -> general, penta_kill, unmatch_line, two_bottom_choice
     def run_match_result(self):
         unmatch_line_list = self.detection.run_unmatch_line()
         print(f"unmatch_line_list 탐지 개수 : {len(unmatch_line_list)}")
-        for unmatch_line in unmatch_line_list:
-            self.match_result.run(unmatch_line['gameid'], unmatch_line['playername'], "unmatch_line")
         two_bottom_choice_list = self.detection.run_two_bottom_choice()
         print(f"two_bottom_choice_list 탐지 개수 : {len(two_bottom_choice_list)}")
-        for two_bottom_choice in two_bottom_choice_list:
-            self.match_result.run(two_bottom_choice['gameid'], two_bottom_choice['playername'], "two_bottom_choice")
         penta_kill_list = self.detection.run_penta_kill()
         print(f"penta_kill_list 탐지 개수 : {len(penta_kill_list)}")
-        for penta_kill in penta_kill_list:
-            self.match_result.run(penta_kill['gameid'], penta_kill['playername'], "penta_kill")
+        # 탐지 결과에 detection_type 이 들어있음
+        detections = unmatch_line_list + two_bottom_choice_list + penta_kill_list
+        # 탐지된 경기 MVP 점수를 한번에 계산해서 캐시
+        self.database.score_games([info['gameid'] for info in detections])
+        self.article_executor.run(
+            "match_result",
+            detections,
+            lambda info: self.match_result.run(info['gameid'], info['playername'], info['detection_type']),
+            self.match_result.output_dir
+        )
 
     def run_player_image(self):
         self.image_download.run_player()
@@ -136,4 +159,7 @@ if __name__ == "__main__":
     database = Database(meta_data.db_info["mysql"], meta_data, logger=logger)
     mongo = MongoDB(meta_data.db_info["mongo_atlas"])
     main = Main(database, mongo, meta_data, logger)
-    main.daily_work()
+    try:
+        main.daily_work()
+    finally:
+        main.close()
@@ -73,6 +73,7 @@ class JobExecutor:
             mysql_logger = self.log_manager.get_logger("mysql_logger", LogType.PROGRAM)
             mysql = Database(self.meta_data.db_info["mysql"], self.meta_data, logger=mysql_logger)
             mongo = MongoDB(self.meta_data.db_info["mongo_atlas"])
+            lol_main = None
             try:
                 lol_main = Main(mysql, mongo, self.meta_data, daily_work_logger)
                 lol_main.daily_work()
@@ -87,6 +88,9 @@ class JobExecutor:
                 duration = (end_time - start_time).total_seconds()
                 formatted_duration = self.format_duration(duration)
                 self.job_db.update_job_status(job_id, status, duration, formatted_duration, end_time, error_msg)
+                # 작업마다 Main 을 새로 만들므로 그래프 렌더링 프로세스가 남지 않게 정리
+                if lol_main is not None:
+                    lol_main.close()
                 mysql.close()
 
         except Exception as e:
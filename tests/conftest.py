@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# 프로젝트 루트 기준 import (Ai, Db, ImageModifier ...)
+sys.path.insert(0, str(Path(__file__).parent.parent))
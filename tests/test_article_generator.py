@@ -0,0 +1,174 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("langchain")
+pytest.importorskip("langchain_openai")
+pytest.importorskip("langchain_mongodb")
+pytest.importorskip("langgraph")
+from langchain_core.language_models import FakeListChatModel
+from langchain_core.output_parsers.json import JsonOutputParser
+from langchain_core.prompts import PromptTemplate
+from langchain_core.runnables import RunnableLambda
+
+from Ai.LangChain import article_generator as article_generator_module
+from Ai.LangChain.article_generator import ArticleGenerator
+
+
+class FakeDatabase:
+    def __init__(self):
+        self.released = 0
+
+    def release_connection(self):
+        self.released += 1
+
+    def release_idle_connection(self):
+        pass
+
+
+def make_generator(chain, concurrency=2, max_retries=3, backoff_seconds=1.0):
+    # LangGraph / ChatOpenAI / Mongo 없이 비동기 호출 경로만 쓰는 ArticleGenerator
+    generator = ArticleGenerator.__new__(ArticleGenerator)
+    generator.database = FakeDatabase()
+    generator.pick_rate_type = "long"
+    generator.llm_concurrency = concurrency
+    generator.llm_max_retries = max_retries
+    generator.llm_backoff_seconds = backoff_seconds
+    generator.llm_slots = threading.BoundedSemaphore(concurrency)
+    generator.chains = {"first_page": chain}
+    generator.build_first_page_input = lambda game_df, player_name, max_chars: {"player_name": player_name}
+    return generator
+
+
+def make_chain(model):
+    return PromptTemplate.from_template("{player_name}") | model | JsonOutputParser()
+
+
+def test_page_articles_respect_concurrency_limit():
+    fake_llm = FakeListChatModel(responses=['{"title": "제목"}'])
+    state = {"active": 0, "peak": 0}
+
+    async def tracked(prompt):
+        state["active"] += 1
+        state["peak"] = max(state["peak"], state["active"])
+        try:
+            await asyncio.sleep(0.01)
+            return await fake_llm.ainvoke(prompt)
+        finally:
+            state["active"] -= 1
+
+    generator = make_generator(make_chain(RunnableLambda(tracked)), concurrency=2)
+    jobs = [("first_page", {"game_df": None, "player_name": f"player{i}", "max_chars": 15, "use_cache": False}) for i in range(6)]
+    results = generator.generate_page_articles(jobs)
+
+    assert results == ["제목"] * 6
+    assert state["peak"] == 2
+    # 입력 생성 스레드마다 DB 커넥션 반납
+    assert generator.database.released == 6
+
+
+def test_ainvoke_chain_retries_with_exponential_backoff(monkeypatch):
+    fake_llm = FakeListChatModel(responses=['{"title": "제목"}'])
+    calls = {"count": 0}
+    delays = []
+
+    async def flaky(prompt):
+        calls["count"] += 1
+        if calls["count"] <= 2:
+            raise RuntimeError("rate limit")
+        return await fake_llm.ainvoke(prompt)
+
+    async def fake_sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr(article_generator_module.random, "uniform", lambda low, high: 0)
+    monkeypatch.setattr(article_generator_module.asyncio, "sleep", fake_sleep)
+    generator = make_generator(make_chain(RunnableLambda(flaky)), max_retries=3, backoff_seconds=1.0)
+    result = asyncio.run(generator.ainvoke_chain("first_page", {"player_name": "player"}, use_cache=False))
+
+    assert result == {"title": "제목"}
+    assert calls["count"] == 3
+    assert delays == [1.0, 2.0]
+
+
+def test_ainvoke_chain_raises_after_max_retries(monkeypatch):
+    calls = {"count": 0}
+
+    async def failing(prompt):
+        calls["count"] += 1
+        raise RuntimeError("rate limit")
+
+    async def fake_sleep(delay):
+        pass
+
+    monkeypatch.setattr(article_generator_module.asyncio, "sleep", fake_sleep)
+    generator = make_generator(make_chain(RunnableLambda(failing)), max_retries=2)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(generator.ainvoke_chain("first_page", {"player_name": "player"}, use_cache=False))
+    assert calls["count"] == 3
+
+
+class ConcurrencyTracker:
+    # 스레드 / 이벤트 루프가 달라도 동시에 열린 요청 수를 셈
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+
+    def enter(self):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+
+    def exit(self):
+        with self.lock:
+            self.active -= 1
+
+
+def run_in_threads(targets):
+    threads = [threading.Thread(target=target) for target in targets]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def test_concurrency_limit_is_shared_across_threads():
+    fake_llm = FakeListChatModel(responses=['{"title": "제목"}'])
+    tracker = ConcurrencyTracker()
+
+    async def tracked(prompt):
+        tracker.enter()
+        try:
+            await asyncio.sleep(0.02)
+            return await fake_llm.ainvoke(prompt)
+        finally:
+            tracker.exit()
+
+    def tracked_sync(prompt):
+        tracker.enter()
+        try:
+            time.sleep(0.02)
+            return fake_llm.invoke(prompt)
+        finally:
+            tracker.exit()
+
+    generator = make_generator(make_chain(RunnableLambda(tracked_sync, afunc=tracked)), concurrency=3)
+    results = []
+
+    def article_worker(worker):
+        # 기사 하나의 articles 노드처럼 자기 이벤트 루프에서 페이지 프롬프트를 한번에 보냄
+        jobs = [("first_page", {"game_df": None, "player_name": f"player{worker}_{i}", "max_chars": 15, "use_cache": False}) for i in range(4)]
+        results.extend(generator.generate_page_articles(jobs))
+
+    def page_worker(worker):
+        # 5페이지처럼 동기 invoke_chain 으로 보내는 요청도 같은 제한을 받음
+        results.append(generator.invoke_chain("first_page", {"player_name": f"sync{worker}"}, use_cache=False)["title"])
+
+    run_in_threads([lambda w=w: article_worker(w) for w in range(2)] + [lambda w=w: page_worker(w) for w in range(2)])
+
+    assert results.count("제목") == 10
+    assert tracker.peak <= 3
@@ -0,0 +1,89 @@
+import os
+import shutil
+import time
+import traceback
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+
+class ArticleExecutor:
+    """
+    탐지 결과별 기사 생성을 스레드 풀로 나눠서 실행
+    기사 하나는 대부분 LLM 호출, DB, 이미지 IO 대기라 스레드로 충분하고 matplotlib 렌더링은 PltDraw 에서 잠금으로 직렬화
+    같은 경기(match_id) 탐지는 출력 폴더를 같이 쓰므로 한 작업 안에서 순서대로 실행
+    """
+
+    def __init__(self, database, logger, max_workers=4):
+        self.database = database
+        self.logger = logger
+        self.max_workers = max_workers
+
+    def run(self, job_name, detections, article_func, output_dir=None):
+        """
+        detections : gameid, playername 을 가진 dict 리스트
+        article_func(detection) : 기사 하나 생성, 예외가 나거나 False 를 반환하면 실패
+        output_dir : 실패 시 output_dir/오늘날짜/gameid 폴더 삭제
+        """
+        groups = OrderedDict()
+        for detection in detections:
+            groups.setdefault(detection['gameid'], []).append(detection)
+        if not groups:
+            return []
+
+        start_time = time.perf_counter()
+        results = []
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(groups)), thread_name_prefix=job_name) as executor:
+            futures = [executor.submit(self.run_group, job_name, group, article_func, output_dir) for group in groups.values()]
+            for future in as_completed(futures):
+                results.extend(future.result())
+        wall_time = time.perf_counter() - start_time
+        self.log_summary(job_name, results, wall_time)
+        return results
+
+    def run_group(self, job_name, group, article_func, output_dir):
+        results = []
+        try:
+            for detection in group:
+                results.append(self.run_one(job_name, detection, article_func, output_dir))
+        finally:
+            # 작업 스레드가 쓰던 DB 커넥션 반납
+            self.database.release_connection()
+        return results
+
+    def run_one(self, job_name, detection, article_func, output_dir):
+        start_time = time.perf_counter()
+        try:
+            success = article_func(detection) is not False
+            error = None if success else "article_func returned False"
+        except Exception as e:
+            success = False
+            error = str(e)
+            self.logger.error(f"{job_name} 기사 생성 실패 {detection['gameid']}, {detection['playername']} : {e} {traceback.format_exc()}")
+            self.cleanup(output_dir, detection['gameid'])
+        return {
+            "gameid": detection['gameid'],
+            "playername": detection['playername'],
+            "success": success,
+            "error": error,
+            "elapsed": time.perf_counter() - start_time
+        }
+
+    def cleanup(self, output_dir, match_id):
+        if output_dir is None:
+            return
+        today_date = datetime.today().date().strftime("%y_%m_%d")
+        output_path = output_dir / today_date / match_id
+        if os.path.exists(output_path):
+            shutil.rmtree(output_path)
+
+    def log_summary(self, job_name, results, wall_time):
+        task_time = sum(result['elapsed'] for result in results)
+        failed = [result for result in results if not result['success']]
+        summary = (
+            f"{job_name} 기사 {len(results)}개 (실패 {len(failed)}), "
+            f"wall time {wall_time:.1f}s / task time 합계 {task_time:.1f}s "
+            f"(x{task_time / wall_time if wall_time > 0 else 0:.1f})"
+        )
+        print(summary)
+        self.logger.info(summary)
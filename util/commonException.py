@@ -7,6 +7,7 @@ class ErrorCode(Enum):
     TRANSLATION_ERROR = "TRANSLATION_ERROR"
     UNKNOWN_ERROR = "UNKNOWN_ERROR"
     NOMATCH_IMAGE = "NOMATCH_IMAGE"
+    DEAD_CHAMPION = "DEAD_CHAMPION"
 
 class CommonError(Exception):
     def __init__(self, error_code: ErrorCode, message: str, data: Optional[Any] = None, original_error: Optional[Exception] = None):
@@ -0,0 +1,63 @@
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+
+class TaskGraph:
+    """
+    작은 의존성 그래프 실행기
+    add(name, func, deps) 로 등록하면 func 는 deps 노드 결과를 같은 이름의 keyword 인자로 받음
+    의존성이 끝난 노드부터 스레드 풀에서 동시에 실행하고, 하나라도 실패하면 아직 시작 안 한 노드는 실행하지 않고 예외를 그대로 올림
+    after_task : 노드가 끝날 때마다 작업 스레드에서 호출 (DB 커넥션 반납 등)
+    """
+
+    def __init__(self, max_workers=4, after_task=None):
+        self.max_workers = max_workers
+        self.after_task = after_task
+        self.nodes = {}
+
+    def add(self, name, func, deps=()):
+        if name in self.nodes:
+            raise ValueError(f"이미 등록된 노드 : {name}")
+        self.nodes[name] = (func, tuple(deps))
+        return self
+
+    def run(self):
+        for name, (_, deps) in self.nodes.items():
+            missing = [dep for dep in deps if dep not in self.nodes]
+            if missing:
+                raise ValueError(f"{name} 의 의존 노드가 없음 : {missing}")
+
+        results = {}
+        pending = dict(self.nodes)
+        running = {}
+        error = None
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while pending or running:
+                if error is None:
+                    ready = [name for name, (_, deps) in pending.items() if all(dep in results for dep in deps)]
+                    for name in ready:
+                        func, deps = pending.pop(name)
+                        kwargs = {dep: results[dep] for dep in deps}
+                        running[executor.submit(self.run_node, func, kwargs)] = name
+                if not running:
+                    if error is None and pending:
+                        raise ValueError(f"순환 의존성 : {list(pending)}")
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        results[name] = future.result()
+                    except Exception as e:
+                        # 실행 중인 노드는 끝날 때까지 기다리고 첫 번째 예외를 올림
+                        if error is None:
+                            error = e
+        if error is not None:
+            raise error
+        return results
+
+    def run_node(self, func, kwargs):
+        try:
+            return func(**kwargs)
+        finally:
+            if self.after_task is not None:
+                self.after_task()